@@ -6,7 +6,6 @@ django.setup()
 
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
 from channels.security.websocket import AllowedHostsOriginValidator
 from backend.middleware import TokenAuthMiddlewareStack
 import game_api.routing
@@ -15,10 +14,8 @@ application = ProtocolTypeRouter({
     "http": get_asgi_application(),
     "websocket": AllowedHostsOriginValidator(
         TokenAuthMiddlewareStack(
-            AuthMiddlewareStack(
-                URLRouter(
-                    game_api.routing.websocket_urlpatterns
-                )
+            URLRouter(
+                game_api.routing.websocket_urlpatterns
             )
         )
     ),
@@ -1,40 +1,164 @@
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
 from urllib.parse import parse_qs
+from channels.auth import AuthMiddlewareStack
 from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
-from rest_framework.authtoken.models import Token
-
-@database_sync_to_async
-def get_user(token_key):
-    try:
-        token = Token.objects.get(key=token_key)
-        return token.user
-    except Token.DoesNotExist:
+from django.db import connections
+from users import authentication
+
+async def get_user(token_key):
+    token = await authentication.aget_token(token_key, database_sync_to_async)
+    if token is None or not token.user.is_active:
         return AnonymousUser()
+    return token.user
 
 class TokenAuthMiddleware(BaseMiddleware):
+    """
+    Authenticates sockets with ?token=<key> through the shared token cache.
+    Sockets without a token fall back to `session_inner` (cookie session auth), so
+    token-authenticated connects skip the session lookup entirely.
+    """
+    def __init__(self, inner, session_inner=None):
+        super().__init__(inner)
+        self.session_inner = session_inner
+
     async def __call__(self, scope, receive, send):
         # Get query parameters
         query_string = scope.get('query_string', b'').decode()
         query_params = parse_qs(query_string)
         
-        print(f"🔍 WebSocket Query string: {query_string}")  # ← DODAJ
-        
         # Get token from query_string
         token_key = query_params.get('token', [None])[0]
         
-        print(f"🔍 Token key: {token_key}")  # ← DODAJ
-        
         # Set the user in the scope
         if token_key:
-            user = await get_user(token_key)
-            print(f"🔍 User found: {user} (ID: {getattr(user, 'id', 'None')})")  # ← DODAJ
-            scope['user'] = user
+            scope = dict(scope, user=await get_user(token_key))
+        elif self.session_inner is not None:
+            return await self.session_inner(scope, receive, send)
         else:
-            scope['user'] = AnonymousUser()
-            print("🔍 No token, using AnonymousUser")  # ← DODAJ
+            scope = dict(scope, user=AnonymousUser())
         
         return await super().__call__(scope, receive, send)
 
 def TokenAuthMiddlewareStack(inner):
-    return TokenAuthMiddleware(inner)
\ No newline at end of file
+    return TokenAuthMiddleware(inner, session_inner=AuthMiddlewareStack(inner))
+
+timing_logger = logging.getLogger('backend.request_timing')
+
+REQUEST_TIMING_DEFAULTS = {
+    'SAMPLE_RATE': 1.0,     # fraction of requests that are instrumented
+    'SLOW_MS': 500,         # sampled requests slower than this are logged
+    'TOP_SQL': 5,           # repeated statements included in the slow request log
+    'SQL_MAX_LENGTH': 300,  # statements are truncated in the log
+    'HEADER': True,         # emit Server-Timing on sampled requests
+}
+
+
+class QueryCollector:
+    """Database execute wrapper: counts queries, total DB time and time per SQL statement"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        self.statement_time = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            # The SQL still has placeholders, so the same query with different params groups together
+            self.statements[sql] += 1
+            self.statement_time[sql] += elapsed
+
+    def top(self, limit, max_length):
+        return [
+            {'sql': sql[:max_length], 'count': count, 'ms': round(self.statement_time[sql] * 1000, 2)}
+            for sql, count in self.statements.most_common(limit)
+        ]
+
+
+class RequestTimingMiddleware:
+    """
+    Measures sampled requests: DB queries and time, view time and rendering time.
+    Adds a Server-Timing header and logs slow requests as one JSON line with the most
+    repeated SQL statements. Requests that are not sampled only pay for one random() call.
+    Streaming responses are measured up to the first byte - queries run while streaming are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = {**REQUEST_TIMING_DEFAULTS, **getattr(settings, 'REQUEST_TIMING', {})}
+
+    def __call__(self, request):
+        if random.random() >= self.config['SAMPLE_RATE']:
+            return self.get_response(request)
+
+        collector = QueryCollector()
+        request._timing = {'view_start': None, 'view_end': None}
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        finished = time.perf_counter()
+
+        timings = self.timings(request._timing, started, finished, collector)
+        if self.config['HEADER']:
+            response['Server-Timing'] = self.server_timing(timings, collector)
+        if timings['total'] >= self.config['SLOW_MS']:
+            self.log_slow(request, response, timings, collector)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, '_timing'):
+            request._timing['view_start'] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Called after the view returns and before the response (e.g. a DRF Response) is rendered
+        if hasattr(request, '_timing'):
+            request._timing['view_end'] = time.perf_counter()
+        return response
+
+    @staticmethod
+    def timings(marks, started, finished, collector):
+        """Milliseconds: total, db, view (without rendering) and render; view/render are 0 when unknown"""
+        view_start = marks['view_start']
+        view_end = marks['view_end'] or finished
+        return {
+            'total': (finished - started) * 1000,
+            'db': collector.duration * 1000,
+            'view': (view_end - view_start) * 1000 if view_start else 0.0,
+            'render': (finished - marks['view_end']) * 1000 if marks['view_end'] else 0.0,
+        }
+
+    @staticmethod
+    def server_timing(timings, collector):
+        return ', '.join([
+            f'db;dur={timings["db"]:.2f};desc="{collector.count} queries"',
+            f'view;dur={timings["view"]:.2f}',
+            f'render;dur={timings["render"]:.2f}',
+            f'total;dur={timings["total"]:.2f}',
+        ])
+
+    def log_slow(self, request, response, timings, collector):
+        timing_logger.warning(json.dumps({
+            'event': 'slow_request',
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': collector.count,
+            **{f'{name}_ms': round(value, 2) for name, value in timings.items()},
+            'top_sql': collector.top(self.config['TOP_SQL'], self.config['SQL_MAX_LENGTH']),
+        }))
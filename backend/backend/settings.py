@@ -56,7 +56,7 @@ INSTALLED_APPS = [
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -101,6 +101,7 @@ CORS_ALLOW_HEADERS = [
 # ✅ KRYTYCZNE: middleware MUSI być w tej kolejności
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # ✅ PIERWSZA pozycja!
+    "backend.middleware.RequestTimingMiddleware",  # mierzy całą resztę łańcucha
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -137,6 +138,62 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Zapis zakończonych gier w tle (game_api/persistence.py)
+GAME_PERSISTENCE = {
+    'WORKERS': int(os.environ.get('GAME_PERSISTENCE_WORKERS', 2)),
+    'MAX_QUEUE': int(os.environ.get('GAME_PERSISTENCE_MAX_QUEUE', 256)),
+    'BATCH_SIZE': 8,
+    'BATCH_WAIT': 0.05,
+    'MAX_ATTEMPTS': 3,
+    'RETRY_BACKOFF': 0.5,
+}
+
+# Cache token -> użytkownik dla REST i WebSocketów (users/authentication.py)
+TOKEN_AUTH = {
+    'CACHE_TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 60)),
+    'CACHE_SIZE': 10000,
+}
+
+# Pomiar zapytań i czasu żądań HTTP - nagłówek Server-Timing, log wolnych żądań (backend/middleware.py)
+REQUEST_TIMING = {
+    'SAMPLE_RATE': float(os.environ.get('REQUEST_TIMING_SAMPLE_RATE', 1.0 if DEBUG else 0.05)),
+    'SLOW_MS': float(os.environ.get('REQUEST_TIMING_SLOW_MS', 500)),
+    'TOP_SQL': 5,
+    'HEADER': True,
+}
+
+# Cache: 'default' - wersja rankingu (game_api/leaderboard.py), unieważnianie tokenów (users/authentication.py),
+# przypięcia do primary (game_api/replicas.py); 'games' - gotowe odpowiedzi zakończonych gier z ETagami
+# (game_api/game_cache.py).
+# LocMemCache działa tylko w obrębie jednego procesu - wystarcza dla jednego procesu daphne z docker-compose
+# (InMemoryChannelLayer i tak go wymaga). Przy kilku procesach/workerach ustawić REDIS_URL: inaczej
+# wylogowanie, przypięcie do primary i invalidate() odpowiedzi gry nie dotrą do pozostałych procesów.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        },
+        'games': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+            'KEY_PREFIX': 'finished-games',
+            'TIMEOUT': 24 * 60 * 60,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'games': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'finished-games',
+            'TIMEOUT': 24 * 60 * 60,
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        },
+    }
+
 # Database
 DATABASES = {
     'default': {
@@ -149,6 +206,24 @@ DATABASES = {
     }
 }
 
+# Replika tylko do odczytu dla statystyk i historii gier (game_api/replicas.py) - np. streaming replication
+# primary; bez POSTGRES_REPLICA_HOST wszystko czyta z 'default'
+if os.environ.get('POSTGRES_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['POSTGRES_REPLICA_HOST'],
+        'PORT': os.environ.get('POSTGRES_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['game_api.replicas.AnalyticsReplicaRouter']
+
+ANALYTICS_REPLICA = {
+    'ALIAS': 'replica' if 'replica' in DATABASES else None,
+    # Read-your-writes: tyle sekund po zapisie gry jej uczestnicy czytają z primary (> opóźnienie repliki)
+    'PIN_SECONDS': float(os.environ.get('REPLICA_PIN_SECONDS', 5)),
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -240,6 +315,10 @@ LOGGING = {
             'handlers': ['console'],
             'level': 'DEBUG',
         },
+        'backend.request_timing': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
     },
 }
 
@@ -0,0 +1,21 @@
+# backend/backend/test_settings.py
+# Ustawienia dla testów (pytest-django) - SQLite zamiast Postgresa z docker-compose
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'test_db.sqlite3',
+    }
+}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Druga baza dla testów routera replik (tests/test_replicas.py) - osobna baza w pamięci, więc test może udawać
+# opóźnioną replikę. Schemat wprost z modeli (bez migracji z danymi); router włączają tylko te testy.
+DATABASES['replica'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': ':memory:',
+    'TEST': {'MIGRATE': False},
+}
+ANALYTICS_REPLICA = {**ANALYTICS_REPLICA, 'ALIAS': None}
@@ -0,0 +1,64 @@
+# backend/benchmarks/bench_board.py
+# Benchmark ścieżek planszy (budowa, wypłata, serializacja) dla różnych rozmiarów układu.
+#
+# Uruchom z katalogu backend:  python -m benchmarks.bench_board
+
+import contextlib
+import io
+import time
+
+from game_engine.simple.board_generator import generate_board
+from game_engine.simple.geometry import get_layout
+from game_engine.simple.models import SimpleGameState
+
+LAYOUTS = ["standard", "extended", "hexagon_3", "hexagon_4"]
+PLAYERS = 4
+ROUNDS = 200
+GENERATOR_ROUNDS = 20
+
+
+def _timed(fn, repeat):
+    # Silnik dużo loguje przez print - wycinamy to z pomiaru
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - start) / repeat * 1e6
+
+
+def _filled_state(layout):
+    state = SimpleGameState(layout=layout)
+    for i in range(PLAYERS):
+        state.add_player(f"{i:08d}-0000-0000-0000-000000000000", f"color{i}", f"P{i}")
+    # Każdy gracz stawia osady na najlepszych wolnych miejscach, aż skończą się wolne rogi
+    turn = 0
+    while True:
+        hints = state.setup_hints.top(1)
+        if not hints:
+            break
+        player_id = state.player_order[turn % PLAYERS]
+        state.players[player_id].settlements_left = 5
+        state.place_settlement(hints[0]["vertex_id"], player_id, is_setup=True)
+        turn += 1
+    return state
+
+
+def main():
+    print(f"{'layout':<12}{'tiles':>6}{'vertices':>9}{'build us':>11}"
+          f"{'payout us':>11}{'serialize us':>14}{'per tile (payout)':>19}{'random board ms':>17}")
+    for name in LAYOUTS:
+        layout = get_layout(name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            state = _filled_state(layout)
+
+        build = _timed(lambda: SimpleGameState(layout=layout), ROUNDS)
+        payout = _timed(lambda: [state.distribute_resources_for_dice_roll(n) for n in (2, 3, 4, 5, 6, 8, 9, 10, 11, 12)],
+                        ROUNDS) / 10
+        serialize = _timed(state.serialize, ROUNDS)
+        generator = _timed(lambda: generate_board(layout), GENERATOR_ROUNDS) / 1000
+        print(f"{name:<12}{layout.tile_count:>6}{layout.vertex_count:>9}{build:>11.1f}"
+              f"{payout:>11.1f}{serialize:>14.1f}{payout / layout.tile_count:>19.2f}{generator:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# backend/game_api/export.py
+# Strumieniowy eksport historii gier (NDJSON / CSV, opcjonalnie gzip) - jeden wiersz na gracza w grze.
+# Dane idą przez .iterator(chunk_size=...), więc pamięć nie rośnie z liczbą wierszy.
+# Pod ASGI (daphne) odpowiedź dostaje aiterate(): StreamingHttpResponse z synchronicznym iteratorem
+# skleiłby tam cały plik w pamięci przed wysłaniem pierwszego bajtu.
+import csv
+import datetime
+import json
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from game_api.models import RESOURCE_TYPES, GamePlayer
+from game_engine.simple.models import WIN_VICTORY_POINTS
+
+FORMATS = ('ndjson', 'csv')
+CHUNK_SIZE = 2000          # wierszy na paczkę z bazy
+BUFFER_SIZE = 64 * 1024    # bajtów na kawałek odpowiedzi
+
+# (nazwa w eksporcie, ścieżka w values_list)
+COLUMNS = [
+    ('game_id', 'game_id'),
+    ('start_time', 'game__start_time'),
+    ('end_time', 'game__end_time'),
+    ('turns', 'game__turns'),
+    ('dice_distribution', 'game__dice_distribution'),
+    ('user_id', 'user_id'),
+    ('username', 'user__username'),
+    ('display_name', 'user__display_name'),
+    ('victory_points', 'victory_points'),
+    ('roads_built', 'roads_built'),
+    ('settlements_built', 'settlements_built'),
+    ('cities_built', 'cities_built'),
+    ('longest_road', 'longest_road'),
+    ('largest_army', 'largest_army'),
+    *[(name, name) for name in RESOURCE_TYPES],
+]
+FIELDS = [name for name, _ in COLUMNS] + ['won']
+
+
+def parse_bound(value, end=False):
+    """Data (YYYY-MM-DD) albo data z godziną; dla samej daty `end` oznacza początek następnego dnia"""
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date: {value}")
+        if end:
+            day += datetime.timedelta(days=1)
+        moment = datetime.datetime.combine(day, datetime.time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def export_queryset(since=None, until=None, user_id=None, using=None):
+    """Wiersze eksportu w kolejności (start_time, game_id, id); `until` jest wyłączne"""
+    queryset = GamePlayer.objects.using(using)
+    if user_id is not None:
+        queryset = queryset.filter(user_id=user_id)
+    if since is not None:
+        queryset = queryset.filter(start_time__gte=since)
+    if until is not None:
+        queryset = queryset.filter(start_time__lt=until)
+    return queryset.order_by('start_time', 'game_id', 'id').values_list(*[path for _, path in COLUMNS])
+
+
+def records(queryset, chunk_size=CHUNK_SIZE):
+    names = [name for name, _ in COLUMNS]
+    for row in queryset.iterator(chunk_size=chunk_size):
+        record = dict(zip(names, row))
+        record['won'] = record['victory_points'] >= WIN_VICTORY_POINTS
+        yield record
+
+
+def ndjson_lines(rows):
+    for record in rows:
+        yield json.dumps(record, cls=DjangoJSONEncoder) + '\n'
+
+
+class _Echo:
+    """Bufor dla csv.writer, który zamiast zapisywać zwraca linię"""
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(FIELDS)
+    for record in rows:
+        record['dice_distribution'] = json.dumps(record['dice_distribution'], sort_keys=True)
+        yield writer.writerow([record[name] for name in FIELDS])
+
+
+def buffered(lines, size=BUFFER_SIZE):
+    """Sklejaj linie w kawałki ~`size` bajtów - mniej zapisów do gniazda niż linia po linii"""
+    buffer, length = [], 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        length += len(data)
+        if length >= size:
+            yield b''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def gzip_chunks(chunks):
+    """Kompresja gzip w locie - każdy kawałek wejścia od razu trafia do strumienia"""
+    compressor = zlib.compressobj(wbits=31)  # 31 = nagłówek gzip
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream(output='ndjson', compress=False, since=None, until=None, user_id=None, chunk_size=CHUNK_SIZE,
+           using=None):
+    """Kolejne kawałki bajtów eksportu"""
+    if output not in FORMATS:
+        raise ValueError(f"Unknown format: {output}")
+    lines = ndjson_lines if output == 'ndjson' else csv_lines
+    chunks = buffered(lines(records(export_queryset(since, until, user_id, using), chunk_size)))
+    return gzip_chunks(chunks) if compress else chunks
+
+
+async def aiterate(chunks):
+    """
+    Asynchroniczny iterator po kawałkach `chunks` - każdy next() (a z nim kursor bazy) w wątku synchronicznym
+    Django, więc wszystkie paczki idą przez to samo połączenie
+    """
+    done = object()
+    pull = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await pull(chunks, done)) is not done:
+            yield chunk
+    finally:
+        # Klient rozłączył się w połowie - zamknij generator (i kursor) w tym samym wątku
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+def filename(output, compress):
+    return f"games.{output}" + ('.gz' if compress else '')
+
+
+def content_type(output, compress):
+    if compress:
+        return 'application/gzip'
+    return 'application/x-ndjson' if output == 'ndjson' else 'text/csv'
@@ -0,0 +1,70 @@
+# backend/game_api/game_cache.py
+# Odpowiedzi dla zakończonych gier (szczegóły, gracze) - po zapisie przez GameSaver już się nie zmieniają,
+# więc trzymamy je w cache razem z silnym ETagiem i odpowiadamy 304 bez zapytań do bazy.
+import hashlib
+import json
+
+from django.core.cache import caches
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from game_api import replicas
+
+CACHE_ALIAS = 'games'
+# Podbić przy zmianie kształtu odpowiedzi - stare wpisy i ETagi klientów przestaną pasować
+RESPONSE_VERSION = 1
+KINDS = ('detail', 'players')
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _key(kind, game_id):
+    # Klucz z liczby, nie z tekstu URL-a: /api/games/01/ i /api/games/1/ to ten sam wpis, który czyści invalidate()
+    try:
+        game_id = int(game_id)
+    except (TypeError, ValueError):
+        raise NotFound()
+    return f"game:v{RESPONSE_VERSION}:{kind}:{game_id}"
+
+
+def _cache_control():
+    return f"private, max-age={_cache().default_timeout}, immutable"
+
+
+def make_etag(data):
+    """Silny ETag - skrót kanonicznego JSON-a odpowiedzi"""
+    body = json.dumps(data, cls=JSONEncoder, sort_keys=True, separators=(',', ':'))
+    return '"%s"' % hashlib.sha1(body.encode()).hexdigest()
+
+
+def game_response(request, kind, game_id, build):
+    """
+    Odpowiedź `kind` dla gry `game_id`. `build()` liczy dane z bazy tylko przy braku wpisu w cache
+    (może rzucić Http404 - wtedy nic nie zapisujemy). If-None-Match z aktualnym ETagiem -> 304.
+    """
+    key = _key(kind, game_id)
+    entry = _cache().get(key)
+    if entry is None:
+        # Z primary, nie z repliki: przebudowa tuż po invalidate() z opóźnionej repliki zapisałaby stare dane
+        # z nowym ETagiem na cały czas życia wpisu
+        with replicas.primary_reads():
+            data = build()
+        entry = (make_etag(data), data)
+        _cache().set(key, entry)
+    etag, data = entry
+
+    headers = {'ETag': etag, 'Cache-Control': _cache_control()}
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(data, headers=headers)
+
+
+def invalidate(game_id):
+    """Usuń wpisy gry (edycja/usunięcie gry lub jej graczy przez API, scalanie gości w gc_guests)"""
+    _cache().delete_many([_key(kind, game_id) for kind in KINDS])
@@ -1,11 +1,16 @@
 # backend/game_api/game_saver.py - NAPRAWIONA WERSJA - zapisuje wszystkich graczy
 from django.contrib.auth import get_user_model
-from django.db.models import Q  # ✅ DODANY IMPORT!
-from game_api.models import Game, GamePlayer, PlayerResource
+from django.db.models import Case, F, FloatField, IntegerField, Q, Subquery, Value, When  # ✅ DODANY IMPORT!
+from django.db.models.functions import Cast, Coalesce, NullIf
+from game_api import leaderboard, ratings, replicas, rollups
+from game_engine.simple.models import WIN_VICTORY_POINTS
+from game_api.models import RESOURCE_TYPES, Game, GamePlayer, UserStats
+from users.guests import allocate_usernames
+import contextlib
 import json
-from datetime import datetime
 import logging
 from django.db import transaction
+from django.utils import timezone
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -16,8 +21,9 @@ class GameSaver:
     @staticmethod
     def save_completed_game(game_state, start_time=None):
         """
-        Zapisz zakończoną grę do bazy danych - POPRAWIONA WERSJA
-        Zapisuje WSZYSTKICH graczy, nawet jeśli niektórzy mają problemy
+        Zapisz zakończoną grę do bazy danych - wersja zbiorcza
+        Użytkownicy wszystkich graczy są szukani jednym zapytaniem, a GamePlayer (razem z surowcami)
+        wstawiane przez bulk_create w jednej transakcji - liczba zapytań nie zależy od liczby graczy.
         """
         try:
             logger.info(f"🎮 Saving completed game to database")
@@ -28,101 +34,54 @@ class GameSaver:
                 return None
             
             # ✅ POBIERZ ROZKŁAD KOSTEK Z GAME_STATE
-            dice_distribution = getattr(game_state, 'dice_distribution', {})
-            if not dice_distribution:
-                logger.info("📊 No dice distribution found in game_state, using empty dict")
-                dice_distribution = {}
-            else:
-                logger.info(f"🎲 Found dice distribution: {dice_distribution}")
-            
-            # ✅ TWORZYMY GRĘ Z ROZKŁADEM KOSTEK
-            game = Game.objects.create(
-                start_time=start_time or datetime.now(),
-                end_time=datetime.now(),
-                dice_distribution=dice_distribution,  # ✅ PRAWDZIWY ROZKŁAD!
-                turns=getattr(game_state, 'current_turn', 0)
-            )
-            
-            logger.info(f"✅ Created Game object with ID: {game.id}, dice_distribution: {dice_distribution}")
+            dice_distribution = getattr(game_state, 'dice_distribution', {}) or {}
+            logger.info(f"🎲 Dice distribution: {dice_distribution}")
             
-            saved_players = []
-            failed_players = []
+            players = list(game_state.players.items())
             
-            # ✅ ZAPISUJEMY KAŻDEGO GRACZA OSOBNO - z lepszą logiką
-            for player_id, player in game_state.players.items():
-                try:
-                    logger.info(f"🎯 Processing player {player_id[:8]} - display_name: '{getattr(player, 'display_name', 'N/A')}'")
-                    
-                    # Spróbuj zapisać tego gracza w osobnej transakcji
-                    with transaction.atomic():
-                        user = GameSaver._get_real_user_for_player(player_id, player)
-                        
-                        if not user:
-                            logger.error(f"❌ Could not find/create user for player {player_id[:8]}")
-                            failed_players.append({
-                                'player_id': player_id[:8],
-                                'display_name': getattr(player, 'display_name', 'N/A'),
-                                'reason': 'User not found/created'
-                            })
-                            continue
-                        
-                        # ✅ SPRAWDŹ CZY GRACZ JUŻ ISTNIEJE W TEJ GRZE
-                        existing = GamePlayer.objects.filter(game=game, user=user).first()
-                        if existing:
-                            logger.warning(f"⚠️ Player {user.username} already exists in game {game.id}, skipping")
-                            continue
-                        
-                        # Utwórz GamePlayer
-                        game_player = GamePlayer.objects.create(
-                            game=game,
-                            user=user,
-                            victory_points=getattr(player, 'victory_points', 0),
-                            roads_built=15 - getattr(player, 'roads_left', 15),
-                            settlements_built=5 - getattr(player, 'settlements_left', 5),
-                            cities_built=4 - getattr(player, 'cities_left', 4),
-                            longest_road=getattr(player, 'longest_road', False),
-                            largest_army=getattr(player, 'largest_army', False)
-                        )
-                        
-                        logger.info(f"✅ Created GamePlayer for {player.display_name} (User: {user.username}, ID: {user.id})")
-                        
-                        # Zapisz zasoby gracza
-                        GameSaver._save_player_resources(game_player, getattr(player, 'resources', None))
-                        
-                        saved_players.append({
-                            'player_id': player_id[:8],
-                            'username': user.username,
-                            'display_name': getattr(player, 'display_name', 'N/A'),
-                            'victory_points': getattr(player, 'victory_points', 0)
-                        })
-                        
-                except Exception as e:
-                    logger.error(f"❌ Error saving player {player_id[:8]}: {e}")
-                    failed_players.append({
-                        'player_id': player_id[:8],
-                        'display_name': getattr(player, 'display_name', 'N/A'),
-                        'reason': str(e)
-                    })
-                    # ✅ NIE PRZERYWAMY - idziemy dalej do następnego gracza
-                    continue
+            with transaction.atomic():
+                game = Game.objects.create(
+                    start_time=start_time or timezone.now(),
+                    end_time=timezone.now(),
+                    dice_distribution=dice_distribution,
+                    turns=getattr(game_state, 'current_turn', 0)
+                )
+                logger.info(f"✅ Created Game object with ID: {game.id}")
+                
+                users = GameSaver._resolve_users(players)
+                
+                game_players = []
+                saved_user_ids = set()
+                for player_id, player in players:
+                    user = users[player_id]
+                    # Dwóch graczy może wskazać tego samego użytkownika - (game, user) jest unikalne
+                    if user.id in saved_user_ids:
+                        logger.warning(f"⚠️ Player {user.username} already exists in game {game.id}, skipping")
+                        continue
+                    saved_user_ids.add(user.id)
+                    game_players.append(GamePlayer(
+                        game=game,
+                        user=user,
+                        start_time=game.start_time,
+                        seat=getattr(player, 'seat', -1) if getattr(player, 'seat', -1) >= 0 else None,
+                        victory_points=getattr(player, 'victory_points', 0),
+                        roads_built=15 - getattr(player, 'roads_left', 15),
+                        settlements_built=5 - getattr(player, 'settlements_left', 5),
+                        cities_built=4 - getattr(player, 'cities_left', 4),
+                        longest_road=getattr(player, 'longest_road', False),
+                        largest_army=getattr(player, 'largest_army', False),
+                        **GameSaver._resource_columns(getattr(player, 'resources', None))
+                    ))
+                GamePlayer.objects.bulk_create(game_players)
+                
+                GameSaver._update_user_stats(game_players)
+                rollups.record_game(game, game_players)
             
-            # ✅ SZCZEGÓŁOWE LOGOWANIE WYNIKÓW
             logger.info(f"🎉 Game {game.id} saved!")
-            logger.info(f"📊 Total players in game_state: {len(game_state.players)}")
-            logger.info(f"✅ Successfully saved: {len(saved_players)} players")
-            logger.info(f"❌ Failed to save: {len(failed_players)} players")
-            
-            if saved_players:
-                logger.info("✅ SAVED PLAYERS:")
-                for sp in saved_players:
-                    logger.info(f"   - {sp['username']} ({sp['display_name']}) - {sp['victory_points']} pts")
+            logger.info(f"📊 Total players in game_state: {len(players)}, saved: {len(game_players)}")
+            for gp in game_players:
+                logger.info(f"   - {gp.user.username} ({gp.user.display_name}) - {gp.victory_points} pts")
             
-            if failed_players:
-                logger.warning("❌ FAILED PLAYERS:")
-                for fp in failed_players:
-                    logger.warning(f"   - {fp['player_id']} ({fp['display_name']}) - {fp['reason']}")
-            
-            # ✅ ZWRACAMY GRĘ NAWET JEŚLI NIEKTÓRZY GRACZE SIĘ NIE ZAPISALI
             return game
             
         except Exception as e:
@@ -132,219 +91,216 @@ class GameSaver:
             return None
     
     @staticmethod
-    def _get_real_user_for_player(player_id, player):
+    def _update_user_stats(game_players, sign=1):
         """
-        ✅ ULEPSZONA WERSJA - Znajdź prawdziwego użytkownika dla gracza
+        Dolicz grę do UserStats i User.games_played/games_won (`sign=-1` - odejmij) - stała liczba zapytań:
+        wstawienie brakujących wierszy + po jednym UPDATE z F() i CASE na każdą tabelę.
+        Odjęcie cofa zmianę ratingu policzoną z obecnych ratingów - Elo zależy od kolejności gier,
+        więc po edycji starej gry dokładne ratingi daje dopiero recompute_ratings.
         """
-        try:
-            display_name = getattr(player, 'display_name', str(player_id))
-            color = getattr(player, 'color', 'blue')
-            logger.info(f"🔍 Looking for user - player_id: {player_id[:8]}, display_name: '{display_name}', color: '{color}'")
-            
-            # ✅ METODA 1: Szukaj zalogowanych użytkowników po display_name
-            try:
-                user = User.objects.get(display_name=display_name, is_guest=False)
-                logger.info(f"✅ Method 1: Found LOGGED IN user by display_name: {user.username} (ID: {user.id})")
-                return user
-            except User.DoesNotExist:
-                logger.info("⏭️ Method 1 failed: No logged user with this display_name")
-            except User.MultipleObjectsReturned:
-                # Jeśli jest kilku użytkowników o tej samej nazwie, weź pierwszego zalogowanego
-                user = User.objects.filter(display_name=display_name, is_guest=False).first()
-                if user:
-                    logger.info(f"✅ Method 1b: Found FIRST logged user: {user.username} (ID: {user.id})")
-                    return user
-            
-            # ✅ METODA 2: Szukaj zalogowanych użytkowników po username
-            try:
-                user = User.objects.get(username=display_name, is_guest=False)
-                logger.info(f"✅ Method 2: Found LOGGED IN user by username: {user.username} (ID: {user.id})")
-                return user
-            except User.DoesNotExist:
-                logger.info("⏭️ Method 2 failed: No logged user with this username")
-            except User.MultipleObjectsReturned:
-                user = User.objects.filter(username=display_name, is_guest=False).first()
-                if user:
-                    logger.info(f"✅ Method 2b: Found FIRST logged user by username: {user.username} (ID: {user.id})")
-                    return user
-                
-            # ✅ METODA 3: Sprawdź czy display_name zawiera rzeczywiste imię użytkownika
-            try:
-                if display_name and len(display_name) > 2:
-                    # Szukaj po pierwszym słowie z display_name (imię)
-                    first_name = display_name.split()[0] if ' ' in display_name else display_name
-                    
-                    # Sprawdź czy istnieje użytkownik z podobnym username lub display_name
-                    similar_users = User.objects.filter(
-                        Q(username__icontains=first_name.lower()) | 
-                        Q(display_name__icontains=first_name),
-                        is_guest=False
-                    ).first()
-                    
-                    if similar_users:
-                        logger.info(f"✅ Method 3: Found SIMILAR user: {similar_users.username} (ID: {similar_users.id})")
-                        return similar_users
-                        
-                logger.info("⏭️ Method 3 failed: No similar users found")
-            except Exception as e:
-                logger.warning(f"⚠️ Method 3 error: {e}")
-            
-            # ✅ METODA 4: Szukaj istniejących gości o tej nazwie
-            try:
-                # Sprawdź różne warianty username dla gości
-                guest_variants = [
-                    f"guest_{display_name}".replace(' ', '_')[:50],
-                    f"guest_{display_name.lower()}".replace(' ', '_')[:50],
-                    display_name.replace(' ', '_')[:50]
-                ]
-                
-                for variant in guest_variants:
-                    try:
-                        user = User.objects.get(username=variant, is_guest=True)
-                        logger.info(f"✅ Method 4: Found existing GUEST user: {user.username} (ID: {user.id})")
-                        return user
-                    except User.DoesNotExist:
-                        continue
-                        
-                logger.info("⏭️ Method 4 failed: No existing guest found")
-            except Exception as e:
-                logger.warning(f"⚠️ Method 4 error: {e}")
-            
-            # ✅ METODA 5: Utwórz nowego gościa - TYLKO JEŚLI NAPRAWDĘ POTRZEBA
-            logger.info(f"🆕 Creating new guest user for '{display_name}'")
-            
-            # Generuj bezpieczny i unikalny username
-            safe_name = display_name.replace(' ', '_').replace('@', '_').replace('.', '_')
-            base_username = f"guest_{safe_name}"[:40]
-            username = base_username
-            counter = 1
-            
-            # Znajdź wolny username
-            while User.objects.filter(username=username).exists():
-                username = f"{base_username}_{counter}"
-                counter += 1
-                if counter > 100:  # Zabezpieczenie przed nieskończoną pętlą
-                    username = f"guest_{int(datetime.now().timestamp())}"
-                    break
-            
-            # Utwórz nowego gościa
-            try:
-                user = User.objects.create_user(
-                    username=username,
-                    email=f"{username}@guest.local",
-                    is_guest=True,
-                    display_name=display_name,
-                    preferred_color=color
-                )
-                
-                logger.info(f"✅ Method 5: Created new guest user: {username} (ID: {user.id})")
-                return user
-                
-            except Exception as create_error:
-                logger.error(f"❌ Failed to create guest user: {create_error}")
-                
-                # ✅ OSTATNIA SZANSA - znajdź dowolnego gościa jako fallback
-                try:
-                    fallback_user = User.objects.filter(is_guest=True).first()
-                    if fallback_user:
-                        logger.warning(f"🔄 Method 6: Using fallback guest user: {fallback_user.username}")
-                        return fallback_user
-                except:
-                    pass
-                
-                return None
-            
-        except Exception as e:
-            logger.error(f"❌ Critical error finding/creating user for player {player_id[:8]}: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+        if not game_players:
+            return
+        user_ids = [gp.user_id for gp in game_players]
+        winners = [gp.user_id for gp in game_players if gp.victory_points >= WIN_VICTORY_POINTS]
+        
+        def per_user(value, cast=int, field=IntegerField()):
+            return Case(*[When(user_id=gp.user_id, then=Value(cast(value(gp)))) for gp in game_players],
+                        default=Value(cast(0)), output_field=field)
+        
+        def added(value):
+            return per_user(lambda gp: value(gp) * sign)
+        
+        won = Case(When(user_id__in=winners, then=Value(sign)), default=Value(0), output_field=IntegerField())
+        
+        UserStats.objects.bulk_create([UserStats(user_id=uid) for uid in user_ids], ignore_conflicts=True)
+        
+        # Rating zależy od aktualnych ratingów przeciwników - blokujemy wiersze do końca transakcji
+        current = dict(UserStats.objects.select_for_update().filter(user_id__in=user_ids)
+                       .values_list('user_id', 'rating'))
+        before = [current[uid] for uid in user_ids]
+        after = ratings.update_game(before, [gp.victory_points for gp in game_players])
+        new_ratings = {uid: old + (new - old) * sign for uid, old, new in zip(user_ids, before, after)}
+        
+        UserStats.objects.filter(user_id__in=user_ids).update(
+            rating=per_user(lambda gp: new_ratings[gp.user_id], cast=float, field=FloatField()),
+            total_games=F('total_games') + sign,
+            wins=F('wins') + won,
+            # F() w UPDATE widzi stare wartości, więc procent liczymy z (wins + won) / (total_games + sign)
+            win_rate=Coalesce(Cast(F('wins') + won, FloatField()) * 100 / NullIf(F('total_games') + sign, 0),
+                              Value(0.0)),
+            total_victory_points=F('total_victory_points') + added(lambda gp: gp.victory_points),
+            total_roads=F('total_roads') + added(lambda gp: gp.roads_built),
+            total_settlements=F('total_settlements') + added(lambda gp: gp.settlements_built),
+            total_cities=F('total_cities') + added(lambda gp: gp.cities_built),
+            longest_road_awards=F('longest_road_awards') + added(lambda gp: gp.longest_road),
+            largest_army_awards=F('largest_army_awards') + added(lambda gp: gp.largest_army),
+        )
+        User.objects.filter(id__in=user_ids).update(
+            games_played=F('games_played') + sign,
+            games_won=F('games_won') + Case(When(id__in=winners, then=Value(sign)), default=Value(0),
+                                            output_field=IntegerField()),
+        )
+        # Ranking zmienił się dopiero po commicie - wtedy unieważniamy cache top-K
+        transaction.on_commit(leaderboard.invalidate)
+        # Gracze zaraz otworzą statystyki - czytają z primary, dopóki replika nie dostanie tej gry
+        transaction.on_commit(lambda: replicas.pin_users(user_ids))
     
     @staticmethod
-    def _save_player_resources(game_player, resources):
+    @contextlib.contextmanager
+    def rerecorded(*game_ids):
         """
-        Zapisz zasoby gracza - POPRAWIONA WERSJA
+        Blok zmieniający zapisane gry lub ich graczy (edycja/usunięcie przez API): udział gier w UserStats,
+        licznikach User i dziennych rollupach jest odejmowany przed zmianą i doliczany po niej -
+        usunięta gra zostaje odjęta. Jedna transakcja.
         """
-        try:
-            if not resources:
-                logger.warning(f"⚠️ No resources found for {game_player.user.username}")
-                return
-                
-            resource_mapping = {
-                'wood': 'wood',
-                'brick': 'brick', 
-                'sheep': 'sheep',
-                'wheat': 'wheat',
-                'ore': 'ore'
-            }
-            
-            saved_resources = []
-            for resource_name, db_name in resource_mapping.items():
-                try:
-                    resource_amount = getattr(resources, resource_name, 0)
-                    
-                    if resource_amount > 0:
-                        PlayerResource.objects.create(
-                            game_player=game_player,
-                            resource_type=db_name,
-                            amount=resource_amount
-                        )
-                        saved_resources.append(f"{db_name}:{resource_amount}")
-                except Exception as e:
-                    logger.error(f"❌ Error saving resource {resource_name}: {e}")
-            
-            if saved_resources:
-                logger.info(f"✅ Saved resources for {game_player.user.username}: {', '.join(saved_resources)}")
+        game_ids = {game_id for game_id in game_ids if game_id is not None}
+        with transaction.atomic():
+            for game, game_players in rollups.recorded_games(game_ids):
+                GameSaver._update_user_stats(game_players, sign=-1)
+                rollups.record_game(game, game_players, sign=-1)
+            yield
+            for game, game_players in rollups.recorded_games(game_ids):
+                GameSaver._update_user_stats(game_players)
+                rollups.record_game(game, game_players)
+    
+    @staticmethod
+    def _guest_username_variants(display_name):
+        return [
+            f"guest_{display_name}".replace(' ', '_')[:50],
+            f"guest_{display_name.lower()}".replace(' ', '_')[:50],
+            display_name.replace(' ', '_')[:50]
+        ]
+    
+    @staticmethod
+    def _resolve_users(players):
+        """
+        ✅ Znajdź użytkowników dla wszystkich graczy naraz: {player_id: User}
+        
+        Kolejność dopasowania dla każdego gracza jak wcześniej:
+        1. zalogowany po display_name, 2. zalogowany po username,
+        3. zalogowany o podobnej nazwie (pierwsze słowo display_name), 4. istniejący gość,
+        5. nowy gość. Kandydaci 1, 2 i 4 przychodzą jednym zapytaniem, 3 - drugim (tylko dla graczy
+        bez dokładnego dopasowania, najwyżej jeden użytkownik na słowo), nowi goście - jednym
+        zapytaniem o zajęte nazwy i jednym bulk_create.
+        """
+        names = {}
+        for player_id, player in players:
+            names[player_id] = getattr(player, 'display_name', None) or str(player_id)
+        
+        # Nazwy z samych spacji nie mają pierwszego słowa - tylko dopasowanie dokładne i gość
+        first_words = {
+            player_id: name.split()[0]
+            for player_id, name in names.items() if len(name) > 2 and name.split()
+        }
+        guest_variants = {
+            player_id: GameSaver._guest_username_variants(name)
+            for player_id, name in names.items()
+        }
+        
+        logged_in = Q(display_name__in=names.values()) | Q(username__in=names.values())
+        all_variants = {v for variants in guest_variants.values() for v in variants}
+        candidates = list(
+            User.objects.filter(
+                (Q(is_guest=False) & logged_in) | Q(is_guest=True, username__in=all_variants)
+            ).order_by('id')
+        )
+        registered = [u for u in candidates if not u.is_guest]
+        guests_by_username = {u.username: u for u in candidates if u.is_guest}
+        exact = {}
+        for player_id, name in names.items():
+            user = (next((u for u in registered if u.display_name == name), None)
+                    or next((u for u in registered if u.username == name), None))
+            if user:
+                exact[player_id] = user
+        
+        # Podobna nazwa tylko dla graczy bez dokładnego dopasowania - po jednym użytkowniku na słowo
+        similar = GameSaver._similar_users(
+            {first_words[pid] for pid in names if pid not in exact and pid in first_words})
+        
+        users = {}
+        missing = []
+        for player_id, _ in players:
+            name = names[player_id]
+            word = first_words.get(player_id, '').lower()
+            user = (
+                exact.get(player_id)
+                or (word and next((u for u in similar
+                                   if word in u.username.lower()
+                                   or word in (u.display_name or '').lower()), None))
+                or next((guests_by_username[v] for v in guest_variants[player_id]
+                         if v in guests_by_username), None)
+            )
+            if user:
+                logger.info(f"✅ Found user for '{name}': {user.username} (ID: {user.id})")
+                users[player_id] = user
             else:
-                logger.info(f"📊 No resources to save for {game_player.user.username}")
-            
-        except Exception as e:
-            logger.error(f"❌ Error saving resources for {game_player.user.username}: {e}")
+                missing.append(player_id)
+        
+        if missing:
+            players_by_id = dict(players)
+            for player_id, user in zip(missing, GameSaver._create_guests(
+                    [(names[pid], getattr(players_by_id[pid], 'color', 'blue')) for pid in missing])):
+                users[player_id] = user
+        
+        return users
+    
+    @staticmethod
+    def _similar_users(words):
+        """
+        Zalogowani o nazwie zawierającej któreś ze słów - jedno zapytanie, najwyżej jeden (najstarszy)
+        użytkownik na słowo, więc krótkie albo popularne słowo nie wczytuje połowy tabeli
+        """
+        if not words:
+            return []
+        matches = Q()
+        for word in words:
+            first = (User.objects.filter(Q(username__icontains=word.lower()) | Q(display_name__icontains=word),
+                                         is_guest=False)
+                     .order_by('id').values('id')[:1])
+            matches |= Q(id=Subquery(first))
+        return list(User.objects.filter(matches).order_by('id'))
+    
+    @staticmethod
+    def _create_guests(guests):
+        """Utwórz gości [(display_name, color)] - jedno zapytanie o zajęte nazwy i jeden bulk_create"""
+        bases = []
+        for display_name, _ in guests:
+            safe_name = display_name.replace(' ', '_').replace('@', '_').replace('.', '_')
+            bases.append(f"guest_{safe_name}"[:40])
+        
+        new_users = []
+        # Wolne nazwy jednym zapytaniem (users/guests.py) - zajęta dostaje losowy sufiks zamiast _1, _2, ...
+        for (display_name, color), username in zip(guests, allocate_usernames(bases)):
+            user = User(
+                username=username,
+                email=f"{username}@guest.local",
+                is_guest=True,
+                display_name=display_name,
+                preferred_color=color
+            )
+            user.set_unusable_password()
+            new_users.append(user)
+            logger.info(f"🆕 Creating new guest user: {username}")
+        
+        return User.objects.bulk_create(new_users)
+    
+    @staticmethod
+    def _resource_columns(resources):
+        """Kolumny surowców GamePlayer {typ: ilość} z zasobów gracza w silniku"""
+        if not resources:
+            logger.warning("⚠️ No resources found for player")
+            return {}
+        
+        return {name: getattr(resources, name, 0) for name in RESOURCE_TYPES}
 
     @staticmethod
     def get_game_statistics_for_user(user_id):
         """
-        Pobierz statystyki gier dla użytkownika - BEZ ZMIAN
+        Pobierz statystyki gier dla użytkownika - jeden odczyt z UserStats
         """
         try:
-            game_players = GamePlayer.objects.filter(user_id=user_id)
-            
-            if not game_players.exists():
-                return {
-                    'total_games': 0,
-                    'wins': 0,
-                    'losses': 0,
-                    'win_rate': 0,
-                    'average_victory_points': 0,
-                    'average_roads': 0,
-                    'average_settlements': 0,
-                    'average_cities': 0,
-                    'longest_road_awards': 0,
-                    'largest_army_awards': 0,
-                }
-            
-            total_games = game_players.count()
-            wins = game_players.filter(victory_points__gte=4).count()  # ✅ 4 punkty dla testowania
-            
-            # Oblicz średnie
-            avg_points = sum(gp.victory_points for gp in game_players) / total_games
-            avg_roads = sum(gp.roads_built for gp in game_players) / total_games
-            avg_settlements = sum(gp.settlements_built for gp in game_players) / total_games
-            avg_cities = sum(gp.cities_built for gp in game_players) / total_games
-            
-            return {
-                'total_games': total_games,
-                'wins': wins,
-                'losses': total_games - wins,
-                'win_rate': (wins / total_games * 100) if total_games > 0 else 0,
-                'average_victory_points': round(avg_points, 2),
-                'average_roads': round(avg_roads, 2),
-                'average_settlements': round(avg_settlements, 2),
-                'average_cities': round(avg_cities, 2),
-                'longest_road_awards': game_players.filter(longest_road=True).count(),
-                'largest_army_awards': game_players.filter(largest_army=True).count(),
-            }
-            
+            stats = UserStats.objects.filter(user_id=user_id).first()
+            return (stats or UserStats(user_id=user_id)).as_dict()
         except Exception as e:
             logger.error(f"❌ Error getting statistics for user {user_id}: {e}")
-            return None
\ No newline at end of file
+            return None
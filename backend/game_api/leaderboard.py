@@ -0,0 +1,93 @@
+# backend/game_api/leaderboard.py
+# Ranking graczy z indeksu UserStats (win_rate, total_games) + mały cache top-K w procesie
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Sum
+
+from game_api.models import DailyGameStats, UserStats
+
+User = get_user_model()
+
+TOP_K = 50                     # ile pozycji trzymamy w cache (endpoint zwraca 10)
+TOTALS_TTL = 60                # sekundy - liczniki gier/graczy mogą być lekko nieaktualne (bez wersji)
+VERSION_KEY = 'leaderboard:version'
+
+_lock = threading.Lock()
+_snapshot = {'version': None, 'top': [], 'totals': None, 'built_at': 0.0}
+
+
+def current_version() -> int:
+    """Wersja rankingu we współdzielonym cache Django - podbijana po każdym zapisie gry"""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Po wyczyszczeniu cache wersja nie może wrócić do wartości, którą procesy mają już w _snapshot
+        fresh = time.time_ns()
+        cache.add(VERSION_KEY, fresh, timeout=None)
+        version = cache.get(VERSION_KEY, fresh)
+    return version
+
+
+def invalidate():
+    """Podbij wersję - wszystkie procesy przebudują swój cache przy następnym odczycie"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def _load_top():
+    # Z primary także w widokach czytających z repliki (game_api/replicas.py): przebudowa tuż po zapisie gry
+    # z opóźnionej repliki utrwaliłaby stary ranking do następnej gry. Liczniki mogą iść z repliki (TOTALS_TTL).
+    rows = (
+        UserStats.objects.using(DEFAULT_DB_ALIAS).filter(total_games__gt=0)
+        .order_by('-win_rate', '-total_games', 'user')
+        .select_related('user')[:TOP_K]
+    )
+    return [
+        {
+            'user_id': row.user_id,
+            'username': row.user.display_name or row.user.username,
+            'total_games': row.total_games,
+            'wins': row.wins,
+            'win_rate': round(row.win_rate, 1),
+            'avg_points': round(row.total_victory_points / row.total_games, 1),
+        }
+        for row in rows
+    ]
+
+
+def _load_totals():
+    # Gry i udziały w grach z dziennych rollupów (wiersz na dzień) zamiast COUNT(*) na games/game_players
+    sums = DailyGameStats.objects.aggregate(games=Sum('games'), players=Sum('players'))
+    return {
+        'total_games': sums['games'] or 0,
+        'total_players': User.objects.count(),
+        'total_game_sessions': sums['players'] or 0,
+    }
+
+
+def get_leaderboard(limit: int = 10):
+    """Top `limit` graczy (limit <= TOP_K) - z cache, dopóki wersja się nie zmieni"""
+    version = current_version()
+    with _lock:
+        if _snapshot['version'] != version:
+            _snapshot['top'] = _load_top()
+            _snapshot['version'] = version
+        return _snapshot['top'][:min(limit, TOP_K)]
+
+
+def get_totals():
+    """
+    Liczniki do global_stats - liczone najwyżej raz na TOTALS_TTL sekund. Nie zależą od wersji rankingu:
+    ta zmienia się przy każdej zapisanej grze, a liczniki nie muszą być co do gry aktualne.
+    """
+    now = time.monotonic()
+    with _lock:
+        if _snapshot['totals'] is None or now - _snapshot['built_at'] > TOTALS_TTL:
+            _snapshot['totals'] = _load_totals()
+            _snapshot['built_at'] = now
+        return dict(_snapshot['totals'])
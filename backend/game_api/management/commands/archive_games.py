@@ -0,0 +1,90 @@
+# backend/game_api/management/commands/archive_games.py
+# Archiwizacja starych gier:  python manage.py archive_games --retention-months 12 --dir /var/archive/games
+# Miesiące starsze niż okno retencji trafiają do plików games_RRRR_MM.ndjson.gz, a potem znikają z bazy:
+# na PostgreSQL przez odłączenie i usunięcie partycji, na innych bazach przez DELETE w ORM.
+# Przy okazji zakładane są partycje na najbliższe miesiące.
+# Rollupy, UserStats i ratingi zostają - zarchiwizowane miesiące zapisujemy w ArchivedMonth, a przebudowy
+# z historii (backfill_daily_stats, backfill_user_stats, recompute_ratings) pilnują tej granicy.
+import datetime
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from game_api import export, partitions
+from game_api.models import ArchivedMonth, Game
+
+
+class Command(BaseCommand):
+    help = "Wyeksportuj miesiące starsze niż okno retencji do skompresowanych plików i usuń je z bazy"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-months', type=int, default=12,
+                            help="Ile pełnych miesięcy (poza bieżącym) zostaje w bazie")
+        parser.add_argument('--dir', default='archive', help="Katalog na pliki archiwum")
+        parser.add_argument('--months-ahead', type=int, default=3, help="Partycje zakładane z wyprzedzeniem")
+        parser.add_argument('--dry-run', action='store_true', help="Tylko pokaż, co zostałoby zarchiwizowane")
+
+    def handle(self, *args, **options):
+        if options['retention_months'] < 0:
+            raise CommandError("--retention-months must be >= 0")
+        today = timezone.localdate()
+        cutoff = partitions.add_months(partitions.month_start(today), -options['retention_months'])
+
+        months = self.months_before(cutoff)
+        if not months:
+            self.stdout.write(f"Nothing older than {cutoff} to archive")
+        for month in months:
+            path = os.path.join(options['dir'], f"games_{month:%Y_%m}.ndjson.gz")
+            if options['dry_run']:
+                self.stdout.write(f"Would archive {month:%Y-%m} to {path}")
+                continue
+            rows = self.archive_month(month, path)
+            self.stdout.write(self.style.SUCCESS(f"✅ Archived {month:%Y-%m}: {rows} player rows -> {path}"))
+
+        if not options['dry_run']:
+            created = partitions.ensure_partitions(options['months_ahead'], today=today)
+            if created:
+                self.stdout.write(f"Created partitions: {', '.join(created)}")
+
+    def months_before(self, cutoff):
+        """Miesiące z grami sprzed `cutoff` - z partycji (PostgreSQL) i z danych (partycja domyślna, SQLite)"""
+        months = set()
+        if partitions.is_supported():
+            with connection.cursor() as cursor:
+                months.update(month for _, month in partitions.monthly_partitions('games', cursor) if month < cutoff)
+        start = timezone.make_aware(datetime.datetime.combine(cutoff, datetime.time.min))
+        months.update(
+            value.date() for value in
+            Game.objects.filter(start_time__lt=start).annotate(month=TruncMonth('start_time'))
+            .values_list('month', flat=True).distinct()
+        )
+        return sorted(months)
+
+    def archive_month(self, month, path):
+        """Plik powstaje najpierw pod tymczasową nazwą - dane są usuwane dopiero po udanym zapisie"""
+        since = timezone.make_aware(datetime.datetime.combine(month, datetime.time.min))
+        until = timezone.make_aware(datetime.datetime.combine(partitions.add_months(month, 1), datetime.time.min))
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        partial = path + '.partial'
+        with transaction.atomic():
+            with open(partial, 'wb') as target:
+                for chunk in export.stream('ndjson', compress=True, since=since, until=until):
+                    target.write(chunk)
+            player_rows = export.export_queryset(since, until).count()
+
+            if partitions.is_supported() and self.has_partition(month):
+                with connection.cursor() as cursor:
+                    partitions.drop_month(month, cursor)
+            # Wiersze z partycji domyślnej albo z bazy bez partycji
+            Game.objects.filter(start_time__gte=since, start_time__lt=until).delete()
+            ArchivedMonth.objects.update_or_create(month=month, defaults={'path': path, 'player_rows': player_rows})
+            os.replace(partial, path)
+        return player_rows
+
+    def has_partition(self, month):
+        with connection.cursor() as cursor:
+            return any(existing == month for _, existing in partitions.monthly_partitions('games', cursor))
@@ -0,0 +1,36 @@
+# backend/game_api/management/commands/backfill_daily_stats.py
+# Przebudowa dziennych rollupów z historii gier:  python manage.py backfill_daily_stats [--since 2025-01-01]
+# Po archive_games domyślnie od pierwszego niezarchiwizowanego dnia - rollupy starszych dni zostają.
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from game_api import rollups
+from game_api.models import ArchivedMonth
+
+
+class Command(BaseCommand):
+    help = "Przelicz DailyGameStats i DailySeatStats z tabel games/game_players (całość albo od podanego dnia)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help="Pierwszy przeliczany dzień (YYYY-MM-DD); domyślnie całość "
+                                            "albo pierwszy niezarchiwizowany dzień")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        since = parse_date(options['since']) if options['since'] else None
+        if options['since'] and since is None:
+            raise CommandError(f"Invalid date: {options['since']}")
+
+        retained = ArchivedMonth.retained_since()
+        if since is None and retained is not None:
+            since = retained
+            self.stdout.write(f"Games before {retained} are archived - keeping their daily stats")
+
+        try:
+            with transaction.atomic():
+                days = rollups.rebuild(since=since, batch_size=options['batch_size'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt daily stats for {days} days"))
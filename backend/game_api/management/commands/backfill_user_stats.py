@@ -0,0 +1,69 @@
+# backend/game_api/management/commands/backfill_user_stats.py
+# Przebudowa tabeli UserStats z całej historii GamePlayer:  python manage.py backfill_user_stats
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Sum, Value, When
+
+from game_api import leaderboard
+from game_engine.simple.models import WIN_VICTORY_POINTS
+from game_api.models import ArchivedMonth, GamePlayer, UserStats
+
+User = get_user_model()
+
+
+def _count_if(**condition):
+    return Sum(Case(When(**condition, then=Value(1)), default=Value(0), output_field=IntegerField()))
+
+
+class Command(BaseCommand):
+    help = "Przelicz UserStats oraz User.games_played/games_won z historii GamePlayer (jedno zapytanie agregujące)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Rozmiar paczek dla bulk_create/bulk_update")
+        parser.add_argument('--ignore-archive', action='store_true',
+                            help="Przelicz mimo zarchiwizowanych miesięcy - tylko z gier, które są w bazie")
+
+    def handle(self, *args, **options):
+        retained = ArchivedMonth.retained_since()
+        if retained is not None and not options['ignore_archive']:
+            raise CommandError(f"Games before {retained} are archived (archive_games) and would be dropped from "
+                               "the statistics and ratings; use --ignore-archive to rebuild from the retained "
+                               "games only")
+
+        batch_size = options['batch_size']
+
+        rows = (
+            GamePlayer.objects.values('user_id')
+            .annotate(
+                total_games=Count('id'),
+                wins=_count_if(victory_points__gte=WIN_VICTORY_POINTS),
+                total_victory_points=Sum('victory_points'),
+                total_roads=Sum('roads_built'),
+                total_settlements=Sum('settlements_built'),
+                total_cities=Sum('cities_built'),
+                longest_road_awards=_count_if(longest_road=True),
+                largest_army_awards=_count_if(largest_army=True),
+            )
+            .order_by('user_id')
+        )
+        stats = [UserStats(**row, win_rate=row['wins'] * 100 / row['total_games'])
+                 for row in rows.iterator(chunk_size=batch_size)]
+
+        with transaction.atomic():
+            UserStats.objects.all().delete()
+            UserStats.objects.bulk_create(stats, batch_size=batch_size)
+
+            User.objects.update(games_played=0, games_won=0)
+            User.objects.bulk_update(
+                [User(id=s.user_id, games_played=s.total_games, games_won=s.wins) for s in stats],
+                ['games_played', 'games_won'],
+                batch_size=batch_size,
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt statistics for {len(stats)} users"))
+        # Wiersze zostały odtworzone z domyślnym ratingiem - odbudowa z historii (unieważnia też ranking)
+        call_command('recompute_ratings', batch_size=batch_size, ignore_archive=options['ignore_archive'],
+                     stdout=self.stdout)
@@ -0,0 +1,172 @@
+# backend/game_api/management/commands/benchmark_queries.py
+# Plany EXPLAIN i czasy zapytań endpointów historii/statystyk bez i z indeksami:
+#   python manage.py benchmark_queries --users 20000 --games 50000
+# Dane testowe są wstawiane w transakcji i wycofywane na końcu (chyba że --keep).
+import io
+import itertools
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from django.db.models import Exists, OuterRef, Q
+
+from game_api.models import Game, GamePlayer, UserStats
+
+User = get_user_model()
+
+# (model, nazwa indeksu) - indeksy, których wpływ mierzymy
+BENCHMARK_INDEXES = [
+    (Game, 'game_history_idx'),
+    (GamePlayer, 'game_player_history_idx'),
+    (User, 'user_display_name_idx'),
+    (UserStats, 'user_stats_ranking_idx'),
+]
+
+# Indeksy schematu sprzed zmian - są tylko w przebiegu "bez indeksów", żeby porównanie startowało
+# od dawnego stanu: indeks FK user_id usunięty w 0006 (zastąpił go game_player_history_idx)
+BASELINE_INDEXES = [
+    (GamePlayer, models.Index(fields=['user'], name='bench_game_players_user_idx')),
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+def _index(model, name):
+    return next(index for index in model._meta.indexes if index.name == name)
+
+
+class Command(BaseCommand):
+    help = "Zasiej duży zbiór danych i porównaj plany/czasy zapytań endpointów bez i z indeksami"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20000)
+        parser.add_argument('--games', type=int, default=50000)
+        parser.add_argument('--players', type=int, default=4, help="Graczy w grze")
+        parser.add_argument('--repeat', type=int, default=5, help="Powtórzenia pomiaru (mediana)")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--keep', action='store_true', help="Nie wycofuj zasianych danych")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                heavy = self.seed(options)
+                queries = self.queries(heavy)
+
+                self.stdout.write(self.style.MIGRATE_HEADING("=== Bez indeksów ==="))
+                self.toggle_indexes('remove_sql')
+                before = self.measure(queries, options['repeat'])
+
+                self.toggle_indexes('create_sql')
+                self.stdout.write(self.style.MIGRATE_HEADING("=== Z indeksami ==="))
+                after = self.measure(queries, options['repeat'])
+
+                self.summary(before, after)
+                if not options['keep']:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write("Seeded data rolled back")
+
+    def toggle_indexes(self, method):
+        """
+        DROP/CREATE INDEX wewnątrz otwartej transakcji - bez wchodzenia w kontekst schema_editor,
+        który na SQLite nie działa w atomic(). Indeksy z BASELINE_INDEXES dostają odwrotną operację.
+        Potem ANALYZE, żeby planer widział aktualny stan.
+        """
+        editor = connection.schema_editor()
+        editor.deferred_sql = []
+        baseline_method = 'create_sql' if method == 'remove_sql' else 'remove_sql'
+        statements = [getattr(_index(model, name), method)(model, editor) for model, name in BENCHMARK_INDEXES]
+        statements += [getattr(index, baseline_method)(model, editor) for model, index in BASELINE_INDEXES]
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(str(statement))
+            cursor.execute('ANALYZE')
+
+    def seed(self, options):
+        """Użytkownicy, gry i GamePlayer wstawiane paczkami; zwraca najaktywniejszego gracza"""
+        rng = random.Random(options['seed'])
+        user_count, game_count, per_game = options['users'], options['games'], options['players']
+        started = time.perf_counter()
+
+        users = User.objects.bulk_create(
+            [User(username=f"bench_{i}", email=f"bench_{i}@bench.local", password='!',
+                  is_guest=i % 3 == 0, display_name=f"Bench {i % (user_count // 2 or 1)}")
+             for i in range(user_count)],
+            batch_size=5000,
+        )
+        games = Game.objects.bulk_create([Game(turns=rng.randint(20, 90)) for _ in range(game_count)],
+                                         batch_size=5000)
+
+        # Rozkład potęgowy - kilku graczy ma tysiące gier (głębokie strony historii)
+        cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(user_count)))
+        population = range(user_count)
+        rows = []
+        for game in games:
+            seated = dict.fromkeys(rng.choices(population, cum_weights=cum_weights, k=per_game * 3))
+            seated = list(seated)[:per_game]
+            for seat, index in enumerate(seated):
+                rows.append(GamePlayer(game=game, user=users[index], start_time=game.start_time,
+                                       victory_points=4 if seat == 0 else rng.randint(0, 3)))
+        GamePlayer.objects.bulk_create(rows, batch_size=5000)
+        call_command('backfill_user_stats', stdout=io.StringIO())
+        # Odroczone sprawdzenia FK (PostgreSQL) blokowałyby CREATE INDEX w tej samej transakcji
+        connection.check_constraints()
+
+        self.stdout.write(f"Seeded {user_count} users, {game_count} games, {len(rows)} game players "
+                          f"in {time.perf_counter() - started:.1f}s")
+        return users[0]
+
+    def queries(self, heavy):
+        """Zapytania w postaci, w jakiej wykonują je widoki"""
+        history = GamePlayer.objects.filter(user_id=heavy.id).order_by('-start_time', '-id')
+        middle = history.values_list('start_time', 'id')[history.count() // 2]
+        return {
+            'users/{id}/games/ (page 1)':
+                history.select_related('game')[:21],
+            'users/{id}/games/ (deep page)':
+                history.filter(Q(start_time__lt=middle[0]) | Q(start_time=middle[0], id__lt=middle[1]))
+                .select_related('game')[:21],
+            'games/?user_id=':
+                Game.objects.filter(Exists(GamePlayer.objects.filter(game_id=OuterRef('pk'), user_id=heavy.id)))
+                .order_by('-start_time', '-id')[:21],
+            'games/recent/':
+                Game.objects.order_by('-start_time', '-id')[:10],
+            'games/{id}/players/':
+                GamePlayer.objects.filter(game_id=history.values_list('game_id', flat=True)[0]).select_related('user'),
+            'users/{id}/games/ (display_name fallback)':
+                User.objects.filter(display_name=heavy.display_name).exclude(id=heavy.id)
+                .filter(Exists(GamePlayer.objects.filter(user_id=OuterRef('pk')))).order_by('id')[:1],
+            'users/{id}/statistics/ (display_name fallback)':
+                UserStats.objects.filter(user__display_name=heavy.display_name, total_games__gt=0)
+                .exclude(user_id=heavy.id).order_by('user_id')[:1],
+            'stats/global_stats/ (leaderboard)':
+                UserStats.objects.filter(total_games__gt=0).order_by('-win_rate', '-total_games', 'user')[:50],
+        }
+
+    def measure(self, queries, repeat):
+        results = {}
+        for label, queryset in queries.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            results[label] = statistics.median(timings)
+
+            self.stdout.write(self.style.SQL_TABLE(f"\n--- {label}: {results[label]:.2f} ms"))
+            self.stdout.write(queryset.explain())
+        return results
+
+    def summary(self, before, after):
+        self.stdout.write(self.style.MIGRATE_HEADING("\n=== Podsumowanie (mediana ms) ==="))
+        width = max(len(label) for label in before)
+        self.stdout.write(f"{'endpoint'.ljust(width)}  {'bez':>9}  {'z':>9}  {'x':>6}")
+        for label in before:
+            speedup = before[label] / after[label] if after[label] else float('inf')
+            self.stdout.write(f"{label.ljust(width)}  {before[label]:9.2f}  {after[label]:9.2f}  {speedup:6.1f}")
@@ -0,0 +1,43 @@
+# backend/game_api/management/commands/export_games.py
+# Eksport historii gier do pliku lub na stdout:
+#   python manage.py export_games --output csv --gzip --since 2025-01-01 --file games.csv.gz
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from game_api import export
+
+
+class Command(BaseCommand):
+    help = "Strumieniowy eksport historii gier (NDJSON/CSV, opcjonalnie gzip) - stała pamięć niezależnie od liczby wierszy"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', choices=export.FORMATS, default='ndjson')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--since', help="Data lub data z godziną (włącznie)")
+        parser.add_argument('--until', help="Data lub data z godziną (sama data - włącznie z tym dniem)")
+        parser.add_argument('--user', type=int, help="Tylko gry tego użytkownika (id)")
+        parser.add_argument('--file', help="Plik wyjściowy (domyślnie stdout)")
+        parser.add_argument('--chunk-size', type=int, default=export.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            since = export.parse_bound(options['since'])
+            until = export.parse_bound(options['until'], end=True)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        chunks = export.stream(options['output'], options['gzip'], since=since, until=until,
+                               user_id=options['user'], chunk_size=options['chunk_size'])
+        target = open(options['file'], 'wb') if options['file'] else sys.stdout.buffer
+        try:
+            written = 0
+            for chunk in chunks:
+                target.write(chunk)
+                written += len(chunk)
+        finally:
+            if options['file']:
+                target.close()
+
+        if options['file']:
+            self.stdout.write(self.style.SUCCESS(f"✅ Exported {written} bytes to {options['file']}"))
@@ -0,0 +1,63 @@
+# backend/game_api/management/commands/recompute_ratings.py
+# Przeliczenie ratingów z całej historii GamePlayer:  python manage.py recompute_ratings
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from game_api import leaderboard, ratings
+from game_api.models import ArchivedMonth, GamePlayer, UserStats
+
+
+class Command(BaseCommand):
+    help = "Przelicz UserStats.rating od zera z chronologicznej historii gier (wektorowo, numpy)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Rozmiar paczek przy odczycie i zapisie")
+        parser.add_argument('--k', type=float, default=ratings.K_FACTOR,
+                            help="Współczynnik K (maksymalna zmiana ratingu w grze)")
+        parser.add_argument('--ignore-archive', action='store_true',
+                            help="Przelicz mimo zarchiwizowanych miesięcy - tylko z gier, które są w bazie")
+
+    def handle(self, *args, **options):
+        retained = ArchivedMonth.retained_since()
+        if retained is not None and not options['ignore_archive']:
+            raise CommandError(f"Games before {retained} are archived (archive_games) and would be dropped from "
+                               "the ratings; use --ignore-archive to rebuild from the retained games only")
+
+        batch_size = options['batch_size']
+
+        rows = (
+            GamePlayer.objects.order_by('game__start_time', 'game_id', 'id')
+            .values_list('game_id', 'user_id', 'victory_points')
+        )
+        games, users = [], {}
+        last_game = None
+        for game_id, user_id, points in rows.iterator(chunk_size=batch_size):
+            if game_id != last_game:
+                games.append([])
+                last_game = game_id
+            games[-1].append((users.setdefault(user_id, len(users)), points))
+
+        seats = max((len(game) for game in games), default=0)
+        user_index = np.zeros((len(games), seats), dtype=np.int64)
+        points = np.zeros((len(games), seats), dtype=np.int64)
+        mask = np.zeros((len(games), seats), dtype=bool)
+        for g, game in enumerate(games):
+            user_index[g, :len(game)], points[g, :len(game)] = zip(*game)
+            mask[g, :len(game)] = True
+
+        result = ratings.recompute(user_index, points, mask, len(users), options['k'])
+
+        with transaction.atomic():
+            UserStats.objects.update(rating=ratings.INITIAL_RATING)
+            UserStats.objects.bulk_create(
+                [UserStats(user_id=user_id, rating=float(result[index])) for user_id, index in users.items()],
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=['user'],
+                update_fields=['rating'],
+            )
+
+        leaderboard.invalidate()
+        self.stdout.write(self.style.SUCCESS(f"✅ Recomputed ratings for {len(users)} users from {len(games)} games"))
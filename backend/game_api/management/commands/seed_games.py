@@ -0,0 +1,92 @@
+# backend/game_api/management/commands/seed_games.py
+# Syntetyczne dane do testów obciążeniowych endpointów:
+#   python manage.py seed_games --users 50000 --games 1000000 --days 730 [--copy]
+# Gry losowane są modelem statystycznym (game_api/synthetic.py) i wstawiane paczkami - bulk_create albo COPY
+# (PostgreSQL). Na końcu przeliczane są UserStats/ratingi i dzienne rollupy, jak po prawdziwych grach.
+import datetime
+import time
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from game_api import partitions, synthetic
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Wygeneruj użytkowników i historię gier (games/game_players) w dużej skali do benchmarków"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help="Nowi użytkownicy (0 - tylko istniejący z prefiksem)")
+        parser.add_argument('--games', type=int, default=10000)
+        parser.add_argument('--min-players', type=int, default=2)
+        parser.add_argument('--max-players', type=int, default=4)
+        parser.add_argument('--days', type=int, default=365, help="Gry rozłożone na tyle ostatnich dni")
+        parser.add_argument('--batch-size', type=int, default=10000, help="Gier w jednej paczce/transakcji")
+        parser.add_argument('--prefix', default='seed_', help="Prefiks nazw generowanych użytkowników")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--copy', action='store_true', help="COPY zamiast bulk_create (tylko PostgreSQL)")
+        parser.add_argument('--skip-backfill', action='store_true',
+                            help="Nie przeliczaj UserStats, ratingów i rollupów po wstawieniu")
+
+    def handle(self, *args, **options):
+        min_players, max_players = options['min_players'], options['max_players']
+        if not 1 <= min_players <= max_players:
+            raise CommandError("Expected 1 <= --min-players <= --max-players")
+        if options['games'] < 0 or options['users'] < 0 or options['days'] < 1 or options['batch_size'] < 1:
+            raise CommandError("--games/--users must be >= 0, --days/--batch-size >= 1")
+        if options['copy'] and connection.vendor != 'postgresql':
+            raise CommandError("--copy requires PostgreSQL")
+
+        rng = np.random.default_rng(options['seed'])
+        started = time.perf_counter()
+        user_ids = self.create_users(options['users'], options['prefix'], options['batch_size'])
+        if len(user_ids) < max_players:
+            raise CommandError(f"Need at least {max_players} users with prefix {options['prefix']!r}")
+        weights = synthetic.popularity(len(user_ids))
+
+        until = timezone.now()
+        since = until - datetime.timedelta(days=options['days'])
+        created = partitions.ensure_partitions(since=timezone.localdate(since))
+        if created:
+            self.stdout.write(f"Created {len(created)} partitions")
+
+        games = players = 0
+        while games < options['games']:
+            size = min(options['batch_size'], options['games'] - games)
+            game_columns, player_columns = synthetic.game_batch(
+                rng, size, user_ids, weights, since, until, min_players, max_players)
+            with transaction.atomic():
+                if options['copy']:
+                    inserted = synthetic.insert_copy(game_columns, player_columns)
+                else:
+                    inserted = synthetic.insert_orm(game_columns, player_columns, options['batch_size'])
+            games, players = games + inserted[0], players + inserted[1]
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"  {games}/{options['games']} games, {players} players "
+                              f"({games / elapsed:.0f} games/s)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Seeded {games} games and {players} game players for {len(user_ids)} users "
+            f"in {time.perf_counter() - started:.1f}s"))
+
+        if not options['skip_backfill']:
+            call_command('backfill_user_stats', batch_size=options['batch_size'], stdout=self.stdout)
+            call_command('backfill_daily_stats', batch_size=options['batch_size'], stdout=self.stdout)
+
+    def create_users(self, count, prefix, batch_size):
+        """Nowi użytkownicy z kolejnymi numerami; zwraca id wszystkich użytkowników z prefiksem (najstarsi pierwsi)"""
+        existing = User.objects.filter(username__startswith=prefix)
+        offset = existing.count()
+        User.objects.bulk_create(
+            [User(username=f"{prefix}{number}", email=f"{prefix}{number}@seed.local", password='!',
+                  is_guest=number % 3 == 0, display_name=f"Seed {number}")
+             for number in range(offset, offset + count)],
+            batch_size=batch_size,
+        )
+        return list(existing.order_by('id').values_list('id', flat=True))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0001_initial'),
+        ('users', '0002_alter_user_groups_alter_user_user_permissions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(db_column='user_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='game_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_games', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('total_victory_points', models.IntegerField(default=0)),
+                ('total_roads', models.IntegerField(default=0)),
+                ('total_settlements', models.IntegerField(default=0)),
+                ('total_cities', models.IntegerField(default=0)),
+                ('longest_road_awards', models.IntegerField(default=0)),
+                ('largest_army_awards', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'user_stats',
+            },
+        ),
+    ]
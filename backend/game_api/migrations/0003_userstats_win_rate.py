@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:02
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+
+def fill_win_rate(apps, schema_editor):
+    UserStats = apps.get_model('game_api', 'UserStats')
+    UserStats.objects.filter(total_games__gt=0).update(
+        win_rate=Cast('wins', FloatField()) * 100 / F('total_games')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0002_userstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstats',
+            name='win_rate',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='userstats',
+            index=models.Index(fields=['-win_rate', '-total_games', 'user'], name='user_stats_ranking_idx'),
+        ),
+        migrations.RunPython(fill_win_rate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0003_userstats_win_rate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstats',
+            name='rating',
+            field=models.FloatField(default=1500.0),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:06
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_start_time(apps, schema_editor):
+    Game = apps.get_model('game_api', 'Game')
+    GamePlayer = apps.get_model('game_api', 'GamePlayer')
+    GamePlayer.objects.update(
+        start_time=Subquery(Game.objects.filter(id=OuterRef('game_id')).values('start_time')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0004_userstats_rating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameplayer',
+            name='start_time',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['-start_time', '-id'], name='game_history_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gameplayer',
+            index=models.Index(fields=['user', '-start_time', '-id'], name='game_player_history_idx'),
+        ),
+        migrations.RunPython(fill_start_time, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0005_history_pagination'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='gameplayer',
+            name='game',
+            field=models.ForeignKey(db_column='game_id', db_index=False, on_delete=django.db.models.deletion.CASCADE, to='game_api.game'),
+        ),
+        migrations.AlterField(
+            model_name='gameplayer',
+            name='user',
+            field=models.ForeignKey(db_column='user_id', db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
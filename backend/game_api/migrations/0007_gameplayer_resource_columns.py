@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+RESOURCE_TYPES = ('wood', 'brick', 'sheep', 'wheat', 'ore')
+CHUNK_SIZE = 2000
+
+
+def _chunks(model):
+    """Kolejne zakresy klucza głównego [start, stop) po CHUNK_SIZE wierszy - bez OFFSET i bez całej tabeli w pamięci"""
+    last = 0
+    while True:
+        ids = list(model.objects.filter(id__gt=last).order_by('id').values_list('id', flat=True)[:CHUNK_SIZE])
+        if not ids:
+            return
+        yield ids[0], ids[-1] + 1
+        last = ids[-1]
+
+
+def rows_to_columns(apps, schema_editor):
+    GamePlayer = apps.get_model('game_api', 'GamePlayer')
+    PlayerResource = apps.get_model('game_api', 'PlayerResource')
+
+    for start, stop in _chunks(GamePlayer):
+        players = {gp.id: gp for gp in GamePlayer.objects.filter(id__gte=start, id__lt=stop).only('id')}
+        rows = PlayerResource.objects.filter(game_player_id__gte=start, game_player_id__lt=stop)
+        for game_player_id, resource_type, amount in rows.values_list('game_player_id', 'resource_type', 'amount'):
+            if resource_type in RESOURCE_TYPES:
+                setattr(players[game_player_id], resource_type, amount)
+        GamePlayer.objects.bulk_update(players.values(), RESOURCE_TYPES)
+
+
+def columns_to_rows(apps, schema_editor):
+    GamePlayer = apps.get_model('game_api', 'GamePlayer')
+    PlayerResource = apps.get_model('game_api', 'PlayerResource')
+
+    for start, stop in _chunks(GamePlayer):
+        PlayerResource.objects.bulk_create([
+            PlayerResource(game_player_id=row[0], resource_type=name, amount=amount)
+            for row in GamePlayer.objects.filter(id__gte=start, id__lt=stop).values_list('id', *RESOURCE_TYPES)
+            for name, amount in zip(RESOURCE_TYPES, row[1:])
+            if amount > 0
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0006_drop_redundant_fk_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameplayer',
+            name='brick',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gameplayer',
+            name='ore',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gameplayer',
+            name='sheep',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gameplayer',
+            name='wheat',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gameplayer',
+            name='wood',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(rows_to_columns, columns_to_rows),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0007_gameplayer_resource_columns'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='PlayerResource',
+        ),
+    ]
@@ -0,0 +1,144 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:15
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+CHUNK_SIZE = 2000
+
+# Zamrożone na stan z tej migracji (game_api.models, game_api.rollups, silnik gry) - późniejsze zmiany
+# w kodzie aplikacji nie mogą zmienić tego, co robi migracja
+DICE_TOTALS = tuple(range(2, 13))
+RESOURCE_TYPES = ('wood', 'brick', 'sheep', 'wheat', 'ore')
+WIN_VICTORY_POINTS = 4
+DICE_FIELDS = [f'dice_{total}' for total in DICE_TOTALS]
+HOLDER_FIELDS = [f'{name}_holders' for name in RESOURCE_TYPES]
+COUNTER_FIELDS = ['games', 'players', 'total_turns', *DICE_FIELDS, *RESOURCE_TYPES, *HOLDER_FIELDS]
+
+
+def rebuild_rollups(apps):
+    """Kopia rollups.rebuild() z tej migracji: pełne przeliczenie rollupów z games/game_players"""
+    Game = apps.get_model('game_api', 'Game')
+    GamePlayer = apps.get_model('game_api', 'GamePlayer')
+    DailyGameStats = apps.get_model('game_api', 'DailyGameStats')
+    DailySeatStats = apps.get_model('game_api', 'DailySeatStats')
+
+    DailyGameStats.objects.all().delete()
+    DailySeatStats.objects.all().delete()
+    players = GamePlayer.objects.annotate(day=TruncDate('game__start_time'))
+
+    days = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+    for start_time, turns, dice_distribution in Game.objects.values_list(
+            'start_time', 'turns', 'dice_distribution').iterator(chunk_size=CHUNK_SIZE):
+        row = days[timezone.localdate(start_time)]
+        row['games'] += 1
+        row['total_turns'] += turns
+        dice_distribution = dice_distribution or {}
+        for total in DICE_TOTALS:
+            row[f'dice_{total}'] += int(dice_distribution.get(str(total), 0))
+
+    resource_sums = {f'sum_{name}': Sum(name) for name in RESOURCE_TYPES}
+    holder_counts = {f'{name}_holders': Count('id', filter=Q(**{f'{name}__gt': 0})) for name in RESOURCE_TYPES}
+    for row in players.values('day').annotate(players=Count('id'), **resource_sums, **holder_counts):
+        day = row.pop('day')
+        days[day].update({key.removeprefix('sum_'): value for key, value in row.items()})
+
+    DailyGameStats.objects.bulk_create(
+        [DailyGameStats(day=day, **counters) for day, counters in days.items()], batch_size=CHUNK_SIZE)
+
+    seat_rows = (
+        players.filter(seat__isnull=False).values('day', 'seat')
+        .annotate(players=Count('id'), wins=Count('id', filter=Q(victory_points__gte=WIN_VICTORY_POINTS)))
+    )
+    DailySeatStats.objects.bulk_create([DailySeatStats(**row) for row in seat_rows], batch_size=CHUNK_SIZE)
+
+
+def fill_seats_and_rollups(apps, schema_editor):
+    """
+    Stare wiersze nie znają miejsca - GameSaver zapisywał graczy w kolejności dołączenia,
+    więc miejsce to pozycja wiersza w grze. Potem pierwsze wypełnienie rollupów.
+    """
+    GamePlayer = apps.get_model('game_api', 'GamePlayer')
+    last = (0, 0)
+    current_game, seat = None, 0
+    while True:
+        chunk = list(
+            GamePlayer.objects.filter(models.Q(game_id__gt=last[0]) | models.Q(game_id=last[0], id__gt=last[1]))
+            .order_by('game_id', 'id').only('id', 'game_id')[:CHUNK_SIZE]
+        )
+        if not chunk:
+            break
+        for gp in chunk:
+            seat = seat + 1 if gp.game_id == current_game else 0
+            current_game = gp.game_id
+            gp.seat = seat
+        GamePlayer.objects.bulk_update(chunk, ['seat'])
+        last = (chunk[-1].game_id, chunk[-1].id)
+
+    rebuild_rollups(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0008_delete_playerresource'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyGameStats',
+            fields=[
+                ('day', models.DateField(primary_key=True, serialize=False)),
+                ('games', models.IntegerField(default=0)),
+                ('players', models.IntegerField(default=0)),
+                ('total_turns', models.IntegerField(default=0)),
+                ('dice_2', models.IntegerField(default=0)),
+                ('dice_3', models.IntegerField(default=0)),
+                ('dice_4', models.IntegerField(default=0)),
+                ('dice_5', models.IntegerField(default=0)),
+                ('dice_6', models.IntegerField(default=0)),
+                ('dice_7', models.IntegerField(default=0)),
+                ('dice_8', models.IntegerField(default=0)),
+                ('dice_9', models.IntegerField(default=0)),
+                ('dice_10', models.IntegerField(default=0)),
+                ('dice_11', models.IntegerField(default=0)),
+                ('dice_12', models.IntegerField(default=0)),
+                ('wood', models.IntegerField(default=0)),
+                ('brick', models.IntegerField(default=0)),
+                ('sheep', models.IntegerField(default=0)),
+                ('wheat', models.IntegerField(default=0)),
+                ('ore', models.IntegerField(default=0)),
+                ('wood_holders', models.IntegerField(default=0)),
+                ('brick_holders', models.IntegerField(default=0)),
+                ('sheep_holders', models.IntegerField(default=0)),
+                ('wheat_holders', models.IntegerField(default=0)),
+                ('ore_holders', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'daily_game_stats',
+            },
+        ),
+        migrations.AddField(
+            model_name='gameplayer',
+            name='seat',
+            field=models.SmallIntegerField(null=True),
+        ),
+        migrations.CreateModel(
+            name='DailySeatStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('seat', models.SmallIntegerField()),
+                ('players', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'daily_seat_stats',
+                'unique_together': {('day', 'seat')},
+            },
+        ),
+        migrations.RunPython(fill_seats_and_rollups, migrations.RunPython.noop),
+    ]
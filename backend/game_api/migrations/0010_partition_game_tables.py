@@ -0,0 +1,107 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:20
+
+import datetime
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+# Zamrożona kopia game_api.partitions z tej migracji - późniejsze zmiany modułu nie mogą jej zmienić
+PARTITION_KEY = 'start_time'
+MONTHS_AHEAD = 3
+TABLES = {
+    'games': [
+        'ALTER TABLE "games" ADD CONSTRAINT "games_pkey" PRIMARY KEY ("id", "start_time")',
+        'CREATE INDEX "game_history_idx" ON "games" ("start_time" DESC, "id" DESC)',
+    ],
+    'game_players': [
+        'ALTER TABLE "game_players" ADD CONSTRAINT "game_players_pkey" PRIMARY KEY ("id", "start_time")',
+        'ALTER TABLE "game_players" ADD CONSTRAINT "game_players_game_user_uniq" '
+        'UNIQUE ("game_id", "user_id", "start_time")',
+        'CREATE INDEX "game_player_history_idx" ON "game_players" ("user_id", "start_time" DESC, "id" DESC)',
+        'ALTER TABLE "game_players" ADD CONSTRAINT "game_players_user_id_fk_users_user_id" '
+        'FOREIGN KEY ("user_id") REFERENCES "users_user" ("id") DEFERRABLE INITIALLY DEFERRED',
+    ],
+}
+
+
+def month_start(day):
+    return datetime.date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def months_between(first, last):
+    month = month_start(first)
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def partition_table(table, cursor):
+    """Zamiana zwykłej tabeli na partycjonowaną: nowa tabela, partycje od najstarszego wiersza, kopia danych"""
+    new = f"{table}_partitioned"
+    cursor.execute(f'SELECT min("{PARTITION_KEY}") FROM "{table}"')
+    oldest = cursor.fetchone()[0]
+    today = datetime.date.today()
+    first = month_start(min(oldest.date(), today) if oldest else today)
+
+    cursor.execute(f'CREATE TABLE "{new}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING IDENTITY) '
+                   f'PARTITION BY RANGE ("{PARTITION_KEY}")')
+    cursor.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{new}" DEFAULT')
+    for month in months_between(first, add_months(month_start(today), MONTHS_AHEAD)):
+        cursor.execute(f'CREATE TABLE "{table}_{month:%Y_%m}" PARTITION OF "{new}" '
+                       f'FOR VALUES FROM (%s) TO (%s)', [month, add_months(month, 1)])
+
+    cursor.execute(f'INSERT INTO "{new}" SELECT * FROM "{table}"')
+    cursor.execute(f'DROP TABLE "{table}" CASCADE')
+    cursor.execute(f'ALTER TABLE "{new}" RENAME TO "{table}"')
+    for statement in TABLES[table]:
+        cursor.execute(statement)
+    cursor.execute(f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+                   f"coalesce((SELECT max(id) FROM \"{table}\"), 0) + 1, false)")
+
+
+def fill_missing_start_time(apps, schema_editor):
+    Game = apps.get_model('game_api', 'Game')
+    GamePlayer = apps.get_model('game_api', 'GamePlayer')
+    GamePlayer.objects.filter(start_time__isnull=True).update(
+        start_time=Subquery(Game.objects.filter(id=OuterRef('game_id')).values('start_time')[:1])
+    )
+
+
+def partition_tables(apps, schema_editor):
+    """games i game_players jako tabele partycjonowane po miesiącach (tylko PostgreSQL)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table in TABLES:
+            cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [table])
+            if cursor.fetchone() is None:
+                partition_table(table, cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0009_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_missing_start_time, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='gameplayer',
+            name='start_time',
+            field=models.DateTimeField(),
+        ),
+        migrations.AlterField(
+            model_name='gameplayer',
+            name='game',
+            field=models.ForeignKey(db_column='game_id', db_constraint=False, db_index=False, on_delete=django.db.models.deletion.CASCADE, to='game_api.game'),
+        ),
+        # Tylko PostgreSQL; nieodwracalna - klucze główne tabel zawierają potem start_time
+        migrations.RunPython(partition_tables),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:23
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0010_partition_game_tables'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='game',
+            name='start_time',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0011_game_start_time_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedMonth',
+            fields=[
+                ('month', models.DateField(primary_key=True, serialize=False)),
+                ('path', models.CharField(max_length=500)),
+                ('player_rows', models.IntegerField(default=0)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'archived_months',
+            },
+        ),
+    ]
@@ -1,11 +1,20 @@
 # backend/game_api/models.py
 from django.db import models
 from django.conf import settings  # Import dla AUTH_USER_MODEL
+from django.utils import timezone
+
+from game_api.partitions import add_months
 
 # Usuń duplikowany model User - używaj users.User!
 
+# Surowce na koniec gry - kolumny GamePlayer o tych samych nazwach
+RESOURCE_TYPES = ('wood', 'brick', 'sheep', 'wheat', 'ore')
+# Sumy oczek dwóch kości - kolumny dice_<n> w DailyGameStats
+DICE_TOTALS = tuple(range(2, 13))
+
 class Game(models.Model):
-    start_time = models.DateTimeField(auto_now_add=True)
+    # default zamiast auto_now_add - import/seed (seed_games) może zapisać historyczną datę
+    start_time = models.DateTimeField(default=timezone.now)
     end_time = models.DateTimeField(null=True, blank=True)
     dice_distribution = models.JSONField(default=dict, blank=True)
     turns = models.IntegerField(default=0)
@@ -15,34 +24,48 @@ class Game(models.Model):
 
     class Meta:
         db_table = 'games'
+        indexes = [
+            # Stronicowanie kursorem historii gier (game_api/pagination.py)
+            models.Index(fields=['-start_time', '-id'], name='game_history_idx'),
+        ]
 
 
 class GamePlayer(models.Model):
-    game = models.ForeignKey(Game, on_delete=models.CASCADE, db_column='game_id')
+    # Osobne indeksy FK są zbędne: game_id pokrywa unique (game, user), user_id - game_player_history_idx.
+    # Bez ograniczenia FK w bazie: games jest partycjonowane (PK zawiera start_time), kaskadę robi Django.
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, db_column='game_id', db_index=False,
+                             db_constraint=False)
     # ✅ Używaj settings.AUTH_USER_MODEL zamiast lokalnego User
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_column='user_id')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_column='user_id', db_index=False)
     victory_points = models.IntegerField()
     roads_built = models.IntegerField(default=0)
     settlements_built = models.IntegerField(default=0)
     cities_built = models.IntegerField(default=0)
     longest_road = models.BooleanField(default=False)
     largest_army = models.BooleanField(default=False)
+    # Kopia Game.start_time - historia gracza stronicowana jest jednym indeksem (user, start_time, id) bez JOIN-a;
+    # jednocześnie klucz partycji game_players (game_api/partitions.py)
+    start_time = models.DateTimeField()
+    # Miejsce przy stole (kolejność dołączenia w silniku, od 0); NULL dla gier zapisanych przed dodaniem pola
+    seat = models.SmallIntegerField(null=True)
+    # Surowce na koniec gry (RESOURCE_TYPES) - zamiast pięciu wierszy w osobnej tabeli
+    wood = models.IntegerField(default=0)
+    brick = models.IntegerField(default=0)
+    sheep = models.IntegerField(default=0)
+    wheat = models.IntegerField(default=0)
+    ore = models.IntegerField(default=0)
 
     class Meta:
         unique_together = ('game', 'user')
         db_table = 'game_players'
+        indexes = [
+            models.Index(fields=['user', '-start_time', '-id'], name='game_player_history_idx'),
+        ]
 
-
-class PlayerResource(models.Model):
-    game_player = models.ForeignKey(GamePlayer, on_delete=models.CASCADE, db_column='game_player_id')
-    resource_type = models.CharField(
-        max_length=20,
-        choices=[('wood', 'Wood'), ('brick', 'Brick'), ('sheep', 'Sheep'), ('wheat', 'Wheat'), ('ore', 'Ore')]
-    )
-    amount = models.IntegerField()
-
-    class Meta:
-        db_table = 'player_resources'
+    @property
+    def resources(self):
+        """Niezerowe surowce gracza: {typ: ilość}"""
+        return {name: getattr(self, name) for name in RESOURCE_TYPES if getattr(self, name)}
 
 
 class Vertex(models.Model):
@@ -99,4 +122,124 @@ class BoardState(models.Model):
             'roads': roads_count,
             'total_vertices': Vertex.objects.count(),
             'total_edges': Edge.objects.count()
-        }
\ No newline at end of file
+        }
+
+class UserStats(models.Model):
+    """Podsumowanie statystyk gracza - jeden wiersz na użytkownika, aktualizowany przy zapisie gry"""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True,
+                                related_name='game_stats', db_column='user_id')
+    total_games = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    total_victory_points = models.IntegerField(default=0)
+    total_roads = models.IntegerField(default=0)
+    total_settlements = models.IntegerField(default=0)
+    total_cities = models.IntegerField(default=0)
+    longest_road_awards = models.IntegerField(default=0)
+    largest_army_awards = models.IntegerField(default=0)
+    # Zapisany procent wygranych - ranking czyta gotową kolejność z indeksu zamiast liczyć dla każdego gracza
+    win_rate = models.FloatField(default=0)
+    # Wieloosobowe Elo (game_api/ratings.py), aktualizowane przy zapisie gry
+    rating = models.FloatField(default=1500.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'user_stats'
+        indexes = [
+            models.Index(fields=['-win_rate', '-total_games', 'user'], name='user_stats_ranking_idx'),
+        ]
+
+    def __str__(self):
+        return f"Stats for user {self.user_id}: {self.wins}/{self.total_games}"
+
+    def as_dict(self):
+        """Ten sam format co wcześniej liczony GameSaver.get_game_statistics_for_user"""
+        games = self.total_games
+        return {
+            'total_games': games,
+            'wins': self.wins,
+            'losses': games - self.wins,
+            'win_rate': (self.wins / games * 100) if games > 0 else 0,
+            'average_victory_points': round(self.total_victory_points / games, 2) if games else 0,
+            'average_roads': round(self.total_roads / games, 2) if games else 0,
+            'average_settlements': round(self.total_settlements / games, 2) if games else 0,
+            'average_cities': round(self.total_cities / games, 2) if games else 0,
+            'longest_road_awards': self.longest_road_awards,
+            'largest_army_awards': self.largest_army_awards,
+            'rating': round(self.rating, 1),
+        }
+
+
+class DailyGameStats(models.Model):
+    """Dzienny rollup zakończonych gier - aktualizowany przy zapisie gry (game_api/rollups.py)"""
+    day = models.DateField(primary_key=True)
+    games = models.IntegerField(default=0)
+    players = models.IntegerField(default=0)
+    total_turns = models.IntegerField(default=0)
+    # Rozkład rzutów (suma z Game.dice_distribution wszystkich gier dnia)
+    dice_2 = models.IntegerField(default=0)
+    dice_3 = models.IntegerField(default=0)
+    dice_4 = models.IntegerField(default=0)
+    dice_5 = models.IntegerField(default=0)
+    dice_6 = models.IntegerField(default=0)
+    dice_7 = models.IntegerField(default=0)
+    dice_8 = models.IntegerField(default=0)
+    dice_9 = models.IntegerField(default=0)
+    dice_10 = models.IntegerField(default=0)
+    dice_11 = models.IntegerField(default=0)
+    dice_12 = models.IntegerField(default=0)
+    # Surowce na koniec gry: suma i liczba graczy, którzy je mieli (średnia jak w resource_analysis)
+    wood = models.IntegerField(default=0)
+    brick = models.IntegerField(default=0)
+    sheep = models.IntegerField(default=0)
+    wheat = models.IntegerField(default=0)
+    ore = models.IntegerField(default=0)
+    wood_holders = models.IntegerField(default=0)
+    brick_holders = models.IntegerField(default=0)
+    sheep_holders = models.IntegerField(default=0)
+    wheat_holders = models.IntegerField(default=0)
+    ore_holders = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'daily_game_stats'
+
+    def __str__(self):
+        return f"{self.day}: {self.games} games"
+
+
+class DailySeatStats(models.Model):
+    """Dzienny rollup wygranych według miejsca przy stole"""
+    day = models.DateField()
+    seat = models.SmallIntegerField()
+    players = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'daily_seat_stats'
+        unique_together = ('day', 'seat')
+
+    def __str__(self):
+        return f"{self.day} seat {self.seat}: {self.wins}/{self.players}"
+
+
+class ArchivedMonth(models.Model):
+    """
+    Miesiąc przeniesiony z games/game_players do pliku (archive_games). Rollupy, UserStats i ratingi
+    nadal go liczą, ale przebudowy z historii (backfill_daily_stats, backfill_user_stats, recompute_ratings)
+    widzą tylko gry od retained_since() - stąd granica zapisana w bazie.
+    """
+    month = models.DateField(primary_key=True)  # pierwszy dzień miesiąca
+    path = models.CharField(max_length=500)
+    player_rows = models.IntegerField(default=0)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'archived_months'
+
+    def __str__(self):
+        return f"{self.month:%Y-%m}: {self.player_rows} rows -> {self.path}"
+
+    @classmethod
+    def retained_since(cls):
+        """Pierwszy dzień, od którego gry są jeszcze w bazie, albo None, gdy nic nie zarchiwizowano"""
+        newest = cls.objects.order_by('-month').values_list('month', flat=True).first()
+        return add_months(newest, 1) if newest is not None else None
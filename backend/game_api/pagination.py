@@ -0,0 +1,85 @@
+# backend/game_api/pagination.py
+# Stronicowanie kursorem (keyset) po (start_time, id) - każda strona to jeden skan indeksu, bez OFFSET
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def clamp_page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Rozmiar strony z parametru zapytania, przycięty do [1, MAX_PAGE_SIZE]"""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+class KeysetPagination(BasePagination):
+    """
+    Historia od najnowszych: ORDER BY start_time DESC, id DESC.
+    Kursor koduje (start_time, id) ostatniego wiersza strony, a kolejna strona to
+    WHERE (start_time, id) < kursor - koszt nie zależy od tego, jak daleko jest strona.
+    Queryset musi mieć pola `start_time` i `id` z indeksem złożonym pod filtr widoku.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = DEFAULT_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = clamp_page_size(request.query_params.get(self.page_size_query_param), self.page_size)
+
+        queryset = queryset.order_by('-start_time', '-id')
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            start_time, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(Q(start_time__lt=start_time) | Q(start_time=start_time, id__lt=pk))
+
+        # Jeden wiersz więcej mówi, czy istnieje następna strona (bez COUNT)
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(last.start_time, last.id))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    @staticmethod
+    def encode_cursor(start_time, pk):
+        return base64.urlsafe_b64encode(f"{start_time.isoformat()}|{pk}".encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            start_time, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            start_time = parse_datetime(start_time)
+            if start_time is None:
+                raise ValueError(cursor)
+            return start_time, int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound('Invalid cursor')
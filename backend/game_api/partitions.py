@@ -0,0 +1,107 @@
+# backend/game_api/partitions.py
+# Miesięczne partycje games / game_players po start_time (PostgreSQL, partycjonowanie deklaratywne).
+# Na innych bazach (SQLite w testach) wszystkie funkcje są no-op, a archiwizacja usuwa wiersze przez ORM.
+import datetime
+
+from django.db import connection, transaction
+
+PARTITION_KEY = 'start_time'
+
+# Tabele partycjonowane (migracja 0010), rodzic przed dzieckiem; klucze i indeksy tabel nadrzędnych są w migracji
+TABLES = ('games', 'game_players')
+
+
+def is_supported(conn=connection):
+    return conn.vendor == 'postgresql'
+
+
+def month_start(day):
+    return datetime.date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_{month:%Y_%m}"
+
+
+def _months_between(first, last):
+    month = month_start(first)
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def monthly_partitions(table, cursor):
+    """[(nazwa, pierwszy dzień miesiąca)] partycji miesięcznych tabeli, od najstarszej"""
+    cursor.execute(
+        """
+        SELECT child.relname FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(%s)
+        """,
+        [table],
+    )
+    partitions = []
+    prefix = f"{table}_"
+    for (name,) in cursor.fetchall():
+        suffix = name[len(prefix):]
+        try:
+            partitions.append((name, datetime.datetime.strptime(suffix, '%Y_%m').date()))
+        except ValueError:
+            continue  # partycja domyślna
+    return sorted(partitions, key=lambda item: item[1])
+
+
+def _create_month(table, month, cursor):
+    """
+    Partycja miesiąca. Wiersze tego miesiąca, które trafiły wcześniej do partycji domyślnej,
+    są do niej przenoszone (inaczej CREATE ... PARTITION OF się nie uda).
+    """
+    name = partition_name(table, month)
+    bounds = [month, add_months(month, 1)]
+    default = f"{table}_default"
+    cursor.execute(f'SELECT EXISTS (SELECT 1 FROM "{default}" WHERE "{PARTITION_KEY}" >= %s '
+                   f'AND "{PARTITION_KEY}" < %s)', bounds)
+    if not cursor.fetchone()[0]:
+        cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s)', bounds)
+        return
+    cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{default}"')
+    cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s)', bounds)
+    cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{default}" WHERE "{PARTITION_KEY}" >= %s '
+                   f'AND "{PARTITION_KEY}" < %s', bounds)
+    cursor.execute(f'DELETE FROM "{default}" WHERE "{PARTITION_KEY}" >= %s AND "{PARTITION_KEY}" < %s', bounds)
+    cursor.execute(f'ALTER TABLE "{table}" ATTACH PARTITION "{default}" DEFAULT')
+
+
+def ensure_partitions(months_ahead=3, today=None, conn=connection, since=None):
+    """
+    Partycje od bieżącego miesiąca (albo od miesiąca `since`) do `months_ahead` miesięcy naprzód;
+    zwraca nazwy utworzonych
+    """
+    if not is_supported(conn):
+        return []
+    current = month_start(today or datetime.date.today())
+    first = month_start(since) if since else current
+    created = []
+    with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+        for table in TABLES:
+            existing = {month for _, month in monthly_partitions(table, cursor)}
+            for month in _months_between(first, add_months(current, months_ahead)):
+                if month not in existing:
+                    _create_month(table, month, cursor)
+                    created.append(partition_name(table, month))
+    return created
+
+
+def drop_month(month, cursor):
+    """Odłącz i usuń partycje miesiąca z obu tabel (po wyeksportowaniu danych)"""
+    # Odroczone sprawdzenia FK z tej samej transakcji blokowałyby DROP TABLE
+    cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+    for table in reversed(TABLES):
+        name = partition_name(table, month)
+        cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+        cursor.execute(f'DROP TABLE "{name}"')
@@ -0,0 +1,237 @@
+# backend/game_api/persistence.py
+# Zapis zakończonych gier w tle - jeden worker na proces zamiast nowego wątku na każdą grę
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from game_api.game_saver import GameSaver
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'WORKERS': 2,            # stała liczba wątków = stała liczba połączeń z bazą
+    'MAX_QUEUE': 256,        # ile zakończonych gier może czekać na zapis
+    'BATCH_SIZE': 8,         # ile gier zapisujemy w jednej transakcji
+    'BATCH_WAIT': 0.05,      # ile sekund czekamy na kolejne gry do paczki
+    'MAX_ATTEMPTS': 3,
+    'RETRY_BACKOFF': 0.5,    # sekundy; kolejne próby: x1, x2, x4...
+}
+REMEMBERED_ROOMS = 10000    # ile zapisanych pokoi pamiętamy dla idempotencji
+LATENCY_WINDOW = 256
+
+_STOP = object()
+
+
+class SaveFailed(Exception):
+    """GameSaver zwrócił None - wycofujemy savepoint tej gry"""
+
+
+@dataclass
+class SaveRequest:
+    room_id: str
+    game_state: Any
+    start_time: Optional[datetime] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+
+class GamePersistenceWorker:
+    """
+    Kolejka zapisu zakończonych gier.
+
+    - ograniczona kolejka i stała pula wątków (liczba wątków i połączeń nie rośnie przy wielu końcach gier naraz),
+    - idempotencja po room_id (ten sam pokój zapisany najwyżej raz),
+    - kilka gier w jednej transakcji, każda w osobnym savepoincie,
+    - ponawianie nieudanych zapisów z rosnącym opóźnieniem.
+    """
+
+    def __init__(self, workers=None, max_queue=None, batch_size=None, batch_wait=None,
+                 max_attempts=None, retry_backoff=None):
+        config = {**DEFAULTS, **getattr(settings, 'GAME_PERSISTENCE', {})}
+        self.workers = config['WORKERS'] if workers is None else workers
+        self.batch_size = batch_size or config['BATCH_SIZE']
+        self.batch_wait = config['BATCH_WAIT'] if batch_wait is None else batch_wait
+        self.max_attempts = max_attempts or config['MAX_ATTEMPTS']
+        self.retry_backoff = config['RETRY_BACKOFF'] if retry_backoff is None else retry_backoff
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue or config['MAX_QUEUE'])
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._pending = set()                  # przyjęte, jeszcze nie zapisane
+        self._saved: OrderedDict = OrderedDict()  # room_id -> game.id
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counters = {
+            'submitted': 0, 'saved': 0, 'failed': 0, 'retried': 0,
+            'duplicates': 0, 'rejected': 0, 'batches': 0, 'in_flight': 0,
+        }
+
+    # --- API dla consumera ---
+
+    def submit(self, room_id: str, game_state, start_time: Optional[datetime] = None) -> bool:
+        """
+        Dodaj grę do kolejki zapisu. Zwraca True, jeśli gra jest (lub już była) zapisywana,
+        False, gdy kolejka jest pełna - wtedy można spróbować ponownie później.
+        """
+        with self._lock:
+            if room_id in self._pending or room_id in self._saved:
+                self._counters['duplicates'] += 1
+                return True
+            try:
+                self._queue.put_nowait(SaveRequest(room_id, game_state, start_time))
+            except queue.Full:
+                self._counters['rejected'] += 1
+                logger.error(f"❌ Persistence queue full, game {room_id} not queued")
+                return False
+            self._pending.add(room_id)
+            self._counters['submitted'] += 1
+        self._ensure_started()
+        return True
+
+    def is_saved(self, room_id: str) -> bool:
+        with self._lock:
+            return room_id in self._saved
+
+    def metrics(self) -> dict:
+        with self._lock:
+            last = self._latencies[-1] if self._latencies else None
+            latencies = sorted(self._latencies)
+            counters = dict(self._counters)
+        return {
+            **counters,
+            'queue_depth': self._queue.qsize(),
+            'queue_capacity': self._queue.maxsize,
+            'workers': len([t for t in self._threads if t.is_alive()]),
+            'save_latency_ms': {
+                'last': round(last * 1000, 2) if latencies else None,
+                'avg': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+                'p95': round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2) if latencies else None,
+            },
+        }
+
+    def stop(self, timeout: float = 5.0):
+        """Dokończ kolejkę i zatrzymaj wątki (np. przy wyłączaniu serwera)"""
+        threads = list(self._threads)
+        for _ in threads:
+            self._queue.put(_STOP)
+        for thread in threads:
+            thread.join(timeout)
+        self._threads = []
+
+    # --- wątki ---
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"game-persistence-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stop = False
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch: List[SaveRequest]):
+        """Zapisz paczkę, nieudane gry ponawiaj (same, bez udanych) z rosnącym opóźnieniem"""
+        while batch:
+            size = len(batch)
+            with self._lock:
+                self._counters['in_flight'] += size
+            # Jak w cyklu requestu: zamknij zerwane/przeterminowane połączenie wątku przed i po paczce
+            close_old_connections()
+            try:
+                batch = self._save_batch(batch)
+            finally:
+                close_old_connections()
+                with self._lock:
+                    self._counters['in_flight'] -= size
+
+            retry = []
+            for item in batch:
+                item.attempts += 1
+                if item.attempts < self.max_attempts:
+                    retry.append(item)
+                else:
+                    logger.error(f"❌ Giving up saving game {item.room_id} after {item.attempts} attempts")
+                    with self._lock:
+                        self._pending.discard(item.room_id)
+                        self._counters['failed'] += 1
+            if retry:
+                with self._lock:
+                    self._counters['retried'] += len(retry)
+                time.sleep(self.retry_backoff * 2 ** (retry[0].attempts - 1))
+            batch = retry
+
+    def _save_batch(self, batch: List[SaveRequest]) -> List[SaveRequest]:
+        """Jedna transakcja na paczkę, savepoint na grę. Zwraca gry do ponowienia."""
+        saved, failed = [], []
+        try:
+            with transaction.atomic():
+                for item in batch:
+                    try:
+                        with transaction.atomic():
+                            game = GameSaver.save_completed_game(item.game_state, start_time=item.start_time)
+                            if game is None:
+                                raise SaveFailed(item.room_id)
+                        saved.append((item, game))
+                    except Exception as e:
+                        logger.warning(f"⚠️ Saving game {item.room_id} failed (attempt {item.attempts + 1}): {e}")
+                        failed.append(item)
+        except Exception as e:
+            # Commit całej paczki się nie udał - ponawiamy wszystkie gry
+            logger.error(f"❌ Persistence batch of {len(batch)} games failed: {e}")
+            return list(batch)
+
+        now = time.monotonic()
+        with self._lock:
+            self._counters['batches'] += 1
+            for item, game in saved:
+                self._pending.discard(item.room_id)
+                self._saved[item.room_id] = game.id
+                self._counters['saved'] += 1
+                self._latencies.append(now - item.enqueued_at)
+            while len(self._saved) > REMEMBERED_ROOMS:
+                self._saved.popitem(last=False)
+        for item, game in saved:
+            logger.info(f"✅ Game {game.id} saved for room {item.room_id}")
+        return failed
+
+
+_worker: Optional[GamePersistenceWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_persistence_worker() -> GamePersistenceWorker:
+    """Worker wspólny dla całego procesu"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = GamePersistenceWorker()
+        return _worker
@@ -0,0 +1,79 @@
+# backend/game_api/ratings.py
+# Wieloosobowe Elo: każda gra to zestaw pojedynków każdy-z-każdym, wynik pary z punktów zwycięstwa
+from typing import List, Sequence
+
+import numpy as np
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+SCALE = 400.0
+
+
+def rating_deltas(ratings: np.ndarray, points: np.ndarray, mask: np.ndarray, k: float = K_FACTOR) -> np.ndarray:
+    """
+    Zmiany ratingu dla wielu gier naraz. Wejście ma kształt (gry, miejsca); `mask` oznacza zajęte miejsca
+    (gry mają różną liczbę graczy).
+
+    Para (i, j): oczekiwany wynik E = 1 / (1 + 10^((Rj - Ri) / 400)), faktyczny S = 1 / 0.5 / 0
+    (więcej / tyle samo / mniej punktów). Zmiana gracza = K * średnia (S - E) po jego przeciwnikach,
+    więc suma zmian w grze jest zerowa, a skala nie rośnie z liczbą graczy.
+    """
+    ratings = np.asarray(ratings, dtype=np.float64)
+    points = np.asarray(points, dtype=np.float64)
+    mask = np.asarray(mask, dtype=bool)
+
+    # [g, i, j] = R_j - R_i oraz p_i - p_j
+    expected = 1.0 / (1.0 + 10.0 ** ((ratings[:, None, :] - ratings[:, :, None]) / SCALE))
+    score = (np.sign(points[:, :, None] - points[:, None, :]) + 1.0) / 2.0
+
+    pairs = mask[:, :, None] & mask[:, None, :]
+    pairs &= ~np.eye(mask.shape[1], dtype=bool)
+    opponents = pairs.sum(axis=2)
+
+    delta = k * np.where(pairs, score - expected, 0.0).sum(axis=2) / np.maximum(opponents, 1)
+    return np.where(mask, delta, 0.0)
+
+
+def update_game(ratings: Sequence[float], points: Sequence[int], k: float = K_FACTOR) -> List[float]:
+    """Nowe ratingi graczy jednej gry (ta sama formuła co przeliczenie całej historii)"""
+    current = np.asarray([ratings], dtype=np.float64)
+    delta = rating_deltas(current, np.asarray([points]), np.ones_like(current, dtype=bool), k)
+    return (current + delta)[0].tolist()
+
+
+def game_levels(game_users: Sequence[Sequence[int]], user_count: int) -> np.ndarray:
+    """
+    Poziom każdej gry (w kolejności chronologicznej) = 1 + najwyższy poziom wcześniejszych gier jej graczy.
+    Gry z jednego poziomu nie mają wspólnych graczy, a gry każdego gracza mają rosnące poziomy -
+    przeliczenie poziomami daje dokładnie ten sam wynik co gra po grze.
+    """
+    last = [0] * user_count
+    levels = np.empty(len(game_users), dtype=np.int64)
+    for index, users in enumerate(game_users):
+        level = max(last[u] for u in users) + 1
+        for u in users:
+            last[u] = level
+        levels[index] = level
+    return levels
+
+
+def recompute(user_index: np.ndarray, points: np.ndarray, mask: np.ndarray, user_count: int,
+              k: float = K_FACTOR) -> np.ndarray:
+    """
+    Ratingi wszystkich graczy z całej historii. `user_index`, `points` i `mask` to macierze (gry, miejsca)
+    w kolejności chronologicznej; zwraca tablicę ratingów indeksowaną numerem gracza.
+    """
+    ratings = np.full(user_count, INITIAL_RATING)
+    if len(user_index) == 0:
+        return ratings
+
+    levels = game_levels([row[row_mask].tolist() for row, row_mask in zip(user_index, mask)], user_count)
+    order = np.argsort(levels, kind='stable')
+    boundaries = np.flatnonzero(np.diff(levels[order])) + 1
+
+    for games in np.split(order, boundaries):
+        users = user_index[games]
+        game_mask = mask[games]
+        delta = rating_deltas(ratings[users], points[games], game_mask, k)
+        ratings[users[game_mask]] += delta[game_mask]
+    return ratings
@@ -0,0 +1,136 @@
+# backend/game_api/replicas.py
+# Odczyty analityczne (statystyki, historia gier) z repliki bazy - primary zostaje dla zapisów gier z GameSaver.
+# Router kieruje odczyty na replikę tylko wewnątrz analytics_reads() (widoki statystyk/historii); reszta aplikacji
+# (uwierzytelnianie, zapis gier, WebSockety, komendy) czyta z primary jak dotąd.
+# Read-your-writes: uczestnicy zapisanej gry są przypięci do primary na PIN_SECONDS (dłużej niż opóźnienie
+# replikacji), a żądanie, które samo coś zapisało, czyta dalej z primary.
+# Przypięcia trzyma cache 'default' - między procesami działają tylko z REDIS_URL (zob. CACHES w settings).
+import contextlib
+import contextvars
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+DEFAULTS = {
+    'ALIAS': None,          # alias z DATABASES; None - wszystko z primary
+    'PIN_SECONDS': 5.0,
+}
+PIN_KEY = 'replica:pin:{}'
+
+# Stan aktywnego kontekstu odczytów jako słownik: zapis w wątku sync_to_async (kopia kontekstu)
+# musi przełączyć na primary także dalsze zapytania widoku
+_reads = contextvars.ContextVar('analytics_reads', default=None)
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'ANALYTICS_REPLICA', {})}
+
+
+def replica_alias():
+    """Alias repliki albo None, gdy wyłączona (lub nie ma jej w DATABASES)"""
+    alias = config()['ALIAS']
+    return alias if alias and alias in settings.DATABASES else None
+
+
+def pin_users(user_ids):
+    """Po zapisie: odczyty tych użytkowników idą z primary, dopóki replika nie dogoni"""
+    if replica_alias() is None:
+        return
+    cache.set_many({PIN_KEY.format(user_id): True for user_id in user_ids}, timeout=config()['PIN_SECONDS'])
+
+
+def _pinned(user):
+    return user is not None and user.is_authenticated and cache.get(PIN_KEY.format(user.pk)) is not None
+
+
+def read_alias(user=None):
+    """Baza dla odczytów analitycznych żądania `user`"""
+    alias = replica_alias()
+    if alias is None or _pinned(user):
+        return DEFAULT_DB_ALIAS
+    return alias
+
+
+def activate(alias):
+    """Odczyty w bieżącym kontekście z `alias`; zwraca token dla deactivate()"""
+    return _reads.set({'alias': alias})
+
+
+def deactivate(token):
+    _reads.reset(token)
+
+
+def current_alias():
+    state = _reads.get()
+    return state['alias'] if state is not None else DEFAULT_DB_ALIAS
+
+
+@contextlib.contextmanager
+def analytics_reads(user=None):
+    """Zapytania w bloku czytają z repliki (chyba że `user` jest przypięty do primary)"""
+    token = activate(read_alias(user))
+    try:
+        yield
+    finally:
+        deactivate(token)
+
+
+@contextlib.contextmanager
+def primary_reads():
+    """Zapytania w bloku czytają z primary - dla danych, które trafiają do współdzielonego cache"""
+    token = activate(DEFAULT_DB_ALIAS)
+    try:
+        yield
+    finally:
+        deactivate(token)
+
+
+class AnalyticsReplicaRouter:
+    """DATABASE_ROUTERS: replika tylko dla odczytów w analytics_reads(), zapisy i migracje zawsze na primary"""
+
+    def db_for_read(self, model, **hints):
+        state = _reads.get()
+        if state is None or state['alias'] == DEFAULT_DB_ALIAS:
+            return None
+        return state['alias']
+
+    def db_for_write(self, model, **hints):
+        state = _reads.get()
+        if state is not None:
+            # Po zapisie w tym samym żądaniu replika mogłaby go jeszcze nie mieć
+            state['alias'] = DEFAULT_DB_ALIAS
+        # Obiekt wczytany z repliki zapisujemy na primary, a nie tam, skąd przyszedł
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db is not None and instance._state.db == replica_alias():
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replika to kopia tej samej bazy - relacje między obiektami z obu są poprawne
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Schemat repliki przychodzi z replikacji primary
+        if db == replica_alias():
+            return False
+        return None
+
+
+class AnalyticsReadsMixin:
+    """ViewSet DRF: odczyty (GET/HEAD) po uwierzytelnieniu i sprawdzeniu uprawnień idą na replikę"""
+    _replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in ('GET', 'HEAD'):
+            self._replica_token = activate(read_alias(request.user))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._replica_token is not None:
+            deactivate(self._replica_token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,187 @@
+# backend/game_api/rollups.py
+# Dzienne rollupy zakończonych gier (DailyGameStats, DailySeatStats): dopisywane przy zapisie gry,
+# przebudowywane komendą backfill_daily_stats; endpointy statystyk czytają tylko te małe tabele.
+from collections import defaultdict
+
+from django.apps import apps as django_apps
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from game_api.models import DICE_TOTALS, RESOURCE_TYPES
+from game_engine.simple.models import WIN_VICTORY_POINTS
+
+DICE_FIELDS = [f'dice_{total}' for total in DICE_TOTALS]
+HOLDER_FIELDS = [f'{name}_holders' for name in RESOURCE_TYPES]
+COUNTER_FIELDS = ['games', 'players', 'total_turns', *DICE_FIELDS, *RESOURCE_TYPES, *HOLDER_FIELDS]
+
+
+def _models():
+    return django_apps.get_model('game_api', 'DailyGameStats'), django_apps.get_model('game_api', 'DailySeatStats')
+
+
+def _dice_counts(dice_distribution):
+    """{'dice_7': n, ...} z Game.dice_distribution (klucze to sumy oczek jako tekst)"""
+    dice_distribution = dice_distribution or {}
+    return {f'dice_{total}': int(dice_distribution.get(str(total), 0)) for total in DICE_TOTALS}
+
+
+def record_game(game, game_players, sign=1):
+    """
+    Dolicz zapisaną grę do rollupów jej dnia (`sign=-1` - odejmij) - stała liczba zapytań,
+    wywoływane w transakcji zapisu
+    """
+    DailyGameStats, DailySeatStats = _models()
+    day = timezone.localdate(game.start_time)
+
+    deltas = {'games': 1, 'players': len(game_players), 'total_turns': game.turns,
+              **_dice_counts(game.dice_distribution)}
+    for name in RESOURCE_TYPES:
+        deltas[name] = sum(getattr(gp, name) for gp in game_players)
+        deltas[f'{name}_holders'] = sum(1 for gp in game_players if getattr(gp, name) > 0)
+    deltas = {field: value * sign for field, value in deltas.items()}
+
+    DailyGameStats.objects.bulk_create([DailyGameStats(day=day)], ignore_conflicts=True)
+    DailyGameStats.objects.filter(day=day).update(
+        **{field: F(field) + value for field, value in deltas.items() if value})
+
+    seated = [gp for gp in game_players if gp.seat is not None]
+    if not seated:
+        return
+    winner_seats = [gp.seat for gp in seated if gp.victory_points >= WIN_VICTORY_POINTS]
+    DailySeatStats.objects.bulk_create([DailySeatStats(day=day, seat=gp.seat) for gp in seated],
+                                       ignore_conflicts=True)
+    DailySeatStats.objects.filter(day=day, seat__in=[gp.seat for gp in seated]).update(
+        players=F('players') + sign,
+        wins=F('wins') + Case(When(seat__in=winner_seats, then=Value(sign)), default=Value(0),
+                              output_field=IntegerField()),
+    )
+
+
+def recorded_games(game_ids):
+    """[(gra, jej GamePlayer)] dla `game_ids` - do odjęcia i ponownego doliczenia przy edycji (GameSaver.rerecorded)"""
+    Game, GamePlayer = django_apps.get_model('game_api', 'Game'), django_apps.get_model('game_api', 'GamePlayer')
+    players = defaultdict(list)
+    for gp in GamePlayer.objects.filter(game_id__in=game_ids):
+        players[gp.game_id].append(gp)
+    return [(game, players[game.id]) for game in Game.objects.filter(id__in=game_ids)]
+
+
+def rebuild(since=None, batch_size=1000):
+    """
+    Przelicz rollupy z games/game_players (od dnia `since` włącznie albo całość). Dni zarchiwizowanych
+    miesięcy (archive_games) nie ma już w tabelach - wtedy tylko od ArchivedMonth.retained_since().
+    """
+    DailyGameStats, DailySeatStats = _models()
+    Game, GamePlayer = django_apps.get_model('game_api', 'Game'), django_apps.get_model('game_api', 'GamePlayer')
+    retained = django_apps.get_model('game_api', 'ArchivedMonth').retained_since()
+    if retained is not None and (since is None or since < retained):
+        raise ValueError(f"Games before {retained} are archived - rebuild from {retained} or later")
+
+    games = Game.objects.all()
+    players = GamePlayer.objects.annotate(day=TruncDate('game__start_time'))
+    if since is not None:
+        DailyGameStats.objects.filter(day__gte=since).delete()
+        DailySeatStats.objects.filter(day__gte=since).delete()
+        games = games.filter(start_time__date__gte=since)
+        players = players.filter(day__gte=since)
+    else:
+        DailyGameStats.objects.all().delete()
+        DailySeatStats.objects.all().delete()
+
+    days = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+    # Rozkład kostek jest w JSON-ie - sumujemy w Pythonie, strumieniowo
+    for start_time, turns, dice_distribution in games.values_list(
+            'start_time', 'turns', 'dice_distribution').iterator(chunk_size=batch_size):
+        row = days[timezone.localdate(start_time)]
+        row['games'] += 1
+        row['total_turns'] += turns
+        for field, count in _dice_counts(dice_distribution).items():
+            row[field] += count
+
+    # Adnotacje nie mogą nazywać się jak pola GamePlayer - stąd prefiks sum_
+    resource_sums = {f'sum_{name}': Sum(name) for name in RESOURCE_TYPES}
+    holder_counts = {f'{name}_holders': Count('id', filter=Q(**{f'{name}__gt': 0})) for name in RESOURCE_TYPES}
+    for row in players.values('day').annotate(players=Count('id'), **resource_sums, **holder_counts):
+        day = row.pop('day')
+        days[day].update({key.removeprefix('sum_'): value for key, value in row.items()})
+
+    DailyGameStats.objects.bulk_create(
+        [DailyGameStats(day=day, **counters) for day, counters in days.items()], batch_size=batch_size)
+
+    seat_rows = (
+        players.filter(seat__isnull=False).values('day', 'seat')
+        .annotate(players=Count('id'), wins=Count('id', filter=Q(victory_points__gte=WIN_VICTORY_POINTS)))
+    )
+    DailySeatStats.objects.bulk_create([DailySeatStats(**row) for row in seat_rows], batch_size=batch_size)
+    return len(days)
+
+
+def parse_range(params):
+    """(since, until) z ?since=YYYY-MM-DD&until=YYYY-MM-DD (oba włącznie); ValueError dla złych dat"""
+    bounds = []
+    for name in ('since', 'until'):
+        value = params.get(name)
+        day = parse_date(value) if value else None
+        if value and day is None:
+            raise ValueError(f"Invalid {name} date: {value}")
+        bounds.append(day)
+    return tuple(bounds)
+
+
+def _filter_days(queryset, since, until):
+    if since is not None:
+        queryset = queryset.filter(day__gte=since)
+    if until is not None:
+        queryset = queryset.filter(day__lte=until)
+    return queryset
+
+
+def resource_totals(since=None, until=None):
+    """Wiersze jak w resource_analysis: suma, średnia i liczba graczy, którzy mieli dany surowiec"""
+    DailyGameStats, _ = _models()
+    sums = _filter_days(DailyGameStats.objects.all(), since, until).aggregate(
+        **{f'sum_{field}': Sum(field) for field in [*RESOURCE_TYPES, *HOLDER_FIELDS]})
+    totals = {key.removeprefix('sum_'): value for key, value in sums.items()}
+    rows = [
+        {
+            'resource_type': name,
+            'total_amount': totals[name],
+            'avg_amount': totals[name] / totals[f'{name}_holders'],
+            'count': totals[f'{name}_holders'],
+        }
+        for name in RESOURCE_TYPES if totals[f'{name}_holders']
+    ]
+    rows.sort(key=lambda row: row['total_amount'], reverse=True)
+    return rows
+
+
+def daily_summary(since=None, until=None):
+    """Dni z liczbą gier i średnią tur oraz podsumowanie zakresu: rozkład kostek, skuteczność miejsc"""
+    DailyGameStats, DailySeatStats = _models()
+    days = list(_filter_days(DailyGameStats.objects.all(), since, until).order_by('day'))
+
+    games = sum(day.games for day in days)
+    dice = {str(total): sum(getattr(day, f'dice_{total}') for day in days) for total in DICE_TOTALS}
+    seats = (
+        _filter_days(DailySeatStats.objects.all(), since, until)
+        .values('seat').annotate(seat_players=Sum('players'), seat_wins=Sum('wins')).order_by('seat')
+    )
+    return {
+        'days': [
+            {'day': day.day, 'games': day.games, 'players': day.players,
+             'average_turns': round(day.total_turns / day.games, 1) if day.games else 0}
+            for day in days
+        ],
+        'summary': {
+            'games': games,
+            'average_turns': round(sum(day.total_turns for day in days) / games, 1) if games else 0,
+            'dice_distribution': dice,
+            'win_rate_by_seat': [
+                {'seat': row['seat'], 'players': row['seat_players'], 'wins': row['seat_wins'],
+                 'win_rate': round(row['seat_wins'] * 100 / row['seat_players'], 1)}
+                for row in seats
+            ],
+        },
+    }
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from game_api.models import GamePlayer, Game, PlayerResource
+from game_api.models import GamePlayer, Game
 
 # ✅ Używaj właściwego modelu User
 User = get_user_model()
@@ -14,13 +14,17 @@ class GameSerializer(serializers.ModelSerializer):
     class Meta:
         model = Game
         fields = '__all__'
+        # Klucz partycji games i kopia w game_players - zmiana przez API rozjechałaby historię graczy
+        read_only_fields = ['start_time']
 
 class GamePlayerSerializer(serializers.ModelSerializer):
     class Meta:
         model = GamePlayer
         fields = '__all__'
+        read_only_fields = ['start_time']
 
-class PlayerResourceSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = PlayerResource
-        fields = '__all__'
\ No newline at end of file
+    def validate(self, attrs):
+        # start_time zawsze z gry (denormalizacja dla historii gracza)
+        if 'game' in attrs:
+            attrs['start_time'] = attrs['game'].start_time
+        return attrs
@@ -1,15 +1,30 @@
 # backend/game_api/simple_consumer.py - NAPRAWIONA WERSJA + rozkład kostki
 import json
 import uuid
+from collections import OrderedDict
+from urllib.parse import parse_qs
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from game_engine.simple.models import SimpleGameState, GamePhase
-from game_api.game_saver import GameSaver
-from datetime import datetime
+from game_engine.simple.geometry import get_layout
+from game_engine.simple.setup_hints import DEFAULT_HINT_LIMIT
+from game_api.persistence import get_persistence_worker
+from django.utils import timezone
 
 # Store active game rooms - w prawdziwej aplikacji użyj Redis
 game_rooms = {}
 
+# Plansze wylosowane przy tworzeniu pokoju (create_room), czekające na pierwsze połączenie
+pending_boards = OrderedDict()
+MAX_PENDING_BOARDS = 1000
+
+
+def reserve_room_board(room_id, layout_name, tile_data):
+    """Zapamiętaj planszę dla pokoju - najstarsze nieużyte rezerwacje wypadają"""
+    pending_boards[room_id] = (layout_name, tile_data)
+    while len(pending_boards) > MAX_PENDING_BOARDS:
+        pending_boards.popitem(last=False)
+
 class SimpleGameConsumer(AsyncWebsocketConsumer):
     
     async def connect(self):
@@ -28,7 +43,16 @@ class SimpleGameConsumer(AsyncWebsocketConsumer):
         
         # Initialize or get room
         if self.room_id not in game_rooms:
-            game_state = SimpleGameState()
+            # Plansza wylosowana w create_room ma pierwszeństwo, inaczej układ wybiera pierwszy gracz
+            # (?layout=extended dla 5-6 graczy)
+            query_params = parse_qs(self.scope.get('query_string', b'').decode())
+            layout_name, tile_data = pending_boards.pop(
+                self.room_id, (query_params.get('layout', ['standard'])[0], None))
+            try:
+                layout = get_layout(layout_name)
+            except ValueError:
+                layout = get_layout('standard')
+            game_state = SimpleGameState(layout=layout, tile_data=tile_data)
             
             # ✅ INICJALIZUJ ROZKŁAD KOSTKI
             if not hasattr(game_state, 'dice_distribution'):
@@ -37,7 +61,7 @@ class SimpleGameConsumer(AsyncWebsocketConsumer):
             
             game_rooms[self.room_id] = {
                 'connected_players': [],
-                'max_players': 4,
+                'max_players': layout.max_players,
                 'game_state': game_state,
                 'is_started': False
             }
@@ -100,9 +124,7 @@ class SimpleGameConsumer(AsyncWebsocketConsumer):
                 removed_player = room['game_state'].players[self.player_id]
                 print(f"👋 Player {getattr(removed_player, 'display_name', self.player_id[:8])} disconnected")
                 
-                del room['game_state'].players[self.player_id]
-                if self.player_id in room['game_state'].player_order:
-                    room['game_state'].player_order.remove(self.player_id)
+                room['game_state'].remove_player(self.player_id)
             
             # Notify about player leaving
             await self.channel_layer.group_send(
@@ -136,8 +158,8 @@ class SimpleGameConsumer(AsyncWebsocketConsumer):
             room = game_rooms[self.room_id]
             game_state = room['game_state']
 
-            if not hasattr(room, 'start_time'):
-                room['start_time'] = datetime.now()
+            if 'start_time' not in room:
+                room['start_time'] = timezone.now()
             
             if message_type == 'get_game_state':
                 print(f"🎮 Sending game state to player {self.player_id[:8]}")
@@ -149,6 +171,26 @@ class SimpleGameConsumer(AsyncWebsocketConsumer):
                     'game_state': game_state_data
                 }))
             
+            elif message_type == 'get_setup_hints':
+                # Podpowiedzi miejsc na osadę - tylko w fazie setup
+                if game_state.phase != GamePhase.SETUP:
+                    await self.send(text_data=json.dumps({
+                        'type': 'error',
+                        'message': 'Setup hints are only available during setup'
+                    }))
+                    return
+
+                try:
+                    limit = int(data.get('limit', DEFAULT_HINT_LIMIT))
+                except (TypeError, ValueError):
+                    limit = DEFAULT_HINT_LIMIT
+
+                await self.send(text_data=json.dumps({
+                    'type': 'setup_hints',
+                    'player_id': self.player_id,
+                    'hints': game_state.get_setup_hints(self.player_id, limit)
+                }))
+
             elif message_type == 'get_client_id':
                 await self.send(text_data=json.dumps({
                     'type': 'client_id',
@@ -419,7 +461,7 @@ class SimpleGameConsumer(AsyncWebsocketConsumer):
                     
                     elif game_state.phase == GamePhase.PLAYING:
                         if not game_state.can_roll_dice(self.player_id):
-                            if game_state.has_rolled_dice.get(self.player_id, False):
+                            if game_state.has_player_rolled_dice(self.player_id):
                                 error_msg = "You have already rolled dice this turn"
                             else:
                                 error_msg = "You cannot roll dice right now"
@@ -536,58 +578,26 @@ class SimpleGameConsumer(AsyncWebsocketConsumer):
                 'game_state': event['game_state']
             }))
             
-            # ✅ ZAPISZ GRĘ TYLKO RAZ - sprawdź czy jesteś pierwszym graczem w pokoju
+            # ✅ ZAPISZ GRĘ TYLKO RAZ - kolejka zapisu jest idempotentna po room_id,
+            # więc zgłasza ten consumer, który pierwszy dostanie powiadomienie
             if self.room_id in game_rooms:
                 room = game_rooms[self.room_id]
                 
-                # Sprawdź czy gra już została zapisana
-                if hasattr(room, 'game_saved') and room['game_saved']:
-                    print(f"⚠️ Game {self.room_id} already saved, skipping...")
+                # Sprawdź czy gra już została zgłoszona do zapisu
+                if room.get('game_saved'):
+                    print(f"⚠️ Game {self.room_id} already queued for saving, skipping...")
                     return
                 
-                # Oznacz że gra zostanie zapisana
-                room['game_saved'] = True
-                
-                # Sprawdź czy jesteś pierwszym graczem w player_order (tylko on zapisuje)
                 game_state = room['game_state']
-                if (hasattr(game_state, 'player_order') and 
-                    len(game_state.player_order) > 0 and 
-                    game_state.player_order[0] == self.player_id):
-                    
-                    print(f"💾 First player {self.player_id[:8]} saving game to database...")
-                    print(f"🎲 Game dice distribution: {getattr(game_state, 'dice_distribution', {})}")
-                    
-                    # Zapisz grę do bazy danych w tle
-                    from django.db import transaction
-                    
-                    def save_game_to_db():
-                        try:
-                            with transaction.atomic():
-                                # Ustaw czas rozpoczęcia gry
-                                start_time = getattr(room, 'start_time', None) or datetime.now()
-                                
-                                saved_game = GameSaver.save_completed_game(
-                                    game_state=game_state,
-                                    start_time=start_time
-                                )
-                                
-                                if saved_game:
-                                    print(f"✅ Game {saved_game.id} saved to database successfully by player {self.player_id[:8]}")
-                                    print(f"📊 Game players saved: {saved_game.gameplayer_set.count()}")
-                                else:
-                                    print(f"❌ Failed to save game to database")
-                                    
-                        except Exception as e:
-                            print(f"❌ Database save error: {e}")
-                            import traceback
-                            traceback.print_exc()
-                    
-                    # Wykonaj zapis w osobnym wątku
-                    import threading
-                    save_thread = threading.Thread(target=save_game_to_db)
-                    save_thread.start()
-                else:
-                    print(f"⏭️ Player {self.player_id[:8]} is not first player, skipping save")
+                print(f"💾 Player {self.player_id[:8]} queueing game {self.room_id} for saving...")
+                print(f"🎲 Game dice distribution: {getattr(game_state, 'dice_distribution', {})}")
+                
+                # Przy pełnej kolejce flaga zostaje False - spróbuje następny consumer z pokoju
+                room['game_saved'] = get_persistence_worker().submit(
+                    self.room_id,
+                    game_state,
+                    start_time=room.get('start_time') or timezone.now()
+                )
                     
         except Exception as e:
             print(f"❌ Error in game_end_notification: {e}")
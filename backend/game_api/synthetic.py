@@ -0,0 +1,152 @@
+# backend/game_api/synthetic.py
+# Syntetyczna historia gier do testów obciążeniowych (komenda seed_games).
+# Zamiast rozgrywać partie silnikiem losujemy je z prostego modelu statystycznego, wektorowo w numpy:
+# liczba tur, rzuty 2k6, popularność graczy (rozkład potęgowy), zwycięzca, budowle, surowce na koniec.
+import datetime
+import io
+import json
+
+import numpy as np
+from django.db import connection
+
+from game_api.models import DICE_TOTALS, RESOURCE_TYPES, Game, GamePlayer
+from game_engine.simple.models import WIN_VICTORY_POINTS
+
+# Prawdopodobieństwa sum dwóch kości: 2 -> 1/36, ..., 7 -> 6/36, ..., 12 -> 1/36
+DICE_PROBABILITIES = np.array([6 - abs(total - 7) for total in DICE_TOTALS]) / 36
+
+GAME_COLUMNS = ['id', 'start_time', 'end_time', 'turns', 'dice_distribution']
+PLAYER_COLUMNS = ['game_id', 'user_id', 'start_time', 'seat', 'victory_points', 'roads_built',
+                  'settlements_built', 'cities_built', 'longest_road', 'largest_army', *RESOURCE_TYPES]
+
+
+def popularity(user_count):
+    """Wagi wyboru graczy - kilku gra tysiące partii, większość kilka (jak w prawdziwym ruchu)"""
+    weights = 1.0 / np.arange(1, user_count + 1)
+    return weights / weights.sum()
+
+
+def _distinct_players(rng, user_count, weights, counts):
+    """Macierz (gry x max graczy) indeksów użytkowników, bez powtórzeń w obrębie gry"""
+    width = int(counts.max())
+    picks = rng.choice(user_count, size=(len(counts), width), p=weights)
+    unused = np.arange(width) >= counts[:, None]
+    while True:
+        # Nieużywane kolumny dostają unikalne wartości ujemne, żeby nie liczyły się jako powtórzenia
+        marked = np.where(unused, -1 - np.arange(width), picks)
+        ordered = np.sort(marked, axis=1)
+        repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+        if not repeated.any():
+            return picks
+        picks[repeated] = rng.choice(user_count, size=(int(repeated.sum()), width), p=weights)
+
+
+def game_batch(rng, size, user_ids, weights, since, until, min_players=2, max_players=4):
+    """
+    Paczka `size` gier: (gry, gracze) jako słowniki kolumn -> tablice numpy.
+    Gracze mają kolumnę 'game' - indeks gry w paczce (id nadaje dopiero zapis).
+    """
+    counts = rng.integers(min_players, max_players + 1, size)
+    turns = rng.integers(20, 91, size)
+    start = since.timestamp() + rng.random(size) * (until.timestamp() - since.timestamp())
+    # 40-90 s na turę
+    end = start + turns * rng.uniform(40, 90, size)
+    games = {
+        'start_time': start,
+        'end_time': end,
+        'turns': turns,
+        'dice': rng.multinomial(turns, DICE_PROBABILITIES),
+    }
+
+    picks = _distinct_players(rng, len(user_ids), weights, counts)
+    seated = np.arange(picks.shape[1]) < counts[:, None]
+    game_index = np.repeat(np.arange(size), counts)
+    seats = (np.cumsum(seated, axis=1) - 1)[seated]
+    total = len(game_index)
+
+    winners = rng.integers(0, counts)
+    won = seats == winners[game_index]
+    longest_road = rng.integers(0, counts)
+    largest_army = rng.integers(0, counts)
+    cities = rng.binomial(2, np.where(won, 0.6, 0.25))
+    players = {
+        'game': game_index,
+        'user_id': np.asarray(user_ids)[picks[seated]],
+        'seat': seats,
+        'victory_points': np.where(won, WIN_VICTORY_POINTS, rng.integers(0, WIN_VICTORY_POINTS, total)),
+        'roads_built': rng.integers(2, 16, total),
+        'settlements_built': 2 + rng.integers(0, 3, total),
+        'cities_built': cities,
+        # Nie w każdej grze ktoś zdobywa najdłuższą drogę / największą armię
+        'longest_road': (seats == longest_road[game_index]) & (rng.random(size) < 0.6)[game_index],
+        'largest_army': (seats == largest_army[game_index]) & (rng.random(size) < 0.3)[game_index],
+    }
+    for name in RESOURCE_TYPES:
+        players[name] = rng.poisson(turns[game_index] / 15)
+    return games, players
+
+
+def _moments(timestamps):
+    return [datetime.datetime.fromtimestamp(value, tz=datetime.timezone.utc) for value in timestamps]
+
+
+def _dice_json(dice):
+    return [{str(total): int(count) for total, count in zip(DICE_TOTALS, row) if count} for row in dice]
+
+
+def _player_rows(players, game_ids, start_times):
+    """Krotki w kolejności PLAYER_COLUMNS"""
+    columns = [
+        np.asarray(game_ids)[players['game']].tolist(),
+        players['user_id'].tolist(),
+        [start_times[index] for index in players['game']],
+        *[players[name].tolist() for name in PLAYER_COLUMNS[3:]],
+    ]
+    return zip(*columns)
+
+
+def insert_orm(games, players, batch_size):
+    """bulk_create - działa na każdej bazie (id gier wracają z INSERT ... RETURNING)"""
+    start_times = _moments(games['start_time'])
+    created = Game.objects.bulk_create(
+        [Game(start_time=start, end_time=end, turns=turns, dice_distribution=dice)
+         for start, end, turns, dice in zip(start_times, _moments(games['end_time']),
+                                            games['turns'].tolist(), _dice_json(games['dice']))],
+        batch_size=batch_size,
+    )
+    GamePlayer.objects.bulk_create(
+        [GamePlayer(**dict(zip(PLAYER_COLUMNS, row)))
+         for row in _player_rows(players, [game.id for game in created], start_times)],
+        batch_size=batch_size,
+    )
+    return len(created), len(players['game'])
+
+
+def _copy(cursor, table, columns, rows):
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join('\\N' if value is None else str(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+    names = ', '.join(f'"{name}"' for name in columns)
+    cursor.cursor.copy_expert(f'COPY "{table}" ({names}) FROM STDIN', buffer)
+
+
+def insert_copy(games, players):
+    """COPY FROM STDIN (tylko PostgreSQL) - id gier rezerwowane z sekwencji, potem jeden COPY na tabelę"""
+    size = len(games['turns'])
+    start_times = _moments(games['start_time'])
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT nextval(pg_get_serial_sequence('games', 'id')) FROM generate_series(1, %s)", [size])
+        game_ids = [row[0] for row in cursor.fetchall()]
+        _copy(cursor, 'games', GAME_COLUMNS, zip(
+            game_ids,
+            [moment.isoformat() for moment in start_times],
+            [moment.isoformat() for moment in _moments(games['end_time'])],
+            games['turns'].tolist(),
+            # COPY w formacie tekstowym: backslash musiałby być podwojony, ale JSON kości go nie zawiera
+            [json.dumps(dice) for dice in _dice_json(games['dice'])],
+        ))
+        _copy(cursor, 'game_players', PLAYER_COLUMNS,
+              _player_rows(players, game_ids, [moment.isoformat() for moment in start_times]))
+    return size, len(players['game'])
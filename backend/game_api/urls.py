@@ -8,7 +8,7 @@ router = DefaultRouter()
 router.register(r'users', UserViewSet)
 router.register(r'games', GameViewSet)
 router.register(r'game-players', GamePlayerViewSet)
-router.register(r'player-resources', PlayerResourceViewSet)
+router.register(r'player-resources', PlayerResourceViewSet, basename='player-resources')
 router.register(r'stats', StatsViewSet, basename='stats')
 
 
@@ -1,27 +1,54 @@
 # backend/game_api/views.py - POPRAWIONA WERSJA
+import logging
 import uuid
-from venv import logger
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.db.models import Avg, Count, Sum, Q
+from django.db import transaction
+from django.db.models import Avg, Count, Exists, OuterRef, Sum, Q
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from .models import Game, GamePlayer, PlayerResource
-from .serializers import UserSerializer, GameSerializer, GamePlayerSerializer, PlayerResourceSerializer
+from .models import RESOURCE_TYPES, Game, GamePlayer, UserStats
+from .serializers import UserSerializer, GameSerializer, GamePlayerSerializer
+from .pagination import KeysetPagination, clamp_page_size
+from game_api import game_cache, replicas, rollups
 from game_api.game_saver import GameSaver
+from game_engine.simple.models import WIN_VICTORY_POINTS
 import random
 
 # ✅ Używaj właściwego modelu User
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 @csrf_exempt
 def create_room(request):
     if request.method in ['GET', 'POST']:
         room_id = str(uuid.uuid4())[:8]
+
+        # ?board=random - losujemy planszę tutaj, żeby nie spowalniać połączenia WebSocket
+        params = request.GET if request.method == 'GET' else request.POST
+        if params.get('board') == 'random':
+            from game_engine.simple.board_generator import generate_board
+            from game_engine.simple.geometry import LAYOUT_NAMES, get_layout
+            from game_api.simple_consumer import reserve_room_board
+
+            # Endpoint bez logowania - koszt losowania rośnie z planszą, więc tylko układy z listy
+            layout_name = params.get('layout', 'standard')
+            if layout_name not in LAYOUT_NAMES:
+                return JsonResponse({'error': f'layout must be one of {LAYOUT_NAMES}'}, status=400)
+            try:
+                layout = get_layout(layout_name)
+                board = generate_board(layout)
+            except ValueError as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            reserve_room_board(room_id, layout.name, board)
+            return JsonResponse({'room_id': room_id, 'board': 'random', 'layout': layout.name})
+
         return JsonResponse({'room_id': room_id})
     return JsonResponse({'error': 'Method not allowed'}, status=405)
 
@@ -31,13 +58,14 @@ class UserViewSet(viewsets.ModelViewSet):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
+    # Użytkownika czyta get_object() z primary (świeżo założonego konta może nie być na replice),
+    # a jego historię i statystyki - replika analityczna (game_api/replicas.py)
     @action(detail=True, methods=['get'])
     def games(self, request, pk=None):
         """Pobierz wszystkie gry danego użytkownika - POPRAWIONA WERSJA"""
+        user = self.get_object()  # 404 dla nieistniejącego użytkownika, poza obsługą błędów niżej
         try:
-            user = self.get_object()
-            
-            # ✅ SPRAWDŹ AUTORYZACJĘ - ale pozwól админом i sobie
+            # ✅ SPRAWDŹ AUTORYZACJĘ - ale pozwól adminom i sobie
             if request.user.id != user.id and not request.user.is_staff:
                 # Sprawdź czy to nie ten sam użytkownik z różnymi ID (gość vs zalogowany)
                 if (request.user.display_name and user.display_name and 
@@ -46,25 +74,29 @@ class UserViewSet(viewsets.ModelViewSet):
                 else:
                     return Response({'error': 'Unauthorized'}, status=403)
             
-            # ✅ SZUKAJ GIER PO RÓŻNYCH KRYTERIACH
-            # 1. Bezpośrednio po user_id
-            game_players = GamePlayer.objects.filter(user=user).select_related('game')
-            
-            # 2. Jeśli nie ma gier, spróbuj znaleźć po display_name (gość -> zalogowany)
-            if not game_players.exists() and user.display_name:
-                # Znajdź innych użytkowników z tym samym display_name
-                other_users = User.objects.filter(
-                    display_name=user.display_name
-                ).exclude(id=user.id)
+            with replicas.analytics_reads(request.user):
+                # ✅ SZUKAJ GIER PO RÓŻNYCH KRYTERIACH
+                # 1. Bezpośrednio po user_id
+                owner_id = user.id
                 
-                if other_users.exists():
-                    logger.info(f"🔍 Looking for games in other accounts with same display_name")
-                    for other_user in other_users:
-                        other_games = GamePlayer.objects.filter(user=other_user).select_related('game')
-                        if other_games.exists():
-                            logger.info(f"✅ Found {other_games.count()} games in account {other_user.username}")
-                            game_players = other_games
-                            break
+                # 2. Jeśli nie ma gier, weź pierwsze inne konto z tym samym display_name, które ma gry (gość -> zalogowany)
+                if not GamePlayer.objects.filter(user_id=owner_id).exists() and user.display_name:
+                    other_user_id = (
+                        User.objects.filter(display_name=user.display_name)
+                        .exclude(id=user.id)
+                        .filter(Exists(GamePlayer.objects.filter(user_id=OuterRef('pk'))))
+                        .order_by('id')
+                        .values_list('id', flat=True)
+                        .first()
+                    )
+                    if other_user_id is not None:
+                        logger.info(f"✅ Found games in account {other_user_id}")
+                        owner_id = other_user_id
+                
+                # Strona historii od najnowszych - indeks (user, start_time, id)
+                paginator = KeysetPagination()
+                game_players = paginator.paginate_queryset(
+                    GamePlayer.objects.filter(user_id=owner_id).select_related('game'), request, view=self)
             
             # ✅ PRZYGOTUJ DANE GRY
             games_data = []
@@ -80,15 +112,14 @@ class UserViewSet(viewsets.ModelViewSet):
                     'cities_built': gp.cities_built,
                     'longest_road': gp.longest_road,
                     'largest_army': gp.largest_army,
-                    'won': gp.victory_points >= 10  # Określ zwycięstwo
+                    'won': gp.victory_points >= WIN_VICTORY_POINTS  # Określ zwycięstwo
                 })
             
-            # Sortuj gry od najnowszych
-            games_data.sort(key=lambda x: x['start_time'], reverse=True)
-            
             logger.info(f"📊 Found {len(games_data)} games for user {user.username} (ID: {user.id})")
-            return Response(games_data)
+            return paginator.get_paginated_response(games_data)
             
+        except NotFound:
+            raise
         except Exception as e:
             logger.error(f"❌ Error getting games for user: {e}")
             return Response({'error': 'Failed to fetch games'}, status=500)
@@ -96,9 +127,8 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def statistics(self, request, pk=None):
         """Pobierz statystyki danego użytkownika - POPRAWIONA WERSJA"""
+        user = self.get_object()  # 404 dla nieistniejącego użytkownika, poza obsługą błędów niżej
         try:
-            user = self.get_object()
-            
             # ✅ SPRAWDŹ AUTORYZACJĘ
             if request.user.id != user.id and not request.user.is_staff:
                 # Sprawdź czy to nie ten sam użytkownik z różnymi ID
@@ -108,21 +138,20 @@ class UserViewSet(viewsets.ModelViewSet):
                 else:
                     return Response({'error': 'Unauthorized'}, status=403)
             
-            # ✅ UŻYJ GAMESAVER DO POBRANIA STATYSTYK
-            stats = GameSaver.get_game_statistics_for_user(user.id)
-            
-            # Jeśli nie ma statystyk dla tego ID, spróbuj innych użytkowników z tym samym display_name
-            if (not stats or stats['total_games'] == 0) and user.display_name:
-                other_users = User.objects.filter(
-                    display_name=user.display_name
-                ).exclude(id=user.id)
+            with replicas.analytics_reads(request.user):
+                # ✅ UŻYJ GAMESAVER DO POBRANIA STATYSTYK
+                stats = GameSaver.get_game_statistics_for_user(user.id)
                 
-                for other_user in other_users:
-                    other_stats = GameSaver.get_game_statistics_for_user(other_user.id)
-                    if other_stats and other_stats['total_games'] > 0:
-                        logger.info(f"✅ Found stats in account {other_user.username}")
-                        stats = other_stats
-                        break
+                # Jeśli nie ma statystyk dla tego ID, weź pierwsze inne konto z tym samym display_name, które ma gry
+                if (not stats or stats['total_games'] == 0) and user.display_name:
+                    other_stats = UserStats.objects.filter(
+                        user__display_name=user.display_name,
+                        total_games__gt=0
+                    ).exclude(user_id=user.id).order_by('user_id').first()
+                    
+                    if other_stats:
+                        logger.info(f"✅ Found stats in account {other_stats.user_id}")
+                        stats = other_stats.as_dict()
             
             if stats is None:
                 return Response({'error': 'Failed to calculate statistics'}, status=500)
@@ -135,33 +164,49 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Failed to fetch statistics'}, status=500)
 
 
-class GameViewSet(viewsets.ModelViewSet):
+class GameViewSet(replicas.AnalyticsReadsMixin, viewsets.ModelViewSet):
     queryset = Game.objects.all()
     serializer_class = GameSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         queryset = Game.objects.all()
         user_id = self.request.query_params.get('user_id', None)
 
         if user_id is not None:
-            # Filtruj gry w których uczestniczył dany użytkownik
-            queryset = queryset.filter(gameplayer__user_id=user_id).distinct()
+            # Filtruj gry w których uczestniczył dany użytkownik (EXISTS zamiast JOIN + DISTINCT)
+            queryset = queryset.filter(Exists(GamePlayer.objects.filter(game_id=OuterRef('pk'), user_id=user_id)))
+
+        return queryset.order_by('-start_time', '-id')
+
+    # Zapisana gra się nie zmienia - szczegóły i gracze idą z cache z ETagiem (game_api/game_cache.py)
+    def retrieve(self, request, *args, **kwargs):
+        return game_cache.game_response(
+            request, 'detail', kwargs['pk'], lambda: self.get_serializer(self.get_object()).data)
 
-        return queryset.order_by('-start_time')
+    # UserStats, liczniki User i dzienne rollupy liczą zapisane gry - zmiana gry przelicza jej udział
+    def perform_update(self, serializer):
+        with GameSaver.rerecorded(serializer.instance.pk):
+            super().perform_update(serializer)
+        game_cache.invalidate(serializer.instance.pk)
+
+    def perform_destroy(self, instance):
+        game_cache.invalidate(instance.pk)
+        with GameSaver.rerecorded(instance.pk):
+            super().perform_destroy(instance)
 
     @action(detail=True, methods=['get'])
     def players(self, request, pk=None):
-        """Pobierz wszystkich graczy z danej gry wraz z ich statystykami"""
+        """Pobierz wszystkich graczy z danej gry wraz z ich statystykami (stała liczba zapytań, potem z cache)"""
+        return game_cache.game_response(request, 'players', pk, self._players_data)
+
+    def _players_data(self):
         game = self.get_object()
         game_players = GamePlayer.objects.filter(game=game).select_related('user')
 
         players_data = []
         for gp in game_players:
-            # Pobierz zasoby gracza
-            resources = PlayerResource.objects.filter(game_player=gp)
-            resources_dict = {res.resource_type: res.amount for res in resources}
-
             players_data.append({
                 'user_id': gp.user.id,
                 'username': gp.user.username,
@@ -171,14 +216,14 @@ class GameViewSet(viewsets.ModelViewSet):
                 'cities_built': gp.cities_built,
                 'longest_road': gp.longest_road,
                 'largest_army': gp.largest_army,
-                'resources': resources_dict,
-                'won': gp.victory_points >= 10
+                'resources': gp.resources,
+                'won': gp.victory_points >= WIN_VICTORY_POINTS
             })
 
         # Posortuj według punktów zwycięstwa (malejąco)
         players_data.sort(key=lambda x: x['victory_points'], reverse=True)
 
-        return Response({
+        return {
             'game_info': {
                 'id': game.id,
                 'start_time': game.start_time,
@@ -187,13 +232,44 @@ class GameViewSet(viewsets.ModelViewSet):
                 'dice_distribution': game.dice_distribution
             },
             'players': players_data
-        })
+        }
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Strumieniowy eksport historii: ?output=ndjson|csv&gzip=1&since=&until=&user_id=
+        Zwykły użytkownik eksportuje tylko swoje gry, admin - dowolne.
+        """
+        from game_api import export
+
+        params = request.query_params
+        output = params.get('output', 'ndjson')
+        compress = params.get('gzip') in ('1', 'true')
+        user_id = params.get('user_id')
+        if not request.user.is_staff:
+            user_id = request.user.id
+        if output not in export.FORMATS:
+            return Response({'error': f'output must be one of {export.FORMATS}'}, status=400)
+        try:
+            since = export.parse_bound(params.get('since'))
+            until = export.parse_bound(params.get('until'), end=True)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        # Strumień czytany jest już po wyjściu z widoku - bazę (replikę) wskazujemy jawnie
+        chunks = export.stream(output, compress, since=since, until=until, user_id=user_id,
+                               using=replicas.current_alias())
+        if isinstance(request._request, ASGIRequest):
+            chunks = export.aiterate(chunks)
+        response = StreamingHttpResponse(chunks, content_type=export.content_type(output, compress))
+        response['Content-Disposition'] = f'attachment; filename="{export.filename(output, compress)}"'
+        return response
 
     @action(detail=False, methods=['get'])
     def recent(self, request):
-        """Pobierz ostatnie gry"""
-        limit = int(request.query_params.get('limit', 10))
-        games = Game.objects.all().order_by('-start_time')[:limit]
+        """Pobierz ostatnie gry (limit przycięty do MAX_PAGE_SIZE)"""
+        limit = clamp_page_size(request.query_params.get('limit'), default=10)
+        games = Game.objects.all().order_by('-start_time', '-id')[:limit]
         return Response(GameSerializer(games, many=True).data)
 
 
@@ -201,9 +277,11 @@ class GamePlayerViewSet(viewsets.ModelViewSet):
     queryset = GamePlayer.objects.all()
     serializer_class = GamePlayerSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        queryset = GamePlayer.objects.all().select_related('user', 'game')
+        # Serializer zwraca tylko klucze obce - JOIN z users/games byłby zbędny
+        queryset = GamePlayer.objects.all()
         user_id = self.request.query_params.get('user_id', None)
         game_id = self.request.query_params.get('game_id', None)
 
@@ -213,73 +291,93 @@ class GamePlayerViewSet(viewsets.ModelViewSet):
         if game_id is not None:
             queryset = queryset.filter(game_id=game_id)
 
-        return queryset.order_by('-game__start_time')
-
-
-class PlayerResourceViewSet(viewsets.ModelViewSet):
-    queryset = PlayerResource.objects.all()
-    serializer_class = PlayerResourceSerializer
+        return queryset.order_by('-start_time', '-id')
+
+    # Zmiana gracza zmienia odpowiedź players (i szczegóły) gry w cache - także gry, z której go przeniesiono
+    # Tak samo udział gry w UserStats i dziennych rollupach
+    def perform_create(self, serializer):
+        with GameSaver.rerecorded(serializer.validated_data['game'].pk):
+            super().perform_create(serializer)
+        game_cache.invalidate(serializer.instance.game_id)
+
+    def perform_update(self, serializer):
+        previous_game_id = serializer.instance.game_id
+        new_game = serializer.validated_data.get('game')
+        with GameSaver.rerecorded(previous_game_id, new_game.pk if new_game else None):
+            super().perform_update(serializer)
+        game_cache.invalidate(previous_game_id)
+        if serializer.instance.game_id != previous_game_id:
+            game_cache.invalidate(serializer.instance.game_id)
+
+    def perform_destroy(self, instance):
+        game_cache.invalidate(instance.game_id)
+        with GameSaver.rerecorded(instance.game_id):
+            super().perform_destroy(instance)
+
+
+class PlayerResourceViewSet(viewsets.GenericViewSet):
+    """
+    Tylko do odczytu, dla zgodności z dawnym /api/player-resources/: wiersze {game_player, resource_type, amount}
+    składane z kolumn surowców GamePlayer (tabela player_resources już nie istnieje, więc wiersze nie mają id).
+    Filtry jak dawniej: ?user_id=&game_id=&resource_type=; stronicowanie kursorem jak w game-players.
+    """
+    queryset = GamePlayer.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        queryset = PlayerResource.objects.all().select_related('game_player__user', 'game_player__game')
+        queryset = GamePlayer.objects.only('id', 'start_time', *RESOURCE_TYPES)
         user_id = self.request.query_params.get('user_id', None)
         game_id = self.request.query_params.get('game_id', None)
         resource_type = self.request.query_params.get('resource_type', None)
 
         if user_id is not None:
-            queryset = queryset.filter(game_player__user_id=user_id)
+            queryset = queryset.filter(user_id=user_id)
 
         if game_id is not None:
-            queryset = queryset.filter(game_player__game_id=game_id)
+            queryset = queryset.filter(game_id=game_id)
 
+        # Dawna tabela miała wiersze tylko dla surowców, które gracz miał na koniec gry
         if resource_type is not None:
-            queryset = queryset.filter(resource_type=resource_type)
-
-        return queryset
+            if resource_type not in RESOURCE_TYPES:
+                return queryset.none()
+            queryset = queryset.filter(**{f'{resource_type}__gt': 0})
+        else:
+            held = Q()
+            for name in RESOURCE_TYPES:
+                held |= Q(**{f'{name}__gt': 0})
+            queryset = queryset.filter(held)
+
+        return queryset.order_by('-start_time', '-id')
+
+    def list(self, request):
+        resource_type = request.query_params.get('resource_type', None)
+        page = self.paginate_queryset(self.get_queryset())
+        rows = [
+            {'game_player': gp.id, 'resource_type': name, 'amount': amount}
+            for gp in page
+            for name, amount in gp.resources.items()
+            if resource_type is None or name == resource_type
+        ]
+        return self.get_paginated_response(rows)
 
 
 # Dodatkowe widoki dla globalnych statystyk
-class StatsViewSet(viewsets.ViewSet):
+class StatsViewSet(replicas.AnalyticsReadsMixin, viewsets.ViewSet):
     permission_classes = [AllowAny]  # Globalne statystyki są publiczne
 
     @action(detail=False, methods=['get'])
     def global_stats(self, request):
-        """Globalne statystyki wszystkich graczy"""
-        total_games = Game.objects.count()
-        total_players = User.objects.count()
-        total_game_sessions = GamePlayer.objects.count()
+        """Globalne statystyki wszystkich graczy - ranking z indeksu UserStats przez cache top-K"""
+        from game_api import leaderboard
 
-        if total_game_sessions == 0:
-            return Response({
-                'total_games': 0,
-                'total_players': total_players,
-                'total_game_sessions': 0,
-                'leaderboard': []
-            })
-
-        # Najlepsi gracze
-        user_stats = []
-        for user in User.objects.all():
-            stats = GameSaver.get_game_statistics_for_user(user.id)
-            if stats and stats['total_games'] > 0:
-                user_stats.append({
-                    'user_id': user.id,
-                    'username': user.display_name or user.username,
-                    'total_games': stats['total_games'],
-                    'wins': stats['wins'],
-                    'win_rate': round(stats['win_rate'], 1),
-                    'avg_points': round(stats['average_victory_points'], 1)
-                })
-
-        # Posortuj według win rate, potem według liczby gier
-        user_stats.sort(key=lambda x: (x['win_rate'], x['total_games']), reverse=True)
+        totals = leaderboard.get_totals()
+        if totals['total_game_sessions'] == 0:
+            return Response({**totals, 'total_games': 0, 'leaderboard': []})
 
         return Response({
-            'total_games': total_games,
-            'total_players': total_players,
-            'total_game_sessions': total_game_sessions,
-            'leaderboard': user_stats[:10]  # Top 10
+            **totals,
+            'leaderboard': leaderboard.get_leaderboard(10)  # Top 10
         })
 
     # ✅ POPRAWIONE WCIĘCIE - metoda na właściwym poziomie klasy
@@ -287,43 +385,49 @@ class StatsViewSet(viewsets.ViewSet):
     def create_test_game(self, request):
         """ENDPOINT DO TESTOWANIA - tworzy przykładową grę"""
         try:
-            # Utwórz testową grę
-            game = Game.objects.create(
-                start_time=timezone.now() - timezone.timedelta(hours=1),
-                end_time=timezone.now(),
-                turns=45,
-                dice_distribution={'6': 8, '8': 7, '5': 6, '9': 5}
-            )
-            
-            # Utwórz testowych graczy
-            test_players = [
-                {'username': 'test_player_1', 'points': 10, 'won': True},
-                {'username': 'test_player_2', 'points': 8, 'won': False},
-                {'username': 'test_player_3', 'points': 6, 'won': False},
-            ]
-            
-            for player_data in test_players:
-                # Znajdź lub utwórz użytkownika
-                user, created = User.objects.get_or_create(
-                    username=player_data['username'],
-                    defaults={
-                        'email': f"{player_data['username']}@test.com",
-                        'is_guest': True,
-                        'display_name': player_data['username']
-                    }
+            # Utwórz testową grę - razem z UserStats, licznikami User i rollupami, jak GameSaver
+            with transaction.atomic():
+                game = Game.objects.create(
+                    start_time=timezone.now() - timezone.timedelta(hours=1),
+                    end_time=timezone.now(),
+                    turns=45,
+                    dice_distribution={'6': 8, '8': 7, '5': 6, '9': 5}
                 )
                 
-                # Utwórz GamePlayer
-                GamePlayer.objects.create(
-                    game=game,
-                    user=user,
-                    victory_points=player_data['points'],
-                    roads_built=random.randint(5, 12),
-                    settlements_built=random.randint(2, 4),
-                    cities_built=random.randint(0, 3),
-                    longest_road=player_data['won'],
-                    largest_army=False
-                )
+                # Utwórz testowych graczy
+                test_players = [
+                    {'username': 'test_player_1', 'points': 10, 'won': True},
+                    {'username': 'test_player_2', 'points': 8, 'won': False},
+                    {'username': 'test_player_3', 'points': 6, 'won': False},
+                ]
+                
+                game_players = []
+                for player_data in test_players:
+                    # Znajdź lub utwórz użytkownika
+                    user, created = User.objects.get_or_create(
+                        username=player_data['username'],
+                        defaults={
+                            'email': f"{player_data['username']}@test.com",
+                            'is_guest': True,
+                            'display_name': player_data['username']
+                        }
+                    )
+                    
+                    # Utwórz GamePlayer
+                    game_players.append(GamePlayer.objects.create(
+                        game=game,
+                        user=user,
+                        victory_points=player_data['points'],
+                        roads_built=random.randint(5, 12),
+                        settlements_built=random.randint(2, 4),
+                        cities_built=random.randint(0, 3),
+                        longest_road=player_data['won'],
+                        largest_army=False,
+                        start_time=game.start_time
+                    ))
+                
+                GameSaver._update_user_stats(game_players)
+                rollups.record_game(game, game_players)
             
             return Response({
                 'message': f'Test game {game.id} created successfully',
@@ -335,13 +439,46 @@ class StatsViewSet(viewsets.ViewSet):
                 'error': f'Failed to create test game: {str(e)}'
             }, status=500)
         
+    @action(detail=False, methods=['get'])
+    def expected_income(self, request):
+        """Oczekiwany dochód graczy w trwającej grze (pokój w pamięci serwera)"""
+        from game_api.simple_consumer import game_rooms
+
+        room_id = request.query_params.get('room_id')
+        room = game_rooms.get(room_id) if room_id else None
+        if room is None:
+            return Response({'error': 'Game room not found'}, status=404)
+
+        return Response({
+            'room_id': room_id,
+            'players': room['game_state'].get_expected_income_stats()
+        })
+
+    @action(detail=False, methods=['get'])
+    def persistence(self, request):
+        """Metryki kolejki zapisu zakończonych gier (głębokość kolejki, opóźnienie zapisu)"""
+        from game_api.persistence import get_persistence_worker
+
+        return Response(get_persistence_worker().metrics())
+
     @action(detail=False, methods=['get'])
     def resource_analysis(self, request):
-        """Analiza zasobów - które są najczęściej zbierane"""
-        resources = PlayerResource.objects.values('resource_type').annotate(
-            total_amount=Sum('amount'),
-            avg_amount=Avg('amount'),
-            count=Count('id')
-        ).order_by('-total_amount')
-
-        return Response(list(resources))
\ No newline at end of file
+        """Analiza zasobów - które są najczęściej zbierane (z dziennych rollupów, ?since=&until=)"""
+        from game_api import rollups
+
+        try:
+            since, until = rollups.parse_range(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        return Response(rollups.resource_totals(since, until))
+
+    @action(detail=False, methods=['get'])
+    def daily(self, request):
+        """Dzienne liczby gier, średnia tur, rozkład kostek i skuteczność miejsc (?since=&until=)"""
+        from game_api import rollups
+
+        try:
+            since, until = rollups.parse_range(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        return Response(rollups.daily_summary(since, until))
\ No newline at end of file
@@ -0,0 +1,142 @@
+# backend/game_engine/simple/board_generator.py
+# Losowe plansze z oceną "sprawiedliwości" liczoną wektorowo (numpy) dla tysięcy kandydatów naraz
+
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from game_engine.simple.geometry import BoardLayout
+from game_engine.simple.setup_hints import DICE_PIPS
+
+DEFAULT_CANDIDATES = 2000
+RED_NUMBERS = (6, 8)
+RESOURCE_BALANCE_WEIGHT = 0.5   # waga rozrzutu kropek między surowcami względem rozrzutu między rogami
+REPAIR_CANDIDATES = 16          # ilu najlepszych kandydatów naprawiamy, gdy żaden nie spełnia zasady 6/8
+MAX_REPAIR_SWAPS = 64
+MAX_SAMPLE_ROUNDS = 8           # ile razy losujemy od nowa, gdy naprawa też nie rozdzieli 6/8
+
+RESOURCE_NAMES = [None, "WOOD", "BRICK", "SHEEP", "WHEAT", "ORE"]   # kod 0 = pustynia
+_PIPS_BY_NUMBER = np.array([DICE_PIPS.get(n, 0) for n in range(13)], dtype=np.int16)
+
+
+class _LayoutArrays:
+    """Tablice numpy dla układu - liczone raz i trzymane w cache jak same tabele układu"""
+
+    def __init__(self, layout: BoardLayout):
+        codes = {name: code for code, name in enumerate(RESOURCE_NAMES)}
+        self.resource_pool = np.array(
+            [codes[res] for res, count in layout.resource_counts.items() for _ in range(count)],
+            dtype=np.int8)
+        self.number_pool = np.array(sorted(layout.number_tokens), dtype=np.int8)
+        self.producing_tiles = len(self.number_pool)
+
+        # Macierz incydencji róg x kafelek: kropki rogu = kropki kafelków @ incydencja.T
+        self.incidence = np.zeros((layout.spot_count, layout.tile_count), dtype=np.int16)
+        for spot, vertices in enumerate(layout.spot_vertices):
+            self.incidence[spot, layout.vertex_to_tiles[vertices[0]]] = 1
+
+        pairs = np.array(layout.tile_adjacent_pairs, dtype=np.intp).reshape(-1, 2)
+        self.pair_a, self.pair_b = pairs[:, 0], pairs[:, 1]
+
+        self.resource_tile_counts = np.array(
+            [max(layout.resource_counts.get(name, 0), 1) for name in RESOURCE_NAMES[1:]], dtype=np.float32)
+
+
+@lru_cache(maxsize=None)
+def _layout_arrays(layout: BoardLayout) -> _LayoutArrays:
+    return _LayoutArrays(layout)
+
+
+def _sample(arrays: _LayoutArrays, candidates: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """Wylosuj `candidates` plansz: macierze surowców i numerów (kandydat x kafelek)"""
+    tile_count = len(arrays.resource_pool)
+    resources = rng.permuted(np.tile(arrays.resource_pool, (candidates, 1)), axis=1)
+    tokens = rng.permuted(np.tile(arrays.number_pool, (candidates, 1)), axis=1)
+
+    # Numery trafiają na kafelki nie-pustynne w kolejności ich występowania
+    producing = np.argsort(resources == 0, axis=1, kind="stable")[:, :arrays.producing_tiles]
+    numbers = np.zeros((candidates, tile_count), dtype=np.int8)
+    np.put_along_axis(numbers, producing, tokens, axis=1)
+    return resources, numbers
+
+
+def score_boards(layout: BoardLayout, resources: np.ndarray, numbers: np.ndarray) -> np.ndarray:
+    """
+    Ocena kandydatów (mniej = bardziej sprawiedliwa plansza):
+    odchylenie standardowe kropek na wszystkich rogach + rozrzut średnich kropek między surowcami.
+    Plansze z sąsiadującymi 6/8 dostają +inf.
+    """
+    arrays = _layout_arrays(layout)
+    red = np.isin(numbers, RED_NUMBERS)
+    adjacent_red = (red[:, arrays.pair_a] & red[:, arrays.pair_b]).any(axis=1)
+
+    scores = _spread_only(arrays, resources, numbers)
+    scores[adjacent_red] = np.inf
+    return scores
+
+
+def _spread_only(arrays: _LayoutArrays, resources: np.ndarray, numbers: np.ndarray) -> np.ndarray:
+    pips = _PIPS_BY_NUMBER[numbers]
+    spread = (pips @ arrays.incidence.T).std(axis=1)
+
+    per_resource = np.stack(
+        [np.where(resources == code, pips, 0).sum(axis=1) for code in range(1, len(RESOURCE_NAMES))], axis=1)
+    resource_spread = (per_resource / arrays.resource_tile_counts).std(axis=1)
+    return spread + RESOURCE_BALANCE_WEIGHT * resource_spread
+
+
+def _separate_red_numbers(layout: BoardLayout, numbers: np.ndarray, rng: np.random.Generator):
+    """
+    Zamieniaj czerwone numery z kolidujących kafelków na bezpieczne, aż 6/8 przestaną się stykać.
+    Może się poddać (brak bezpiecznego kafelka, limit zamian) - wynik sprawdza ponowna ocena w generate_board.
+    """
+    neighbors = layout.tile_neighbors
+    for _ in range(MAX_REPAIR_SWAPS):
+        red = {t for t in range(len(numbers)) if numbers[t] in RED_NUMBERS}
+        conflicts = [t for t in red if any(n in red for n in neighbors[t])]
+        if not conflicts:
+            return
+        moving = conflicts[int(rng.integers(len(conflicts)))]
+        safe = [t for t in range(len(numbers))
+                if numbers[t] and t not in red and not any(n in red and n != moving for n in neighbors[t])]
+        if not safe:
+            return
+        target = safe[int(rng.integers(len(safe)))]
+        numbers[moving], numbers[target] = numbers[target], numbers[moving]
+
+
+def generate_board(layout: BoardLayout, candidates: int = DEFAULT_CANDIDATES,
+                   seed: Optional[int] = None) -> List[Tuple[int, Optional[str], int]]:
+    """
+    Wylosuj `candidates` plansz i zwróć najlepszą jako tile_data dla SimpleGameState:
+    lista (tile_id, nazwa surowca lub None dla pustyni, numer).
+    """
+    arrays = _layout_arrays(layout)
+    rng = np.random.default_rng(seed)
+    for _ in range(MAX_SAMPLE_ROUNDS):
+        resources, numbers = _sample(arrays, candidates, rng)
+        scores = score_boards(layout, resources, numbers)
+
+        if not np.isfinite(scores).any():
+            # Na dużych planszach losowanie prawie nigdy nie omija sąsiadujących 6/8 -
+            # naprawiamy kilku najlepszych kandydatów zamianami numerów i oceniamy ich jeszcze raz
+            ignoring_red = _spread_only(arrays, resources, numbers)
+            chosen = np.argsort(ignoring_red, kind="stable")[:REPAIR_CANDIDATES]
+            resources, numbers = resources[chosen], numbers[chosen].copy()
+            for row in numbers:
+                _separate_red_numbers(layout, row, rng)
+            scores = score_boards(layout, resources, numbers)
+
+        # argmin po samych +inf wybrałby planszę z sąsiadującymi 6/8 - wtedy losujemy od nowa
+        if np.isfinite(scores).any():
+            break
+    else:
+        raise ValueError(f"Could not separate red numbers on board layout: {layout.name}")
+
+    best = int(np.argmin(scores))
+
+    return [
+        (tile_id, RESOURCE_NAMES[int(code)], int(number))
+        for tile_id, (code, number) in enumerate(zip(resources[best], numbers[best]))
+    ]
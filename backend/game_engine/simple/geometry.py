@@ -0,0 +1,238 @@
+# backend/game_engine/simple/geometry.py
+# Geometria planszy heksagonalnej we współrzędnych sześciennych (q, r, s)
+#
+# ID wierzchołka i krawędzi = indeks_heksu * 6 + róg/krawędź - tak samo jak we frontendzie,
+# więc jeden fizyczny róg ma do 3 ID (aliasy), a krawędź do 2. Tabele liczymy raz na układ.
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+HexCoords = Tuple[int, int, int]
+
+# Róg i leży pod kątem 60° * i (frontend: heksy "flat-top", oś y w dół):
+# 0 = E, 1 = SE, 2 = SW, 3 = W, 4 = NW, 5 = NE
+CORNER_NEIGHBOR_OFFSETS: Dict[int, List[HexCoords]] = {
+    0: [(1, -1, 0), (1, 0, -1)],
+    1: [(1, 0, -1), (0, 1, -1)],
+    2: [(0, 1, -1), (-1, 1, 0)],
+    3: [(-1, 1, 0), (-1, 0, 1)],
+    4: [(-1, 0, 1), (0, -1, 1)],
+    5: [(0, -1, 1), (1, -1, 0)],
+}
+
+# Krawędź i łączy róg i z rogiem i+1 i jest wspólna z tym sąsiednim heksem
+EDGE_NEIGHBOR_OFFSETS: Dict[int, HexCoords] = {
+    0: (1, 0, -1),
+    1: (0, 1, -1),
+    2: (-1, 1, 0),
+    3: (-1, 0, 1),
+    4: (0, -1, 1),
+    5: (1, -1, 0),
+}
+
+# Standardowy zestaw (3-4 graczy) i rozszerzenie dla 5-6 graczy
+STANDARD_RESOURCE_COUNTS = {None: 1, "WOOD": 4, "BRICK": 3, "SHEEP": 4, "WHEAT": 4, "ORE": 3}
+STANDARD_NUMBER_TOKENS = [2, 3, 3, 4, 4, 5, 5, 6, 6, 8, 8, 9, 9, 10, 10, 11, 11, 12]
+
+EXTENDED_RESOURCE_COUNTS = {None: 2, "WOOD": 6, "BRICK": 5, "SHEEP": 6, "WHEAT": 6, "ORE": 5}
+EXTENDED_NUMBER_TOKENS = [2, 2, 3, 3, 3, 4, 4, 4, 5, 5, 5, 6, 6, 6,
+                          8, 8, 8, 9, 9, 9, 10, 10, 10, 11, 11, 11, 12, 12]
+
+
+def _add(a: HexCoords, b: HexCoords) -> HexCoords:
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+
+def _order_hexes(hexes: Sequence[HexCoords]) -> Tuple[HexCoords, ...]:
+    """Kolejność jak we frontendzie: środek (jeśli jest) pierwszy, potem wierszami (r, q)"""
+    center = (0, 0, 0)
+    rest = sorted((h for h in hexes if h != center), key=lambda h: (h[1], h[0]))
+    return ((center,) if center in hexes else ()) + tuple(rest)
+
+
+def _scaled_resource_counts(tile_count: int) -> Dict[object, int]:
+    """Proporcje surowców ze standardowego zestawu przeskalowane do liczby heksów"""
+    deserts = max(1, round(tile_count / 19))
+    producing = tile_count - deserts
+    base = {res: n for res, n in STANDARD_RESOURCE_COUNTS.items() if res is not None}
+    base_total = sum(base.values())
+    counts = {res: producing * n // base_total for res, n in base.items()}
+    # Reszta z dzielenia trafia do surowców z największym udziałem
+    for res in sorted(base, key=lambda r: -base[r])[:producing - sum(counts.values())]:
+        counts[res] += 1
+    counts[None] = deserts
+    return counts
+
+
+def _scaled_number_tokens(count: int) -> List[int]:
+    return sorted(STANDARD_NUMBER_TOKENS[i % len(STANDARD_NUMBER_TOKENS)] for i in range(count))
+
+
+class BoardLayout:
+    """
+    Kształt planszy z tabelami sąsiedztwa liczonymi raz przy tworzeniu.
+
+    Obiekty są współdzielone przez wszystkie gry z tym samym układem (patrz get_layout),
+    więc tabele traktujemy jako tylko do odczytu.
+    """
+
+    def __init__(self, name: str, hexes: Sequence[HexCoords], max_players: int,
+                 resource_counts: Dict[object, int] = None, number_tokens: List[int] = None):
+        self.name = name
+        self.hexes: Tuple[HexCoords, ...] = _order_hexes(hexes)
+        self.max_players = max_players
+        self.hex_index: Dict[HexCoords, int] = {h: i for i, h in enumerate(self.hexes)}
+        self.tile_count = len(self.hexes)
+        self.vertex_count = self.tile_count * 6
+        self.edge_count = self.tile_count * 6
+
+        self.resource_counts = resource_counts or _scaled_resource_counts(self.tile_count)
+        self.number_tokens = number_tokens or _scaled_number_tokens(
+            self.tile_count - self.resource_counts[None])
+
+        self._init_corners()
+        self._init_edges()
+        self._init_tile_neighbors()
+
+    def _init_corners(self):
+        self.vertex_to_tiles: Dict[int, List[int]] = {}
+        self.tile_to_vertices: Dict[int, List[int]] = {i: [] for i in range(self.tile_count)}
+        self.vertex_spot: Dict[int, int] = {}
+        self.spot_vertices: List[List[int]] = []
+        spot_keys: List[FrozenSet[HexCoords]] = []
+        key_to_spot: Dict[FrozenSet[HexCoords], int] = {}
+
+        for hex_id, center in enumerate(self.hexes):
+            for corner, offsets in CORNER_NEIGHBOR_OFFSETS.items():
+                vertex_id = hex_id * 6 + corner
+                around = [center] + [_add(center, off) for off in offsets]
+
+                tiles = [self.hex_index[h] for h in around if h in self.hex_index]
+                self.vertex_to_tiles[vertex_id] = tiles
+                for tile_id in tiles:
+                    self.tile_to_vertices[tile_id].append(vertex_id)
+
+                # Fizyczny róg = zbiór trzech stykających się heksów (także spoza planszy)
+                key = frozenset(around)
+                spot = key_to_spot.get(key)
+                if spot is None:
+                    spot = len(spot_keys)
+                    key_to_spot[key] = spot
+                    spot_keys.append(key)
+                    self.spot_vertices.append([])
+                self.vertex_spot[vertex_id] = spot
+                self.spot_vertices[spot].append(vertex_id)
+
+        # Sąsiednie rogi dzielą dwa heksy (czyli krawędź)
+        spots_by_pair: Dict[FrozenSet[HexCoords], List[int]] = {}
+        for spot, key in enumerate(spot_keys):
+            hexes = sorted(key)
+            for i in range(3):
+                for j in range(i + 1, 3):
+                    spots_by_pair.setdefault(frozenset((hexes[i], hexes[j])), []).append(spot)
+
+        self.spot_neighbors: List[List[int]] = [[] for _ in spot_keys]
+        for spots in spots_by_pair.values():
+            for spot in spots:
+                self.spot_neighbors[spot].extend(s for s in spots if s != spot)
+        self.spot_count = len(spot_keys)
+
+    def _init_edges(self):
+        self.edge_vertices: Dict[int, Tuple[int, int]] = {}
+        self.edge_spot: Dict[int, int] = {}
+        self.edge_spot_ids: List[List[int]] = []
+        key_to_spot: Dict[FrozenSet[HexCoords], int] = {}
+
+        for hex_id, center in enumerate(self.hexes):
+            for edge, offset in EDGE_NEIGHBOR_OFFSETS.items():
+                edge_id = hex_id * 6 + edge
+                self.edge_vertices[edge_id] = (hex_id * 6 + edge, hex_id * 6 + (edge + 1) % 6)
+
+                key = frozenset((center, _add(center, offset)))
+                spot = key_to_spot.setdefault(key, len(key_to_spot))
+                if spot == len(self.edge_spot_ids):
+                    self.edge_spot_ids.append([])
+                self.edge_spot[edge_id] = spot
+                self.edge_spot_ids[spot].append(edge_id)
+
+    def _init_tile_neighbors(self):
+        self.tile_neighbors: List[List[int]] = [[] for _ in self.hexes]
+        self.tile_adjacent_pairs: List[Tuple[int, int]] = []
+        for hex_id, center in enumerate(self.hexes):
+            for offset in EDGE_NEIGHBOR_OFFSETS.values():
+                other = self.hex_index.get(_add(center, offset))
+                if other is not None:
+                    self.tile_neighbors[hex_id].append(other)
+                    if hex_id < other:
+                        self.tile_adjacent_pairs.append((hex_id, other))
+
+    def default_tile_data(self) -> List[Tuple[int, object, int]]:
+        """
+        Deterministyczne rozłożenie kafelków (tile_id, nazwa surowca lub None, numer).
+        Pustynie w środku, surowce na zmianę, numery w kolejności pul.
+        """
+        remaining = {res: n for res, n in self.resource_counts.items() if res is not None}
+        resources: List[object] = [None] * self.resource_counts[None]
+        while len(resources) < self.tile_count:
+            for res in sorted(remaining, key=lambda r: -remaining[r]):
+                if remaining[res] > 0 and len(resources) < self.tile_count:
+                    resources.append(res)
+                    remaining[res] -= 1
+
+        # Przeplataj niskie i wysokie numery, żeby nie skupiać 6 i 8
+        tokens = sorted(self.number_tokens)
+        numbers = []
+        while tokens:
+            numbers.append(tokens.pop(0))
+            if tokens:
+                numbers.append(tokens.pop())
+
+        tile_data = []
+        for tile_id, res in enumerate(resources):
+            tile_data.append((tile_id, res, 0 if res is None else numbers.pop(0)))
+        return tile_data
+
+
+def hexagon_hexes(radius: int) -> List[HexCoords]:
+    return [(q, r, -q - r)
+            for q in range(-radius, radius + 1)
+            for r in range(max(-radius, -q - radius), min(radius, -q + radius) + 1)]
+
+
+def extended_hexes() -> List[HexCoords]:
+    """Plansza 5-6 graczy: wiersze 3-4-5-6-5-4-3 (heksagon r=3 bez ostatniego heksu w wierszu)"""
+    hexes = hexagon_hexes(3)
+    last_in_row = {}
+    for q, r, s in hexes:
+        last_in_row[r] = max(last_in_row.get(r, q), q)
+    return [h for h in hexes if h[0] != last_in_row[h[1]]]
+
+
+# Heksagony większe niż MAX_HEXAGON_RADIUS odrzucamy - nazwa układu przychodzi od klienta (?layout=),
+# a koszt tabel i losowania planszy rośnie z liczbą pól
+MAX_HEXAGON_RADIUS = 5
+LAYOUT_NAMES = ("standard", "extended", *(f"hexagon_{radius}" for radius in range(1, MAX_HEXAGON_RADIUS + 1)))
+
+
+@lru_cache(maxsize=MAX_HEXAGON_RADIUS)
+def hexagon_layout(radius: int) -> BoardLayout:
+    """Plansza-heksagon o promieniu 1..MAX_HEXAGON_RADIUS (promień 2 = standardowe 19 pól)"""
+    if not 1 <= radius <= MAX_HEXAGON_RADIUS:
+        raise ValueError(f"Hexagon radius must be between 1 and {MAX_HEXAGON_RADIUS}")
+    if radius == 2:
+        return BoardLayout("standard", hexagon_hexes(2), 4,
+                           STANDARD_RESOURCE_COUNTS, STANDARD_NUMBER_TOKENS)
+    return BoardLayout(f"hexagon_{radius}", hexagon_hexes(radius), 6)
+
+
+@lru_cache(maxsize=len(LAYOUT_NAMES))
+def get_layout(name: str = "standard") -> BoardLayout:
+    """Zwróć (z cache) układ planszy po nazwie z LAYOUT_NAMES: standard, extended lub hexagon_1..5"""
+    if name not in LAYOUT_NAMES:
+        raise ValueError(f"Unknown board layout: {name}")
+    if name == "standard":
+        return hexagon_layout(2)
+    if name == "extended":
+        return BoardLayout("extended", extended_hexes(), 6,
+                           EXTENDED_RESOURCE_COUNTS, EXTENDED_NUMBER_TOKENS)
+    return hexagon_layout(int(name[len("hexagon_"):]))
@@ -4,6 +4,12 @@
 from typing import Dict, List, Optional
 from enum import Enum
 from dataclasses import dataclass
+from game_engine.simple.geometry import BoardLayout, get_layout
+from game_engine.simple.setup_hints import SetupHintIndex, DEFAULT_HINT_LIMIT, DICE_PIPS
+
+# Próg zwycięstwa - jedno miejsce dla silnika, zapisu gier i statystyk (4 punkty dla testowania)
+WIN_VICTORY_POINTS = 4
+
 
 class BuildingType(Enum):
     SETTLEMENT = "settlement"
@@ -21,23 +27,23 @@ class GameVertex:
     """Wierzchołek z prostym ID - BEZ ZMIAN"""
     vertex_id: int
     building_type: Optional[BuildingType] = None
-    player_id: Optional[str] = None
+    owner: Optional[int] = None   # numer miejsca gracza (seat), nie UUID
     
     def has_building(self) -> bool:
         return self.building_type is not None
     
-    def is_owned_by(self, player_id: str) -> bool:
-        return self.player_id == player_id
+    def is_owned_by(self, seat: int) -> bool:
+        return self.owner == seat
 
 @dataclass
 class GameEdge:
     """Krawędź - BEZ ZMIAN"""
     edge_id: int
     has_road: bool = False
-    player_id: Optional[str] = None
+    owner: Optional[int] = None   # numer miejsca gracza (seat), nie UUID
     
-    def is_owned_by(self, player_id: str) -> bool:
-        return self.player_id == player_id
+    def is_owned_by(self, seat: int) -> bool:
+        return self.owner == seat
 
 @dataclass 
 class GameTile:
@@ -116,6 +122,7 @@ class SimplePlayer:
     cities_left: int = 4
     roads_left: int = 15
     display_name: str = ""
+    seat: int = -1
     
     def can_afford_settlement(self) -> bool:
         cost = {Resource.WOOD: 1, Resource.BRICK: 1, Resource.SHEEP: 1, Resource.WHEAT: 1}
@@ -150,29 +157,67 @@ class SimplePlayer:
 class SimpleGameState:
     """Główny stan gry - TYLKO poprawka mapowania"""
     
-    def __init__(self):
-        # POWRÓT DO 114 vertices (jak było wcześniej)
+    def __init__(self, layout: Optional[BoardLayout] = None, tile_data: Optional[List[tuple]] = None):
+        # Układ planszy (domyślnie standardowe 19 pól = 114 vertices)
+        self.layout: BoardLayout = layout or get_layout("standard")
         self.vertices: Dict[int, GameVertex] = {}
         self.edges: Dict[int, GameEdge] = {}
         self.tiles: Dict[int, GameTile] = {}
         self.players: Dict[str, SimplePlayer] = {}
         self.phase: GamePhase = GamePhase.SETUP
         self.current_player_index: int = 0
-        self.player_order: List[str] = []
         self.setup_round: int = 1
-        self.setup_progress: Dict[str, Dict[str, int]] = {}
-        self.player_settlements_order: Dict[str, List[int]] = {}
+
+        # Gracze wewnątrz silnika to numery miejsc 0..N-1 (seat), UUID tylko na granicy
+        # (wiadomości z consumera i serialize). Miejsca nie są używane ponownie po wyjściu gracza,
+        # więc budynki rozłączonego gracza dalej wskazują na jego UUID.
+        self.seat_of: Dict[str, int] = {}                        # UUID -> seat
+        self.seat_ids: List[str] = []                            # seat -> UUID
+        self.seat_players: List[Optional[SimplePlayer]] = []     # seat -> gracz (None po wyjściu)
+        self.turn_order: List[int] = []                          # kolejność tur (seats)
+        self.setup_progress: List[Dict[str, int]] = []
+        self.player_settlements_order: List[List[int]] = []
 
         self.vertex_to_tiles: Dict[int, List[int]] = {}
+        self.tile_to_vertices: Dict[int, List[int]] = {}
+        self.tiles_by_number: Dict[int, List[int]] = {}
+
+        # Oczekiwany dochód: seat -> surowiec -> kropki x mnożnik (1 osada, 2 miasto), None po wyjściu
+        self.expected_income: List[Optional[Dict[str, int]]] = []
 
-        self.has_rolled_dice: Dict[str, bool] = {}  # player_id -> czy rzucił kośćmi
+        self.has_rolled_dice: List[bool] = []  # seat -> czy rzucił kośćmi
         self.turn_phase: str = "roll"  # "roll" lub "actions"
         
-        self._init_board()
+        self._init_board(tile_data)
     
-    def _init_board(self):
-        """Inicjalizuj planszę - POWRÓT DO ORYGINALNEJ WERSJI"""
-        tile_data = [
+    def _init_board(self, tile_data: Optional[List[tuple]] = None):
+        """Inicjalizuj planszę - kafelki z tile_data, wierzchołki i krawędzie z układu"""
+        if tile_data is None:
+            tile_data = self._default_tile_data()
+        
+        for tile_id, resource, dice_num in tile_data:
+            if isinstance(resource, str):
+                resource = Resource[resource]
+            self.tiles[tile_id] = GameTile(tile_id, resource, dice_num)
+            if dice_num == 0:
+                self.tiles[tile_id].has_robber = True
+            else:
+                self.tiles_by_number.setdefault(dice_num, []).append(tile_id)
+        
+        for vertex_id in range(self.layout.vertex_count):
+            self.vertices[vertex_id] = GameVertex(vertex_id)
+        
+        for edge_id in range(self.layout.edge_count):
+            self.edges[edge_id] = GameEdge(edge_id)
+            
+        self._init_vertex_to_tiles_mapping()
+    
+    def _default_tile_data(self) -> List[tuple]:
+        """Stała plansza dla standardowego układu, dla innych - rozkład z układu"""
+        if self.layout.name != "standard":
+            return self.layout.default_tile_data()
+        
+        return [
             (0, None, 0),              # desert
             (1, Resource.WOOD, 6),     
             (2, Resource.SHEEP, 3),    
@@ -193,99 +238,42 @@ class SimpleGameState:
             (17, Resource.SHEEP, 4),   
             (18, Resource.BRICK, 11),  
         ]
-        
-        for tile_id, resource, dice_num in tile_data:
-            self.tiles[tile_id] = GameTile(tile_id, resource, dice_num)
-            if dice_num == 0:
-                self.tiles[tile_id].has_robber = True
-        
-        # POWRÓT: 114 vertices i edges
-        for vertex_id in range(114):
-            self.vertices[vertex_id] = GameVertex(vertex_id)
-        
-        for edge_id in range(114):
-            self.edges[edge_id] = GameEdge(edge_id)
-            
-        self._init_vertex_to_tiles_mapping()
     
     def _init_vertex_to_tiles_mapping(self):
-        """NOWE: Poprawione mapowanie vertex->tiles z ręcznymi poprawkami"""
-        
-        # Stary algorytm jako bazę
-        hex_order_frontend = [
-            (0, 0, 0), (0, -2, 2), (1, -2, 1), (2, -2, 0),
-            (-1, -1, 2), (0, -1, 1), (1, -1, 0), (2, -1, -1),
-            (-2, 0, 2), (-1, 0, 1), (1, 0, -1), (2, 0, -2),
-            (-2, 1, 1), (-1, 1, 0), (0, 1, -1), (1, 1, -2),
-            (-2, 2, 0), (-1, 2, -1), (0, 2, -2)
-        ]
-        
-        hex_coords_to_tile_id = {tuple(h): i for i, h in enumerate(hex_order_frontend)}
+        """Mapowanie vertex->tiles i tile->vertices z tabel układu (liczone raz na układ)"""
+        # Tabele układu są współdzielone między grami - tylko do odczytu
+        self.vertex_to_tiles = self.layout.vertex_to_tiles
+        self.tile_to_vertices = self.layout.tile_to_vertices
         
-        neighbor_offsets = {
-            0: [(1, -1, 0), (0, -1, 1)],
-            1: [(1, 0, -1), (1, -1, 0)],
-            2: [(0, 1, -1), (1, 0, -1)],
-            3: [(-1, 1, 0), (0, 1, -1)],
-            4: [(0, -1, 1), (-1, 0, 1)],
-            5: [(-1, 0, 1), (0, -1, 1)]
-        }
-        
-        # RĘCZNE POPRAWKI dla problematycznych vertices
-        manual_fixes = {
-            
-        }
-        
-        # Generuj mapowanie
-        for vertex_id in range(114):
-            # Sprawdź czy mamy ręczną poprawkę
-            if vertex_id in manual_fixes:
-                self.vertex_to_tiles[vertex_id] = manual_fixes[vertex_id]
-                print(f"MANUAL FIX: Vertex {vertex_id} -> tiles {manual_fixes[vertex_id]}")
-                continue
-            
-            # Stary algorytm
-            hex_index = vertex_id // 6
-            vertex_index = vertex_id % 6
-            
-            if hex_index >= len(hex_order_frontend):
-                self.vertex_to_tiles[vertex_id] = []
-                continue
-            
-            center_hex = hex_order_frontend[hex_index]
-            adjacent_tiles = [hex_index]
-            
-            for dq, dr, ds in neighbor_offsets.get(vertex_index, []):
-                neighbor_hex = (
-                    center_hex[0] + dq,
-                    center_hex[1] + dr,
-                    center_hex[2] + ds
-                )
-                neighbor_tile_id = hex_coords_to_tile_id.get(neighbor_hex)
-                if neighbor_tile_id is not None:
-                    adjacent_tiles.append(neighbor_tile_id)
-            
-            unique_tiles = list(dict.fromkeys(adjacent_tiles))
-            self.vertex_to_tiles[vertex_id] = unique_tiles
+        # Oceny miejsc pod osady liczone raz na planszę, potem tylko aktualizowane
+        self.setup_hints = SetupHintIndex(self.layout, self.tiles)
     
     # WSZYSTKIE POZOSTAŁE METODY BEZ ZMIAN - w tym place_road!
     
     def add_player(self, player_id: str, color: str, display_name: str = ""):
-        """Dodaj gracza do gry"""
+        """Dodaj gracza do gry - dostaje kolejny wolny numer miejsca (seat)"""
         final_display_name = display_name or f"Player_{player_id[:6]}"
+        seat = len(self.seat_ids)
         
-        self.players[player_id] = SimplePlayer(
+        player = SimplePlayer(
             player_id=player_id,
             color=color, 
             resources=PlayerResources(),
-            display_name=final_display_name
+            display_name=final_display_name,
+            seat=seat
         )
+        self.players[player_id] = player
         
-        print(f"🔍 Created player: id={player_id[:8]}, color={color}, display_name='{final_display_name}'")
+        print(f"🔍 Created player: id={player_id[:8]}, seat={seat}, color={color}, display_name='{final_display_name}'")
         
-        self.player_order.append(player_id)
-        self.setup_progress[player_id] = {"settlements": 0, "roads": 0}
-        self.player_settlements_order[player_id] = []
+        self.seat_of[player_id] = seat
+        self.seat_ids.append(player_id)
+        self.seat_players.append(player)
+        self.turn_order.append(seat)
+        self.setup_progress.append({"settlements": 0, "roads": 0})
+        self.player_settlements_order.append([])
+        self.expected_income.append({res.value.lower(): 0 for res in Resource})
+        self.has_rolled_dice.append(False)
         
         if len(self.players) == 1:
             self.current_player_index = 0
@@ -294,9 +282,17 @@ class SimpleGameState:
         print(f"📋 Player order: {[p[:8] for p in self.player_order]}")
         print(f"👑 Current player index: {self.current_player_index}")
     
+    @property
+    def player_order(self) -> List[str]:
+        """Kolejność tur jako UUID - tylko dla serializacji i consumera"""
+        return [self.seat_ids[seat] for seat in self.turn_order]
+    
+    def _seat(self, player_id: str) -> int:
+        """UUID -> seat na granicy silnika; -1 dla nieznanego gracza (nic nie posiada, nigdy nie ma tury)"""
+        return self.seat_of.get(player_id, -1)
+    
     def get_current_player(self) -> SimplePlayer:
-        player_id = self.player_order[self.current_player_index]
-        return self.players[player_id]
+        return self.seat_players[self.turn_order[self.current_player_index]]
     
     def can_place_settlement(self, vertex_id: int, player_id: str, is_setup: bool = False) -> bool:
         if vertex_id not in self.vertices:
@@ -331,6 +327,7 @@ class SimpleGameState:
             return False
         
         player = self.players[player_id]
+        seat = player.seat
         
         if not is_setup:
             if not player.can_afford_settlement():
@@ -341,15 +338,13 @@ class SimpleGameState:
             player.victory_points += 1
         
         self.vertices[vertex_id].building_type = BuildingType.SETTLEMENT
-        self.vertices[vertex_id].player_id = player_id
+        self.vertices[vertex_id].owner = seat
+        self.setup_hints.mark_settlement(vertex_id)
+        self._update_expected_income(vertex_id, seat, 1)
         
         if is_setup:
-            # Zabezpiecz przed KeyError
-            if player_id not in self.player_settlements_order:
-                self.player_settlements_order[player_id] = []
-            
-            self.player_settlements_order[player_id].append(vertex_id)
-            settlement_count = len(self.player_settlements_order[player_id])
+            self.player_settlements_order[seat].append(vertex_id)
+            settlement_count = len(self.player_settlements_order[seat])
             
             # POPRAWIONA LOGIKA: Daj surowce tylko za DRUGĄ osadę
             if settlement_count == 2:
@@ -357,10 +352,10 @@ class SimpleGameState:
                 self.give_initial_resources_for_second_settlement(player_id, vertex_id)
             
             # Zwiększ licznik osad w setup_progress
-            self.setup_progress[player_id]["settlements"] += 1
+            self.setup_progress[seat]["settlements"] += 1
             
             print(f"✅ Settlement placed by {player_id[:8]} at vertex {vertex_id}")
-            print(f"   Progress: {self.setup_progress[player_id]}")
+            print(f"   Progress: {self.setup_progress[seat]}")
         
         return True
     
@@ -379,16 +374,96 @@ class SimpleGameState:
             player.roads_left -= 1
         
         self.edges[edge_id].has_road = True
-        self.edges[edge_id].player_id = player_id
+        self.edges[edge_id].owner = player.seat
         
         if is_setup:
-            self.setup_progress[player_id]["roads"] += 1
+            self.setup_progress[player.seat]["roads"] += 1
             
             print(f"✅ Road placed by {player_id[:8]} at edge {edge_id}")
-            print(f"   Progress: {self.setup_progress[player_id]}")
+            print(f"   Progress: {self.setup_progress[player.seat]}")
+        
+        return True
+    
+    def remove_player(self, player_id: str):
+        """Usuń gracza, który się rozłączył (budynki zostają na planszy, miejsce nie jest zwalniane)"""
+        player = self.players.pop(player_id, None)
+        if player is None:
+            return
+        self.seat_players[player.seat] = None
+        self.expected_income[player.seat] = None
+        if player.seat in self.turn_order:
+            self.turn_order.remove(player.seat)
+    
+    def _update_expected_income(self, vertex_id: int, seat: int, multiplier_delta: int):
+        """Dodaj (lub odejmij) wkład budynku na wierzchołku do oczekiwanego dochodu gracza"""
+        income = self.expected_income[seat]
+        if income is None:
+            return
+        for tile_id in self.vertex_to_tiles.get(vertex_id, []):
+            tile = self.tiles.get(tile_id)
+            if tile is None or tile.resource is None or tile.has_robber:
+                continue
+            income[tile.resource.value.lower()] += DICE_PIPS.get(tile.dice_number, 0) * multiplier_delta
+    
+    def _update_income_around_tile(self, tile_id: int, sign: int):
+        """Przelicz wkład jednego kafelka dla wszystkich budynków wokół niego"""
+        tile = self.tiles[tile_id]
+        if tile.resource is None:
+            return
+        pips = DICE_PIPS.get(tile.dice_number, 0)
+        resource_key = tile.resource.value.lower()
+        for vertex_id in self.tile_to_vertices.get(tile_id, []):
+            vertex = self.vertices[vertex_id]
+            if vertex.has_building():
+                income = self.expected_income[vertex.owner]
+                if income is not None:
+                    multiplier = 2 if vertex.building_type == BuildingType.CITY else 1
+                    income[resource_key] += sign * pips * multiplier
+    
+    def move_robber(self, tile_id: int) -> bool:
+        """Przenieś robbera na inny kafelek i zaktualizuj oczekiwany dochód"""
+        if tile_id not in self.tiles:
+            return False
         
+        for old_tile_id, tile in self.tiles.items():
+            if tile.has_robber:
+                if old_tile_id == tile_id:
+                    return False
+                tile.has_robber = False
+                self._update_income_around_tile(old_tile_id, 1)
+        
+        self.tiles[tile_id].has_robber = True
+        self._update_income_around_tile(tile_id, -1)
         return True
     
+    def get_expected_income_stats(self) -> Dict[str, dict]:
+        """Oczekiwany dochód każdego gracza - w kropkach (na 36 rzutów) i na jeden rzut"""
+        stats = {}
+        for seat, income in enumerate(self.expected_income):
+            player = self.seat_players[seat]
+            if income is None or player is None:
+                continue
+            total = sum(income.values())
+            stats[player.player_id] = {
+                "display_name": player.display_name,
+                "pips": dict(income),
+                "per_roll": {res: round(pips / 36, 4) for res, pips in income.items()},
+                "total_pips": total,
+                "total_per_roll": round(total / 36, 4)
+            }
+        return stats
+    
+    def get_setup_hints(self, player_id: str, limit: int = DEFAULT_HINT_LIMIT) -> List[dict]:
+        """Najlepsze wolne miejsca na osadę w setup - premiuje surowce, których gracz jeszcze nie ma"""
+        owned_resources = set()
+        seat = self._seat(player_id)
+        for vertex_id in (self.player_settlements_order[seat] if seat >= 0 else []):
+            for tile_id in self.vertex_to_tiles.get(vertex_id, []):
+                tile = self.tiles.get(tile_id)
+                if tile and tile.resource is not None:
+                    owned_resources.add(tile.resource.value)
+        return self.setup_hints.top(limit, frozenset(owned_resources))
+    
     def give_initial_resources_for_second_settlement(self, player_id: str, second_settlement_vertex_id: int):
         """POPRAWIONA wersja z nowym mapowaniem"""
         print(f"\n=== GIVING INITIAL RESOURCES (FIXED MAPPING) ===")
@@ -451,30 +526,46 @@ class SimpleGameState:
                 "roads_left": p.roads_left
             }
         
+        player_order = self.player_order
+        has_rolled_dice = self._by_player_id(self.has_rolled_dice)
+        
         serialized = {
             "vertices": {
                 str(vid): {
                     "vertex_id": v.vertex_id,
                     "building_type": v.building_type.value if v.building_type else None,
-                    "player_id": v.player_id
+                    "player_id": self.seat_ids[v.owner]
                 } for vid, v in self.vertices.items() if v.has_building()
             },
             "edges": {
                 str(eid): {
                     "edge_id": e.edge_id,
                     "has_road": e.has_road,
-                    "player_id": e.player_id
+                    "player_id": self.seat_ids[e.owner]
                 } for eid, e in self.edges.items() if e.has_road
             },
             "players": players_dict,
+            "board": {
+                "layout": self.layout.name,
+                "tiles": [
+                    {
+                        "tile_id": t.tile_id,
+                        "coords": self.layout.hexes[t.tile_id],
+                        "resource": t.resource.value if t.resource else None,
+                        "dice_number": t.dice_number,
+                        "has_robber": t.has_robber
+                    } for t in self.tiles.values()
+                ]
+            },
             "phase": self.phase.value,
             "current_player_index": self.current_player_index,
-            "player_order": self.player_order,
+            "player_order": player_order,
             "setup_round": self.setup_round,
-            "setup_progress": self.setup_progress,
+            "setup_progress": self._by_player_id(self.setup_progress),
+            "expected_income": self._by_player_id(self.expected_income),
             
             # ✅ DODAJ TEN STAN - kluczowe dla kontroli przycisków
-            "has_rolled_dice": getattr(self, 'has_rolled_dice', {}),
+            "has_rolled_dice": has_rolled_dice,
             
             'is_game_over': self.is_game_over(),
             'winner': self.winner.player_id if hasattr(self, 'winner') and self.winner else None,
@@ -482,11 +573,19 @@ class SimpleGameState:
         }
         
         print(f"   Serialized players dict: {players_dict}")
-        print(f"   Player order: {self.player_order}")
-        print(f"   Has rolled dice: {getattr(self, 'has_rolled_dice', {})}")  # Debug
+        print(f"   Player order: {player_order}")
+        print(f"   Has rolled dice: {has_rolled_dice}")  # Debug
         
         return serialized
     
+    def _by_player_id(self, per_seat: list) -> dict:
+        """Tablica seat -> wartość jako słownik UUID -> wartość (tylko obecni gracze)"""
+        return {
+            self.seat_ids[seat]: value
+            for seat, value in enumerate(per_seat)
+            if self.seat_players[seat] is not None
+        }
+    
     # Dodaj resztę metod (next_turn, advance_setup_turn, etc.)...
     
     def next_turn(self):
@@ -495,9 +594,9 @@ class SimpleGameState:
             # W setup: pierwszy round w przód, drugi w tył
             if self.setup_round == 1:
                 self.current_player_index += 1
-                if self.current_player_index >= len(self.player_order):
+                if self.current_player_index >= len(self.turn_order):
                     self.setup_round = 2
-                    self.current_player_index = len(self.player_order) - 1
+                    self.current_player_index = len(self.turn_order) - 1
             else:  # setup_round == 2
                 self.current_player_index -= 1
                 if self.current_player_index < 0:
@@ -506,16 +605,17 @@ class SimpleGameState:
                         self.current_player_index = 0
         else:
             # Normalna gra - zawsze w przód
-            self.current_player_index = (self.current_player_index + 1) % len(self.player_order)
+            self.current_player_index = (self.current_player_index + 1) % len(self.turn_order)
             self.phase = GamePhase.PLAYING
     
     
 
     def get_setup_progress(self, player_id: str) -> Dict[str, int]:
         """Pobierz postęp gracza w fazie setup"""
-        if player_id not in self.setup_progress:
-            self.setup_progress[player_id] = {"settlements": 0, "roads": 0}
-        return self.setup_progress[player_id]
+        seat = self._seat(player_id)
+        if seat < 0:
+            return {"settlements": 0, "roads": 0}
+        return self.setup_progress[seat]
 
     def can_player_build_settlement_in_setup(self, player_id: str) -> bool:
         """POPRAWIONA - Sprawdź czy gracz może budować osadę w setup"""
@@ -568,11 +668,11 @@ class SimpleGameState:
         if self.setup_round == 1:
             # Pierwsza runda: w przód (0->1->2->3)
             self.current_player_index += 1
-            if self.current_player_index >= len(self.player_order):
+            if self.current_player_index >= len(self.turn_order):
                 # Koniec pierwszej rundy, rozpocznij drugą rundę
                 print("🔄 Ending round 1, starting round 2")
                 self.setup_round = 2
-                self.current_player_index = len(self.player_order) - 1  # Zacznij od ostatniego gracza
+                self.current_player_index = len(self.turn_order) - 1  # Zacznij od ostatniego gracza
         else:  # setup_round == 2
             # Druga runda: w tył (3->2->1->0)
             self.current_player_index -= 1
@@ -585,8 +685,8 @@ class SimpleGameState:
                     self.current_player_index = 0  # Rozpocznij grę od pierwszego gracza
                     
                     # Zresetuj flagi rzutu kości dla wszystkich graczy
-                    for player_id in self.player_order:
-                        self.has_rolled_dice[player_id] = False
+                    for seat in self.turn_order:
+                        self.has_rolled_dice[seat] = False
                 else:
                     # Coś poszło nie tak, resetuj
                     print("❌ Setup not complete, resetting to first player")
@@ -597,54 +697,14 @@ class SimpleGameState:
         print(f"Current player: {current_player.player_id[:8]}")
         print("=== END ADVANCE ===\n")
 
-    def distribute_resources_for_dice_roll(self, dice_value: int):
-      """Rozdaj surowce za rzut kością - dla głównej gry"""
-      print(f"\n=== DISTRIBUTING RESOURCES FOR DICE {dice_value} ===")
-      
-      # Znajdź wszystkie kafelki z tym numerem bez robbera
-      active_tiles = []
-      for tile_id, tile in self.tiles.items():
-          if tile.dice_number == dice_value and not tile.has_robber and tile.resource is not None:
-              active_tiles.append(tile_id)
-      
-      print(f"Active tiles for dice {dice_value}: {active_tiles}")
-      
-      # Dla każdego aktywnego kafelka, znajdź sąsiadujące osady/miasta
-      for tile_id in active_tiles:
-          tile = self.tiles[tile_id]
-          print(f"\nProcessing tile {tile_id} ({tile.resource.value})")
-          
-          # Znajdź wszystkie wierzchołki sąsiadujące z tym kafelkiem
-          vertices_for_tile = []
-          for vertex_id, adjacent_tiles in self.vertex_to_tiles.items():
-              if tile_id in adjacent_tiles:
-                  vertices_for_tile.append(vertex_id)
-          
-          print(f"  Vertices adjacent to tile {tile_id}: {vertices_for_tile}")
-          
-          # Sprawdź które wierzchołki mają budynki
-          for vertex_id in vertices_for_tile:
-              vertex = self.vertices[vertex_id]
-              if vertex.has_building() and vertex.player_id:
-                  player = self.players[vertex.player_id]
-                  
-                  # Daj surowce: 1 za osadę, 2 za miasto
-                  resource_amount = 2 if vertex.building_type == BuildingType.CITY else 1
-                  player.resources.add(tile.resource, resource_amount)
-                  
-                  building_type = "CITY" if vertex.building_type == BuildingType.CITY else "SETTLEMENT"
-                  print(f"    -> Player {vertex.player_id} gets {resource_amount} {tile.resource.value} from {building_type} at vertex {vertex_id}")
-      
-      print("=== END RESOURCE DISTRIBUTION ===\n")
-
     def is_setup_complete(self) -> bool:
         """Sprawdź czy setup jest zakończony - wszyscy gracze mają 2 osady i 2 drogi"""
         print("🔍 Checking if setup is complete:")
-        for player_id in self.player_order:
-            progress = self.setup_progress.get(player_id, {"settlements": 0, "roads": 0})
-            print(f"  Player {player_id[:8]}: settlements={progress['settlements']}, roads={progress['roads']}")
+        for seat in self.turn_order:
+            progress = self.setup_progress[seat]
+            print(f"  Seat {seat}: settlements={progress['settlements']}, roads={progress['roads']}")
             if progress["settlements"] < 2 or progress["roads"] < 2:
-                print(f"  ❌ Player {player_id[:8]} not complete")
+                print(f"  ❌ Seat {seat} not complete")
                 return False
         print("✅ All players completed setup!")
         return True
@@ -659,7 +719,7 @@ class SimpleGameState:
       
       # SPRAWDŹ czy już dawano surowce (zabezpieczenie)
       if hasattr(self, '_initial_resources_given'):
-          if player_id in self._initial_resources_given:
+          if player.seat in self._initial_resources_given:
               print(f"WARNING: Initial resources already given to {player_id}")
               return
       else:
@@ -696,7 +756,7 @@ class SimpleGameState:
               print(f"  WARNING: Tile {tile_id} not found in tiles dict")
       
       # Zaznacz że dano surowce
-      self._initial_resources_given.add(player_id)
+      self._initial_resources_given.add(player.seat)
       
       print(f"Player {player_id} received: {resources_given}")
       print(f"Final resources: Wood={player.resources.wood}, Brick={player.resources.brick}, Sheep={player.resources.sheep}, Wheat={player.resources.wheat}, Ore={player.resources.ore}")
@@ -706,39 +766,31 @@ class SimpleGameState:
       """Rozdaj surowce za rzut kością - dla głównej gry"""
       print(f"\n=== DISTRIBUTING RESOURCES FOR DICE {dice_value} ===")
       
-      # Znajdź wszystkie kafelki z tym numerem bez robbera
-      active_tiles = []
-      for tile_id, tile in self.tiles.items():
-          if tile.dice_number == dice_value and not tile.has_robber and tile.resource is not None:
-              active_tiles.append(tile_id)
+      # Kafelki z tym numerem bez robbera - z indeksu numer -> kafelki
+      active_tiles = [
+          tile_id for tile_id in self.tiles_by_number.get(dice_value, [])
+          if not self.tiles[tile_id].has_robber and self.tiles[tile_id].resource is not None
+      ]
       
       print(f"Active tiles for dice {dice_value}: {active_tiles}")
       
-      # Dla każdego aktywnego kafelka, znajdź sąsiadujące osady/miasta
+      # Dla każdego aktywnego kafelka sprawdź tylko jego wierzchołki (tile -> vertices)
       for tile_id in active_tiles:
           tile = self.tiles[tile_id]
           print(f"\nProcessing tile {tile_id} ({tile.resource.value})")
           
-          # Znajdź wszystkie wierzchołki sąsiadujące z tym kafelkiem
-          vertices_for_tile = []
-          for vertex_id, adjacent_tiles in self.vertex_to_tiles.items():
-              if tile_id in adjacent_tiles:
-                  vertices_for_tile.append(vertex_id)
-          
-          print(f"  Vertices adjacent to tile {tile_id}: {vertices_for_tile}")
-          
-          # Sprawdź które wierzchołki mają budynki
-          for vertex_id in vertices_for_tile:
+          for vertex_id in self.tile_to_vertices.get(tile_id, []):
               vertex = self.vertices[vertex_id]
-              if vertex.has_building() and vertex.player_id:
-                  player = self.players[vertex.player_id]
-                  
+              if not vertex.has_building():
+                  continue
+              player = self.seat_players[vertex.owner]
+              if player is not None:
                   # Daj surowce: 1 za osadę, 2 za miasto
                   resource_amount = 2 if vertex.building_type == BuildingType.CITY else 1
                   player.resources.add(tile.resource, resource_amount)
                   
                   building_type = "CITY" if vertex.building_type == BuildingType.CITY else "SETTLEMENT"
-                  print(f"    -> Player {vertex.player_id} gets {resource_amount} {tile.resource.value} from {building_type} at vertex {vertex_id}")
+                  print(f"    -> Seat {vertex.owner} gets {resource_amount} {tile.resource.value} from {building_type} at vertex {vertex_id}")
       
       print("=== END RESOURCE DISTRIBUTION ===\n")
 
@@ -746,8 +798,9 @@ class SimpleGameState:
         """Znajdź ID ostatnio postawionej osady przez gracza"""
         # W prawdziwej implementacji śledziłbyś kolejność budowania
         # Na razie zwróć pierwsze znalezione
+        seat = self._seat(player_id)
         for vertex_id, vertex in self.vertices.items():
-            if vertex.has_building() and vertex.player_id == player_id:
+            if vertex.has_building() and vertex.owner == seat:
                 return vertex_id
         return None
     
@@ -756,58 +809,34 @@ class SimpleGameState:
     def end_turn(self):
         """Zakończ turę i przejdź do następnego gracza"""
         if self.phase == GamePhase.PLAYING:
-            self.current_player_index = (self.current_player_index + 1) % len(self.player_order)
+            self.current_player_index = (self.current_player_index + 1) % len(self.turn_order)
             # ✅ ZOSTAŃ w fazie PLAYING - nie zmieniaj na ROLL_DICE
             print(f"Turn ended, next player index: {self.current_player_index}, phase: {self.phase}")
 
     def has_player_rolled_dice(self, player_id: str) -> bool:
         """Sprawdź czy gracz już rzucił kośćmi w tej turze"""
-        if not hasattr(self, 'has_rolled_dice'):
-            self.has_rolled_dice = {}
-        return self.has_rolled_dice.get(player_id, False)
+        seat = self._seat(player_id)
+        return seat >= 0 and self.has_rolled_dice[seat]
 
     def mark_player_rolled_dice(self, player_id: str):
         """Oznacz że gracz rzucił kośćmi"""
-        if not hasattr(self, 'has_rolled_dice'):
-            self.has_rolled_dice = {}
-        self.has_rolled_dice[player_id] = True
+        seat = self._seat(player_id)
+        if seat >= 0:
+            self.has_rolled_dice[seat] = True
 
     def reset_player_dice_roll(self, player_id: str):
         """Resetuj flagę rzutu kości dla gracza"""
-        if not hasattr(self, 'has_rolled_dice'):
-            self.has_rolled_dice = {}
-        self.has_rolled_dice[player_id] = False
+        seat = self._seat(player_id)
+        if seat >= 0:
+            self.has_rolled_dice[seat] = False
 
 
     def debug_vertex_mapping(self):
         """Debug: Pokaż mapowanie wierzchołków"""
         print("=== VERTEX MAPPING DEBUG ===")
         
-        # Pokaż hex_order_frontend
-        hex_order_frontend = [
-            (0, 0, 0),     # index 0 - desert
-            (0, -2, 2),    # index 1 - wood, dice 6  
-            (1, -2, 1),    # index 2 - sheep, dice 3
-            (2, -2, 0),    # index 3 - sheep, dice 8
-            (-1, -1, 2),   # index 4 - wheat, dice 2
-            (0, -1, 1),    # index 5 - ore, dice 4
-            (1, -1, 0),    # index 6 - wheat, dice 5
-            (2, -1, -1),   # index 7 - wood, dice 10
-            (-2, 0, 2),    # index 8 - wood, dice 5
-            (-1, 0, 1),    # index 9 - brick, dice 9
-            (1, 0, -1),    # index 10 - ore, dice 6
-            (2, 0, -2),    # index 11 - wheat, dice 9
-            (-2, 1, 1),    # index 12 - wheat, dice 10
-            (-1, 1, 0),    # index 13 - ore, dice 11
-            (0, 1, -1),    # index 14 - wood, dice 3
-            (1, 1, -2),    # index 15 - sheep, dice 12
-            (-2, 2, 0),    # index 16 - brick, dice 8
-            (-1, 2, -1),   # index 17 - sheep, dice 4
-            (0, 2, -2),    # index 18 - brick, dice 11
-        ]
-        
-        print("Hex order (backend):")
-        for i, (q, r, s) in enumerate(hex_order_frontend):
+        print(f"Hex order (backend, layout={self.layout.name}):")
+        for i, (q, r, s) in enumerate(self.layout.hexes):
             print(f"  {i}: ({q}, {r}, {s})")
         
         print("\nVertex to tiles mapping (first 30):")
@@ -861,10 +890,11 @@ class SimpleGameState:
         vertex = self.vertices[vertex_id]
         
         # Musi być osada tego gracza
-        if vertex.building_type != BuildingType.SETTLEMENT or vertex.player_id != player_id:
+        seat = self._seat(player_id)
+        if vertex.building_type != BuildingType.SETTLEMENT or not vertex.is_owned_by(seat):
             return False
         
-        player = self.players[player_id]
+        player = self.seat_players[seat]
         
         # Sprawdź czy gracz może sobie pozwolić na miasto
         if not player.can_afford_city():
@@ -875,6 +905,7 @@ class SimpleGameState:
         
         # Zmień budynek na miasto
         vertex.building_type = BuildingType.CITY
+        self._update_expected_income(vertex_id, seat, 1)
         
         print(f"✅ Player {player_id} upgraded settlement to city at vertex {vertex_id}")
         return True
@@ -894,10 +925,10 @@ class SimpleGameState:
             print(f"   Player {player_id[:8]} received 5 of each resource")
 
     def check_victory(self, player: SimplePlayer) -> bool:
-        """Sprawdź czy gracz wygrał (ma >= 10 punktów zwycięstwa)"""
+        """Sprawdź czy gracz wygrał (ma >= WIN_VICTORY_POINTS punktów zwycięstwa)"""
         total_points = self.get_player_victory_points(player)
         print(f"🏆 Checking victory for {player.display_name}: {total_points} points")
-        return total_points >= 4
+        return total_points >= WIN_VICTORY_POINTS
     
     def get_player_victory_points(self, player: SimplePlayer) -> int:
         """Oblicz łączne punkty zwycięstwa gracza"""
@@ -914,7 +945,7 @@ class SimpleGameState:
         return total
     
     def is_game_over(self) -> bool:
-        """Sprawdź czy gra się skończyła (któryś gracz ma >= 10 punktów)"""
+        """Sprawdź czy gra się skończyła (któryś gracz ma >= WIN_VICTORY_POINTS punktów)"""
         for player_id, player in self.players.items():
             if self.check_victory(player):
                 return True
@@ -982,19 +1013,19 @@ class SimpleGameState:
         """Rozpocznij turę dla gracza"""
         if self.phase == GamePhase.PLAYING:
             # W normalnej grze resetuj flagę rzutu kości
-            self.has_rolled_dice[player_id] = False
+            self.reset_player_dice_roll(player_id)
             print(f"🎮 Started turn for player {player_id[:8]} - must roll dice first")
     
     def handle_dice_roll(self, player_id: str, dice_result: int):
         """Obsłuż rzut kostką"""
         if not self.can_roll_dice(player_id):
-            if self.has_rolled_dice.get(player_id, False):
+            if self.has_player_rolled_dice(player_id):
                 raise ValueError("Player has already rolled dice this turn")
             else:
                 raise ValueError("Player cannot roll dice right now")
         
         # Ustaw że gracz rzucił kośćmi
-        self.has_rolled_dice[player_id] = True
+        self.mark_player_rolled_dice(player_id)
         
         # Rozdaj zasoby
         if dice_result == 7:
@@ -1015,7 +1046,7 @@ class SimpleGameState:
             return False
         
         # Nie może rzucić jeśli już rzucił w tej turze
-        return not self.has_rolled_dice.get(player_id, False)
+        return not self.has_player_rolled_dice(player_id)
     
     def can_take_actions(self, player_id: str) -> bool:
         """Sprawdź czy gracz może budować/handlować w normalnej grze"""
@@ -1024,7 +1055,7 @@ class SimpleGameState:
         
         if self.phase == GamePhase.PLAYING:
             return (self.is_current_player(player_id) and 
-                    self.has_rolled_dice.get(player_id, False))
+                    self.has_player_rolled_dice(player_id))
         
         return False
         
@@ -1042,10 +1073,10 @@ class SimpleGameState:
                 raise ValueError("Cannot end turn - must roll dice first")
             
             # Wyczyść flagę rzutu kości
-            self.has_rolled_dice[current_player.player_id] = False
+            self.has_rolled_dice[current_player.seat] = False
             
             # Przejdź do następnego gracza
-            self.current_player_index = (self.current_player_index + 1) % len(self.player_order)
+            self.current_player_index = (self.current_player_index + 1) % len(self.turn_order)
             new_current_player = self.get_current_player()
             
             print(f"🔄 Turn ended, next player: {new_current_player.player_id[:8]}")
@@ -1070,15 +1101,14 @@ class SimpleGameState:
             return False
         
         # Musi najpierw rzucić kostką
-        return self.has_rolled_dice.get(player_id, False)
+        return self.has_player_rolled_dice(player_id)
 
     def is_current_player(self, player_id: str) -> bool:
         """Sprawdź czy to tura danego gracza"""
-        if not self.player_order:
+        if not self.turn_order:
             return False
         
-        current_player_id = self.player_order[self.current_player_index]
-        return current_player_id == player_id
+        return self.turn_order[self.current_player_index] == self._seat(player_id)
         
 
     
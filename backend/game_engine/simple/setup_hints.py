@@ -0,0 +1,106 @@
+# backend/game_engine/simple/setup_hints.py
+# Podpowiedzi miejsc na osady w fazie setup - oceny liczone raz na planszę
+
+import heapq
+from typing import Dict, FrozenSet, List, Tuple
+
+from game_engine.simple.geometry import BoardLayout
+
+# Liczba "kropek" na żetonie = na ile z 36 kombinacji dwóch kości wypada dana suma
+DICE_PIPS = {2: 1, 3: 2, 4: 3, 5: 4, 6: 5, 8: 5, 9: 4, 10: 3, 11: 2, 12: 1}
+
+DIVERSITY_WEIGHT = 2      # premia za każdy różny surowiec przy wierzchołku
+NEW_RESOURCE_WEIGHT = 1   # premia za surowiec, którego gracz jeszcze nie zbiera
+MAX_TILES_PER_SPOT = 3
+
+DEFAULT_HINT_LIMIT = 5
+MAX_HINT_LIMIT = 10
+
+
+class SetupHintIndex:
+    """
+    Ranking miejsc na osady dla jednej planszy.
+
+    Miejsca (fizyczne rogi) i ich sąsiedztwo pochodzą z BoardLayout. Ocenę bazową liczymy raz
+    w konstruktorze, a przy każdej postawionej osadzie tylko oznaczamy miejsce i sąsiadów
+    jako zablokowane.
+    """
+
+    def __init__(self, layout: BoardLayout, tiles: Dict[int, object]):
+        self.vertex_spot: Dict[int, int] = layout.vertex_spot
+        self.spot_vertices: List[List[int]] = layout.spot_vertices
+        self.spot_neighbors: List[List[int]] = layout.spot_neighbors
+        vertex_to_tiles = layout.vertex_to_tiles
+
+        # Ocena bazowa: suma kropek + premia za różnorodność surowców
+        self.spot_pips: List[int] = []
+        self.spot_resources: List[FrozenSet[str]] = []
+        self.spot_tiles: List[List[int]] = []
+        self.spot_score: List[int] = []
+        for vertices in self.spot_vertices:
+            tile_ids = vertex_to_tiles.get(vertices[0], [])
+            pips = 0
+            resources = set()
+            for tile_id in tile_ids:
+                tile = tiles.get(tile_id)
+                if tile is None or tile.resource is None:
+                    continue
+                pips += DICE_PIPS.get(tile.dice_number, 0)
+                resources.add(tile.resource.value)
+            self.spot_tiles.append(list(tile_ids))
+            self.spot_pips.append(pips)
+            self.spot_resources.append(frozenset(resources))
+            self.spot_score.append(pips + DIVERSITY_WEIGHT * len(resources))
+
+        self.ranking: List[int] = sorted(range(layout.spot_count), key=lambda s: (-self.spot_score[s], s))
+        self.blocked: List[bool] = [False] * layout.spot_count
+
+    def mark_settlement(self, vertex_id: int):
+        """Zablokuj miejsce z nową osadą i sąsiednie rogi (zasada odległości)"""
+        spot = self.vertex_spot.get(vertex_id)
+        if spot is None:
+            return
+        self.blocked[spot] = True
+        for neighbor in self.spot_neighbors[spot]:
+            self.blocked[neighbor] = True
+
+    def is_available(self, vertex_id: int) -> bool:
+        spot = self.vertex_spot.get(vertex_id)
+        return spot is not None and not self.blocked[spot]
+
+    def top(self, limit: int = DEFAULT_HINT_LIMIT, owned_resources: FrozenSet[str] = frozenset()) -> List[dict]:
+        """
+        Zwróć `limit` najlepszych wolnych miejsc.
+
+        Ranking bazowy jest posortowany, a premia za nowe surowce jest ograniczona z góry,
+        więc przeglądanie kończymy, gdy nawet maksymalna premia nie przebije ostatniego wyniku.
+        """
+        limit = max(1, min(limit, MAX_HINT_LIMIT))
+        max_bonus = NEW_RESOURCE_WEIGHT * MAX_TILES_PER_SPOT if owned_resources else 0
+
+        best: List[Tuple[int, int, int]] = []  # min-heap (wynik, -spot, premia)
+        for spot in self.ranking:
+            if self.blocked[spot]:
+                continue
+            base = self.spot_score[spot]
+            if len(best) == limit and base + max_bonus < best[0][0]:
+                break
+            bonus = NEW_RESOURCE_WEIGHT * len(self.spot_resources[spot] - owned_resources) if owned_resources else 0
+            entry = (base + bonus, -spot, bonus)
+            if len(best) < limit:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+
+        hints = []
+        for score, neg_spot, bonus in sorted(best, reverse=True):
+            spot = -neg_spot
+            hints.append({
+                'vertex_id': self.spot_vertices[spot][0],
+                'score': score,
+                'pips': self.spot_pips[spot],
+                'resources': sorted(self.spot_resources[spot]),
+                'new_resources': bonus // NEW_RESOURCE_WEIGHT if NEW_RESOURCE_WEIGHT else 0,
+                'tiles': self.spot_tiles[spot],
+            })
+        return hints
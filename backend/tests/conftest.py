@@ -0,0 +1,35 @@
+import pytest
+from django.core.cache import caches
+from game_api import game_cache
+from game_engine.simple.models import SimpleGameState
+
+@pytest.fixture(autouse=True)
+def clear_game_cache():
+    """Identyfikatory gier wracają po wycofaniu transakcji testu - cache odpowiedzi nie może przeżyć testu"""
+    caches[game_cache.CACHE_ALIAS].clear()
+
+def make_finished_game(names=("Ala", "Bartek"), winner=0, points=None, resources=None, dice=None, turns=None):
+    """
+    Zakończona gra: `winner` (miejsce albo nazwa) ma punkty na zwycięstwo, albo punkty wprost z `points`.
+    `resources(i)` -> {surowiec: ilość} gracza na miejscu i; `dice`/`turns` tylko, gdy podane.
+    """
+    state = SimpleGameState()
+    for i, name in enumerate(names):
+        state.add_player(f"{i:08d}-0000-0000-0000-000000000000", f"color{i}", name)
+        for resource, amount in (resources(i) if resources else {}).items():
+            setattr(state.seat_players[i].resources, resource, amount)
+    if points is None:
+        state.seat_players[names.index(winner) if isinstance(winner, str) else winner].victory_points = 4
+    else:
+        for player, vp in zip(state.seat_players, points):
+            player.victory_points = vp
+    if dice is not None:
+        state.dice_distribution = dice
+    if turns is not None:
+        state.current_turn = turns
+    return state
+
+@pytest.fixture
+def finished_game():
+    """Fabryka zakończonych gier (make_finished_game); moduł może ją nadpisać własnymi domyślnymi"""
+    return make_finished_game
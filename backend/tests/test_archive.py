@@ -0,0 +1,99 @@
+import datetime
+import gzip
+import io
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.utils import timezone
+from game_api import partitions
+from game_api.game_saver import GameSaver
+from game_api.models import ArchivedMonth, DailyGameStats, Game, GamePlayer, UserStats
+
+User = get_user_model()
+
+@pytest.fixture
+def save_game(finished_game):
+    """Zapisana gra z podanym start_time"""
+    def save(names, start_time):
+        game = GameSaver.save_completed_game(finished_game(names))
+        Game.objects.filter(pk=game.pk).update(start_time=start_time)
+        GamePlayer.objects.filter(game_id=game.pk).update(start_time=start_time)
+        return game
+    return save
+
+def test_month_arithmetic():
+    """Test czy przesuwanie miesięcy przechodzi przez granicę roku"""
+    assert partitions.add_months(datetime.date(2025, 11, 1), 3) == datetime.date(2026, 2, 1)
+    assert partitions.add_months(datetime.date(2025, 1, 1), -13) == datetime.date(2023, 12, 1)
+    assert partitions.partition_name("games", datetime.date(2024, 3, 1)) == "games_2024_03"
+
+@pytest.mark.django_db
+def test_old_months_are_exported_and_removed(tmp_path, save_game):
+    """Test czy gry sprzed okna retencji trafiają do pliku gzip i znikają z bazy, a nowsze zostają"""
+    User.objects.create_user(username="ala", email="ala@x.pl", display_name="Ala")
+    old_month = partitions.add_months(partitions.month_start(timezone.localdate()), -14)
+    old_time = timezone.make_aware(datetime.datetime.combine(old_month, datetime.time(12)))
+    if partitions.is_supported():
+        with connection.cursor() as cursor:
+            for table in partitions.TABLES:
+                partitions._create_month(table, old_month, cursor)
+    old = save_game(["Ala", "Bartek"], old_time)
+    recent = save_game(["Ala", "Celina", "Darek"], timezone.now())
+
+    call_command("archive_games", "--retention-months", "12", "--dir", str(tmp_path), stdout=io.StringIO())
+
+    archive = tmp_path / f"games_{old_month:%Y_%m}.ndjson.gz"
+    records = [json.loads(line) for line in gzip.decompress(archive.read_bytes()).splitlines()]
+    assert {r["game_id"] for r in records} == {old.id}
+    assert [r["won"] for r in records] == [True, False]
+    assert list(Game.objects.values_list("id", flat=True)) == [recent.id]
+    assert GamePlayer.objects.filter(game_id=old.id).count() == 0
+    assert not list(tmp_path.glob("*.partial"))
+    if partitions.is_supported():
+        with connection.cursor() as cursor:
+            assert old_month not in [month for _, month in partitions.monthly_partitions("games", cursor)]
+
+@pytest.mark.django_db
+def test_rebuilds_respect_archived_months(tmp_path, save_game):
+    """Test czy po archiwizacji przebudowy nie gubią starych miesięcy: rollupy od granicy, pełne przeliczenia odmowa"""
+    old_month = partitions.add_months(partitions.month_start(timezone.localdate()), -14)
+    if partitions.is_supported():
+        with connection.cursor() as cursor:
+            for table in partitions.TABLES:
+                partitions._create_month(table, old_month, cursor)
+    save_game(["Ala", "Bartek"], timezone.make_aware(datetime.datetime.combine(old_month, datetime.time(12))))
+    save_game(["Ala", "Celina"], timezone.now())
+    call_command("backfill_daily_stats", stdout=io.StringIO())  # save_game przestawia start_time po zapisie
+    call_command("archive_games", "--retention-months", "12", "--dir", str(tmp_path), stdout=io.StringIO())
+    assert ArchivedMonth.objects.get().month == old_month
+    assert ArchivedMonth.retained_since() == partitions.add_months(old_month, 1)
+    rollups = sorted(DailyGameStats.objects.values_list("day", "games"))
+    assert len(rollups) == 2
+
+    call_command("backfill_daily_stats", stdout=io.StringIO())
+    assert sorted(DailyGameStats.objects.values_list("day", "games")) == rollups
+    with pytest.raises(CommandError):
+        call_command("backfill_daily_stats", "--since", f"{old_month}", stdout=io.StringIO())
+
+    ratings = dict(UserStats.objects.values_list("user_id", "rating"))
+    for command in ("recompute_ratings", "backfill_user_stats"):
+        with pytest.raises(CommandError):
+            call_command(command, stdout=io.StringIO())
+    assert dict(UserStats.objects.values_list("user_id", "rating")) == ratings
+    assert UserStats.objects.get(user__display_name="Ala").total_games == 2
+
+    call_command("backfill_user_stats", "--ignore-archive", stdout=io.StringIO())
+    assert UserStats.objects.get(user__display_name="Ala").total_games == 1
+
+@pytest.mark.django_db
+def test_dry_run_keeps_data(tmp_path, save_game):
+    """Test czy --dry-run niczego nie usuwa ani nie zapisuje"""
+    save_game(["Ala", "Bartek"], timezone.now() - datetime.timedelta(days=800))
+    call_command("archive_games", "--retention-months", "12", "--dir", str(tmp_path), "--dry-run",
+                 stdout=io.StringIO())
+    assert Game.objects.count() == 1
+    assert not list(tmp_path.iterdir())
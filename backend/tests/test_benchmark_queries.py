@@ -0,0 +1,23 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from game_api.models import Game, GamePlayer
+
+@pytest.mark.django_db
+def test_benchmark_reports_both_runs_and_rolls_back():
+    """Test czy benchmark mierzy zapytania bez i z indeksami i nie zostawia danych"""
+    out = io.StringIO()
+    with CaptureQueriesContext(connection) as ctx:
+        call_command("benchmark_queries", users=30, games=40, repeat=1, stdout=out)
+
+    output = out.getvalue()
+    assert "Bez indeksów" in output and "Z indeksami" in output
+    assert "users/{id}/games/ (deep page)" in output
+    assert Game.objects.count() == 0 and GamePlayer.objects.count() == 0
+
+    # Przebieg "bez indeksów" ma dawny indeks FK user_id (usunięty w 0006), przebieg "z indeksami" już nie
+    ddl = [q["sql"].split()[0] for q in ctx.captured_queries if "bench_game_players_user_idx" in q["sql"]]
+    assert ddl == ["CREATE", "DROP"]
@@ -0,0 +1,69 @@
+import pytest
+from collections import Counter
+import numpy as np
+from game_engine.simple import board_generator
+from game_engine.simple.board_generator import generate_board, RED_NUMBERS
+from game_engine.simple.geometry import get_layout
+from game_engine.simple.models import SimpleGameState
+
+@pytest.mark.parametrize("name", ["standard", "extended"])
+def test_generated_board_uses_layout_pools(name):
+    """Test czy wylosowana plansza ma dokładnie pule surowców i numerów układu"""
+    layout = get_layout(name)
+    board = generate_board(layout, seed=7)
+    assert [tile_id for tile_id, _, _ in board] == list(range(layout.tile_count))
+    assert Counter(res for _, res, _ in board) == Counter(
+        {res: count for res, count in layout.resource_counts.items()})
+    assert sorted(n for _, res, n in board if res is not None) == sorted(layout.number_tokens)
+    assert all(n == 0 for _, res, n in board if res is None)
+
+@pytest.mark.parametrize("name", ["standard", "extended", "hexagon_4"])
+def test_no_adjacent_red_numbers(name):
+    """Test czy 6 i 8 nigdy nie sąsiadują"""
+    layout = get_layout(name)
+    for seed in range(5):
+        numbers = {tile_id: n for tile_id, _, n in generate_board(layout, seed=seed)}
+        for a, b in layout.tile_adjacent_pairs:
+            assert not (numbers[a] in RED_NUMBERS and numbers[b] in RED_NUMBERS)
+
+def test_unseparable_board_raises(monkeypatch):
+    """Test czy generator zgłasza błąd zamiast zwracać planszę z sąsiadującymi 6/8"""
+    calls = []
+
+    def always_adjacent(layout, resources, numbers):
+        calls.append(len(resources))
+        return np.full(len(resources), np.inf)
+
+    monkeypatch.setattr(board_generator, "score_boards", always_adjacent)
+    with pytest.raises(ValueError):
+        generate_board(get_layout("standard"), candidates=10, seed=0)
+    # Każda runda: ocena losowania i ocena naprawionych kandydatów
+    assert len(calls) == 2 * board_generator.MAX_SAMPLE_ROUNDS
+
+def test_seed_is_deterministic():
+    """Test czy ten sam seed daje tę samą planszę"""
+    layout = get_layout("standard")
+    assert generate_board(layout, seed=3) == generate_board(layout, seed=3)
+
+def test_game_state_uses_generated_board():
+    """Test czy stan gry buduje kafelki z wylosowanej planszy"""
+    layout = get_layout("standard")
+    board = generate_board(layout, seed=1)
+    state = SimpleGameState(layout=layout, tile_data=board)
+    for tile_id, res, number in board:
+        tile = state.tiles[tile_id]
+        assert (tile.resource.name if tile.resource else None) == res
+        if res is not None:
+            assert tile.dice_number == number
+
+@pytest.mark.parametrize("layout", ["hexagon_6", "hexagon_100000", "nieznany"])
+def test_create_room_rejects_layout_outside_whitelist(client, monkeypatch, layout):
+    """Test czy create_room odrzuca (400) układ spoza listy, zanim zacznie losować planszę"""
+    monkeypatch.setattr(board_generator, "generate_board", lambda *args, **kwargs: pytest.fail("board generated"))
+    response = client.get("/api/room/create/", {"board": "random", "layout": layout})
+    assert response.status_code == 400
+
+def test_create_room_reserves_random_board(client):
+    """Test czy create_room losuje planszę dla układu z listy"""
+    response = client.get("/api/room/create/", {"board": "random", "layout": "hexagon_3"})
+    assert response.status_code == 200 and response.json()["layout"] == "hexagon_3"
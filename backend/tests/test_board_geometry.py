@@ -0,0 +1,82 @@
+import pytest
+from game_engine.simple.geometry import MAX_HEXAGON_RADIUS, get_layout, hexagon_layout
+from game_engine.simple.models import SimpleGameState
+
+FRONTEND_HEX_ORDER = [
+    (0, 0, 0), (0, -2, 2), (1, -2, 1), (2, -2, 0),
+    (-1, -1, 2), (0, -1, 1), (1, -1, 0), (2, -1, -1),
+    (-2, 0, 2), (-1, 0, 1), (1, 0, -1), (2, 0, -2),
+    (-2, 1, 1), (-1, 1, 0), (0, 1, -1), (1, 1, -2),
+    (-2, 2, 0), (-1, 2, -1), (0, 2, -2)
+]
+
+def test_standard_layout_matches_frontend():
+    """Test czy standardowy układ ma kolejność heksów jak frontend i 114 ID wierzchołków"""
+    layout = get_layout("standard")
+    assert list(layout.hexes) == FRONTEND_HEX_ORDER
+    assert layout.vertex_count == 114
+    assert layout.edge_count == 114
+    assert layout.spot_count == 54
+    assert len(layout.edge_spot_ids) == 72
+
+@pytest.mark.parametrize("name, tiles, corners", [
+    ("standard", 19, 54),
+    ("extended", 30, 80),
+    ("hexagon_3", 37, 96),
+])
+def test_layout_sizes(name, tiles, corners):
+    """Test rozmiarów układów"""
+    layout = get_layout(name)
+    assert layout.tile_count == tiles
+    assert layout.spot_count == corners
+    assert sum(layout.resource_counts.values()) == tiles
+    assert len(layout.number_tokens) == tiles - layout.resource_counts[None]
+
+def test_layouts_are_cached():
+    """Test czy tabele są liczone raz na układ"""
+    assert get_layout("extended") is get_layout("extended")
+    assert get_layout("standard") is hexagon_layout(2)
+
+@pytest.mark.parametrize("name", ["hexagon_0", f"hexagon_{MAX_HEXAGON_RADIUS + 1}", "hexagon_99999999", "hexagon_05",
+                                  "hexagon_", "huge"])
+def test_unknown_or_too_large_layout_is_rejected(name):
+    """Test czy układy spoza listy (np. ogromny heksagon z ?layout=) są odrzucane bez budowania tabel"""
+    with pytest.raises(ValueError):
+        get_layout(name)
+    assert get_layout.cache_info().maxsize is not None and hexagon_layout.cache_info().maxsize is not None
+    assert get_layout.cache_info().currsize <= get_layout.cache_info().maxsize
+
+def test_corner_aliases_and_neighbors():
+    """Test czy aliasy rogu mają te same kafelki, a każdy róg ma 2-3 sąsiadów"""
+    layout = get_layout("extended")
+    for spot, vertices in enumerate(layout.spot_vertices):
+        assert len({frozenset(layout.vertex_to_tiles[v]) for v in vertices}) == 1
+        assert 2 <= len(layout.spot_neighbors[spot]) <= 3
+
+def test_edge_connects_adjacent_corners():
+    """Test czy krawędź łączy dwa sąsiednie rogi"""
+    layout = get_layout("standard")
+    for edge_id, (a, b) in layout.edge_vertices.items():
+        assert layout.vertex_spot[b] in layout.spot_neighbors[layout.vertex_spot[a]]
+
+def test_game_state_accepts_layout():
+    """Test czy stan gry buduje planszę z podanego układu"""
+    state = SimpleGameState(layout=get_layout("extended"))
+    assert len(state.tiles) == 30
+    assert len(state.vertices) == 180
+    assert sum(1 for t in state.tiles.values() if t.resource is None) == 2
+    assert state.serialize()["board"]["layout"] == "extended"
+
+def test_payout_on_large_board():
+    """Test czy wypłata przez indeks tile->vertices zgadza się z planszą"""
+    state = SimpleGameState(layout=get_layout("extended"))
+    player_id = "aaaaaaaa-0000-0000-0000-000000000000"
+    state.add_player(player_id, "red", "Alice")
+
+    vertex_id = state.setup_hints.top(1)[0]["vertex_id"]
+    state.place_settlement(vertex_id, player_id, is_setup=True)
+
+    tile = state.tiles[state.vertex_to_tiles[vertex_id][0]]
+    state.distribute_resources_for_dice_roll(tile.dice_number)
+    assert state.players[player_id].resources.get_total() >= 1
+    assert getattr(state.players[player_id].resources, tile.resource.value.lower()) >= 1
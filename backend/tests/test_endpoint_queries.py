@@ -0,0 +1,81 @@
+import functools
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from game_api.game_saver import GameSaver
+
+User = get_user_model()
+
+@pytest.fixture
+def finished_game(finished_game):
+    """Każdy gracz ma drewno i cegłę"""
+    return functools.partial(finished_game, resources=lambda i: {"wood": i + 1, "brick": 2})
+
+def query_count(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(ctx.captured_queries), response.json()
+
+@pytest.fixture
+def client():
+    user = User.objects.create_user(username="ala", email="ala@x.pl", display_name="Ala")
+    client = APIClient()
+    client.force_authenticate(user)
+    client.user = user
+    return client
+
+@pytest.mark.django_db
+def test_game_players_query_count_is_constant(client, finished_game):
+    """Test czy szczegóły gry nie wykonują zapytania na gracza"""
+    small = GameSaver.save_completed_game(finished_game(["Ala", "Bartek"]))
+    large = GameSaver.save_completed_game(finished_game(["Ala", "Celina", "Darek", "Ewa"]))
+
+    small_count, _ = query_count(client, f"/api/games/{small.id}/players/")
+    large_count, data = query_count(client, f"/api/games/{large.id}/players/")
+    assert small_count == large_count == 2   # gra, gracze z użytkownikami i surowcami
+    assert data["players"][0]["won"]
+    assert {p["resources"]["wood"] for p in data["players"]} == {1, 2, 3, 4}
+
+@pytest.mark.django_db
+def test_user_games_query_count_is_constant(client, finished_game):
+    """Test czy historia gracza (także przez konto z tym samym display_name) ma stałą liczbę zapytań"""
+    GameSaver.save_completed_game(finished_game(["Ala", "Bartek"]))
+    few, _ = query_count(client, f"/api/users/{client.user.id}/games/")
+    for _ in range(4):
+        GameSaver.save_completed_game(finished_game(["Ala", "Bartek"]))
+    many, data = query_count(client, f"/api/users/{client.user.id}/games/")
+    assert few == many
+    assert len(data["results"]) == 5
+
+    # Konto bez gier -> gry z konta o tym samym display_name, jednym dodatkowym zapytaniem
+    twin = User.objects.create_user(username="ala2", email="ala2@x.pl", display_name="Ala")
+    fallback, data = query_count(client, f"/api/users/{twin.id}/games/")
+    assert fallback == many + 1
+    assert len(data["results"]) == 5
+
+@pytest.mark.django_db
+def test_resource_analysis_counts_players_holding_resource(client, finished_game):
+    """Test czy analiza surowców liczy sumę, średnią i liczbę graczy z niezerową ilością"""
+    GameSaver.save_completed_game(finished_game(["Ala", "Bartek", "Celina"]))
+    rows = {row["resource_type"]: row for row in client.get("/api/stats/resource_analysis/").json()}
+
+    assert set(rows) == {"wood", "brick"}
+    assert rows["wood"]["total_amount"] == 6 and rows["wood"]["count"] == 3
+    assert rows["brick"]["avg_amount"] == 2
+
+@pytest.mark.django_db
+def test_player_resources_rows_built_from_columns(client, finished_game):
+    """Test czy /api/player-resources/ zwraca dawne wiersze (gracz, surowiec, ilość) z kolumn GamePlayer"""
+    game = GameSaver.save_completed_game(finished_game(["Ala", "Bartek"]))
+    rows = client.get(f"/api/player-resources/?game_id={game.id}").json()["results"]
+    assert sorted((row["resource_type"], row["amount"]) for row in rows) == [
+        ("brick", 2), ("brick", 2), ("wood", 1), ("wood", 2)]
+
+    wood = client.get(f"/api/player-resources/?user_id={client.user.id}&resource_type=wood").json()["results"]
+    assert [(row["resource_type"], row["amount"]) for row in wood] == [("wood", 1)]
+    assert client.get("/api/player-resources/?resource_type=gold").json()["results"] == []
+    assert client.post("/api/player-resources/", {}).status_code == 405
@@ -0,0 +1,69 @@
+import pytest
+from game_engine.simple.models import SimpleGameState, BuildingType
+from game_engine.simple.setup_hints import DICE_PIPS
+
+PLAYER_A = "aaaaaaaa-0000-0000-0000-000000000000"
+PLAYER_B = "bbbbbbbb-0000-0000-0000-000000000000"
+
+def recompute_income(state):
+    """Pełne przeliczenie z planszy - punkt odniesienia dla wersji przyrostowej"""
+    income = [{res: 0 for res in row} if row is not None else None for row in state.expected_income]
+    for vertex_id, vertex in state.vertices.items():
+        if not vertex.has_building() or income[vertex.owner] is None:
+            continue
+        multiplier = 2 if vertex.building_type == BuildingType.CITY else 1
+        for tile_id in state.vertex_to_tiles[vertex_id]:
+            tile = state.tiles[tile_id]
+            if tile.resource is None or tile.has_robber:
+                continue
+            income[vertex.owner][tile.resource.value.lower()] += DICE_PIPS.get(tile.dice_number, 0) * multiplier
+    return income
+
+@pytest.fixture
+def game_state():
+    state = SimpleGameState()
+    state.add_player(PLAYER_A, "red", "Alice")
+    state.add_player(PLAYER_B, "blue", "Bob")
+    return state
+
+def test_income_starts_empty(game_state):
+    """Test czy nowy gracz ma zerowy oczekiwany dochód"""
+    assert all(v == 0 for v in game_state.expected_income[game_state.seat_of[PLAYER_A]].values())
+
+def test_settlement_and_city_update_income(game_state):
+    """Test czy osada i miasto aktualizują macierz dochodu"""
+    game_state.place_settlement(21, PLAYER_A, is_setup=True)
+    game_state.place_settlement(50, PLAYER_B, is_setup=True)
+    assert game_state.expected_income == recompute_income(game_state)
+
+    game_state.seed_resources_for_testing()
+    assert game_state.place_city(21, PLAYER_A)
+    assert game_state.expected_income == recompute_income(game_state)
+    assert sum(game_state.expected_income[game_state.seat_of[PLAYER_A]].values()) == 2 * game_state.setup_hints.spot_pips[
+        game_state.setup_hints.vertex_spot[21]]
+
+def test_robber_move_updates_income(game_state):
+    """Test czy przesunięcie robbera odejmuje i oddaje dochód"""
+    game_state.place_settlement(21, PLAYER_A, is_setup=True)
+    before = {res: v for res, v in game_state.expected_income[game_state.seat_of[PLAYER_A]].items()}
+
+    tile_id = game_state.vertex_to_tiles[21][0]
+    assert game_state.move_robber(tile_id)
+    assert game_state.expected_income == recompute_income(game_state)
+    assert game_state.expected_income[game_state.seat_of[PLAYER_A]] != before
+
+    assert game_state.move_robber(0)
+    assert game_state.expected_income[game_state.seat_of[PLAYER_A]] == before
+
+def test_income_in_serialized_state(game_state):
+    """Test czy macierz dochodu trafia do serializowanego stanu"""
+    game_state.place_settlement(21, PLAYER_A, is_setup=True)
+    serialized = game_state.serialize()
+    assert serialized["expected_income"][PLAYER_A] == game_state.expected_income[game_state.seat_of[PLAYER_A]]
+
+def test_removed_player_has_no_income_row(game_state):
+    """Test czy usunięty gracz znika z macierzy dochodu"""
+    game_state.remove_player(PLAYER_B)
+    assert game_state.expected_income[game_state.seat_of[PLAYER_B]] is None
+    assert PLAYER_B not in game_state.player_order
+    assert PLAYER_B not in game_state.serialize()["expected_income"]
@@ -0,0 +1,108 @@
+import csv
+import functools
+import gzip
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from game_api.game_saver import GameSaver
+from game_api import export
+from game_api.models import Game, GamePlayer
+
+User = get_user_model()
+
+@pytest.fixture
+def finished_game(finished_game):
+    """Ruda według miejsca gracza"""
+    return functools.partial(finished_game, resources=lambda i: {"ore": i})
+
+@pytest.fixture
+def games(finished_game):
+    ala = User.objects.create_user(username="ala", email="ala@x.pl", display_name="Ala")
+    User.objects.create_user(username="bartek", email="b@x.pl", display_name="Bartek")
+    GameSaver.save_completed_game(finished_game(["Ala", "Bartek"]))
+    GameSaver.save_completed_game(finished_game(["Bartek", "Celina", "Darek"]))
+    return ala
+
+def body(response):
+    assert response.status_code == 200
+    return b"".join(response.streaming_content)
+
+@pytest.mark.django_db
+def test_staff_exports_ndjson_and_gzipped_csv(games):
+    """Test czy admin dostaje wszystkie wiersze w NDJSON i w skompresowanym CSV"""
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username="admin", email="a@x.pl", is_staff=True))
+
+    lines = body(client.get("/api/games/export/")).decode().splitlines()
+    records = [json.loads(line) for line in lines]
+    assert len(records) == GamePlayer.objects.count() == 5
+    assert [r["won"] for r in records] == [True, False, True, False, False]
+    assert records[2]["ore"] == 0 and records[3]["ore"] == 1
+
+    response = client.get("/api/games/export/?output=csv&gzip=1")
+    assert response["Content-Type"] == "application/gzip"
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(body(response)).decode())))
+    assert len(rows) == 5
+    assert json.loads(rows[0]["dice_distribution"]) == {}
+
+@pytest.mark.django_db
+def test_user_export_is_limited_to_own_games(games):
+    """Test czy zwykły użytkownik eksportuje tylko swoje gry, a zły zakres dat daje 400"""
+    client = APIClient()
+    client.force_authenticate(games)
+    records = [json.loads(line) for line in body(client.get("/api/games/export/?user_id=999")).splitlines()]
+    assert [r["username"] for r in records] == ["ala"]
+    assert client.get("/api/games/export/?since=wczoraj").status_code == 400
+    assert client.get("/api/games/export/?output=xml").status_code == 400
+
+@pytest.mark.django_db
+def test_command_writes_date_filtered_file(games, tmp_path):
+    """Test czy komenda zapisuje plik i filtruje po zakresie dat"""
+    target = tmp_path / "games.ndjson"
+    call_command("export_games", file=str(target), until="2000-01-01", stdout=io.StringIO())
+    assert target.read_text() == ""
+
+    call_command("export_games", file=str(target), output="csv", stdout=io.StringIO())
+    assert len(target.read_text().splitlines()) == 6
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_export_streams_chunks_incrementally(monkeypatch):
+    """Test czy pod ASGI kolejne kawałki eksportu wychodzą, zanim z bazy przeczytane zostaną wszystkie wiersze"""
+    user = User.objects.create_user(username="ala", email="ala@x.pl")
+    now = timezone.now()
+    games = Game.objects.bulk_create([Game(start_time=now) for _ in range(600)])
+    GamePlayer.objects.bulk_create([GamePlayer(game=game, user=user, victory_points=2, start_time=now)
+                                    for game in games])
+    token = Token.objects.create(user=user)
+
+    read = []
+    lines = export.ndjson_lines
+    monkeypatch.setattr(export, "ndjson_lines", lambda rows: lines(row for row in rows if not read.append(row)))
+
+    async def download():
+        scope = {"type": "http", "method": "GET", "path": "/api/games/export/", "query_string": b"",
+                 "headers": [(b"host", b"testserver"), (b"authorization", f"Token {token.key}".encode())]}
+        app = ApplicationCommunicator(ASGIHandler(), scope)
+        await app.send_input({"type": "http.request", "body": b"", "more_body": False})
+        start = await app.receive_output(10)
+        chunks = []
+        while True:
+            message = await app.receive_output(10)
+            chunks.append((message.get("body", b""), len(read)))
+            if not message.get("more_body"):
+                return start, chunks
+
+    start, chunks = async_to_sync(download)()
+    assert start["status"] == 200
+    assert len(b"".join(body for body, _ in chunks).splitlines()) == 600
+    # Pierwszy kawałek wysłany po przeczytaniu części wierszy, nie całego wyniku
+    assert len(chunks) > 2 and chunks[0][1] < 600
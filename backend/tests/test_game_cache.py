@@ -0,0 +1,92 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from game_api.game_saver import GameSaver
+from game_api.models import GamePlayer
+
+User = get_user_model()
+
+@pytest.fixture
+def client():
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username="ala", email="ala@x.pl"))
+    return client
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("suffix", ["", "players/"])
+def test_repeat_view_is_304_without_queries(client, suffix, django_assert_num_queries, finished_game):
+    """Test czy drugie żądanie z If-None-Match dostaje 304 bez zapytań do bazy"""
+    game = GameSaver.save_completed_game(finished_game())
+    url = f"/api/games/{game.id}/{suffix}"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first["ETag"].startswith('"')
+    assert "immutable" in first["Cache-Control"]
+
+    with django_assert_num_queries(0):
+        repeat = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        cached = client.get(url)
+    assert repeat.status_code == 304 and repeat["ETag"] == first["ETag"]
+    assert cached.json() == first.json()
+
+@pytest.mark.django_db
+def test_update_invalidates_cached_response(client, finished_game):
+    """Test czy edycja gry przez API zmienia ETag, a usunięcie daje 404"""
+    game = GameSaver.save_completed_game(finished_game())
+    url = f"/api/games/{game.id}/"
+    etag = client.get(url)["ETag"]
+
+    assert client.patch(url, {"turns": 99}, format="json").status_code == 200
+    changed = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200 and changed.json()["turns"] == 99
+    assert changed["ETag"] != etag
+
+    assert client.delete(url).status_code == 204
+    assert client.get(url).status_code == 404
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 404
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("suffix", ["", "players/"])
+def test_padded_id_shares_cache_entry(client, suffix, finished_game, django_assert_num_queries):
+    """Test czy /api/games/01/ i /api/games/1/ to jeden wpis w cache, czyszczony przy edycji i usunięciu"""
+    game = GameSaver.save_completed_game(finished_game())
+    url, padded = f"/api/games/{game.id}/{suffix}", f"/api/games/0{game.id}/{suffix}"
+    etag = client.get(padded)["ETag"]
+    with django_assert_num_queries(0):
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    assert client.patch(f"/api/games/{game.id}/", {"turns": 99}, format="json").status_code == 200
+    assert client.get(padded, HTTP_IF_NONE_MATCH=etag).status_code == 200
+    assert client.delete(f"/api/games/{game.id}/").status_code == 204
+    assert client.get(padded).status_code == 404
+    assert client.get(f"/api/games/abc/{suffix}").status_code == 404
+
+@pytest.mark.django_db
+def test_game_player_update_invalidates_players_response(client, finished_game):
+    """Test czy edycja i usunięcie gracza przez /api/game-players/ odświeża graczy gry w cache"""
+    game = GameSaver.save_completed_game(finished_game())
+    url = f"/api/games/{game.id}/players/"
+    assert len(client.get(url).json()["players"]) == 2
+    player = GamePlayer.objects.filter(game=game).order_by("id").first()
+
+    assert client.patch(f"/api/game-players/{player.id}/", {"victory_points": 9}, format="json").status_code == 200
+    assert client.get(url).json()["players"][0]["victory_points"] == 9
+
+    assert client.delete(f"/api/game-players/{player.id}/").status_code == 204
+    assert len(client.get(url).json()["players"]) == 1
+
+@pytest.mark.django_db
+def test_start_time_is_read_only(client, finished_game):
+    """Test czy start_time gry nie da się zmienić przez API, a gracz przejmuje go z gry"""
+    game = GameSaver.save_completed_game(finished_game())
+    assert client.patch(f"/api/games/{game.id}/", {"start_time": "2001-01-01T00:00:00Z"},
+                        format="json").status_code == 200
+    game.refresh_from_db()
+    assert game.start_time.year != 2001
+
+    user = User.objects.create_user(username="celina", email="c@x.pl")
+    response = client.post("/api/game-players/", {"game": game.id, "user": user.id, "victory_points": 1,
+                                                  "start_time": "2001-01-01T00:00:00Z"}, format="json")
+    assert response.status_code == 201
+    assert GamePlayer.objects.get(id=response.json()["id"]).start_time == game.start_time
@@ -0,0 +1,96 @@
+import functools
+import re
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from game_api.game_saver import GameSaver
+from game_api.models import Game, GamePlayer
+
+User = get_user_model()
+
+@pytest.fixture
+def finished_game(finished_game):
+    """Każdy gracz ma trochę drewna i rudy"""
+    return functools.partial(finished_game, resources=lambda i: {"wood": i + 1, "ore": 2})
+
+def saved_queries(state):
+    with CaptureQueriesContext(connection) as ctx:
+        game = GameSaver.save_completed_game(state)
+    assert game is not None
+    return len(ctx.captured_queries)
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("registered", [True, False])
+def test_query_count_does_not_depend_on_player_count(registered, finished_game):
+    """Test czy zapis gry ma stałą liczbę zapytań dla 2 i 4 graczy"""
+    names_small = ["Ala", "Bartek"]
+    names_large = ["Celina", "Darek", "Ewa", "Franek"]
+    if registered:
+        for name in names_small + names_large:
+            User.objects.create_user(username=name.lower(), email=f"{name}@x.pl", display_name=name)
+
+    small = saved_queries(finished_game(names_small))
+    large = saved_queries(finished_game(names_large))
+    assert small == large
+    assert GamePlayer.objects.count() == 6
+    wood = list(GamePlayer.objects.order_by("id").values_list("wood", "ore"))
+    assert wood == [(1, 2), (2, 2), (1, 2), (2, 2), (3, 2), (4, 2)]
+
+@pytest.mark.django_db
+def test_user_resolution_order(finished_game):
+    """Test czy dopasowanie użytkowników zachowuje kolejność metod"""
+    by_display = User.objects.create_user(username="u1", email="u1@x.pl", display_name="Ala")
+    User.objects.create_user(username="Ala", email="u2@x.pl")
+    by_username = User.objects.create_user(username="Bartek", email="u3@x.pl")
+    similar = User.objects.create_user(username="celina_k", email="u4@x.pl")
+    guest = User.objects.create_user(username="guest_Darek", email="u5@x.pl", is_guest=True)
+
+    game = GameSaver.save_completed_game(finished_game(["Ala", "Bartek", "Celina Nowak", "Darek", "Ewa"]))
+    users = dict(GamePlayer.objects.filter(game=game).values_list("victory_points", "user_id"))
+    assert users[4] == by_display.id
+    by_player = {gp.user.display_name or gp.user.username: gp.user for gp in
+                 GamePlayer.objects.filter(game=game).select_related("user")}
+    assert by_player["Bartek"] == by_username
+    assert by_player["celina_k"] == similar
+    assert by_player["guest_Darek"] == guest
+    new_guest = by_player["Ewa"]
+    assert new_guest.is_guest and new_guest.username == "guest_Ewa"
+    assert not new_guest.has_usable_password()
+
+@pytest.mark.django_db
+def test_similar_name_loads_one_user_per_word(finished_game, monkeypatch):
+    """Test czy popularne pierwsze słowo nie wczytuje wszystkich pasujących kont - tylko najstarsze"""
+    jans = [User.objects.create_user(username=f"jan{i}", email=f"jan{i}@x.pl", display_name=f"Jan {i}")
+            for i in range(20)]
+    User.objects.create_user(username="ala", email="ala@x.pl", display_name="Ala")
+    loaded = []
+    similar_users = GameSaver._similar_users
+    monkeypatch.setattr(GameSaver, "_similar_users",
+                        staticmethod(lambda words: loaded.append(similar_users(words)) or loaded[-1]))
+
+    game = GameSaver.save_completed_game(finished_game(["Jan Nowak", "Ala"]))
+    assert [len(users) for users in loaded] == [1]
+    assert GamePlayer.objects.get(game=game, victory_points=4).user == jans[0]
+
+    loaded.clear()
+    GameSaver.save_completed_game(finished_game(["Ala", "Jan 3"]))
+    assert loaded == [[]]  # wszyscy dopasowani dokładnie - bez zapytania o podobne nazwy
+
+@pytest.mark.django_db
+def test_new_guests_get_unique_usernames(finished_game):
+    """Test czy nowi goście o tej samej nazwie dostają różne, wolne username"""
+    User.objects.create_user(username="guest_Ola_Nowak", email="o@x.pl", is_guest=True, display_name="Kto inny")
+    game = GameSaver.save_completed_game(finished_game(["Ola  Nowak", "Ola__Nowak"]))
+    usernames = sorted(GamePlayer.objects.filter(game=game).values_list("user__username", flat=True))
+    assert usernames[0] == "guest_Ola__Nowak"
+    assert re.fullmatch(r"guest_Ola__Nowak_[0-9a-f]{10}", usernames[1])
+
+@pytest.mark.django_db
+def test_whitespace_only_name_is_saved(finished_game):
+    """Test czy gracz o nazwie z samych spacji nie wywraca zapisu gry"""
+    User.objects.create_user(username="ala", email="ala@x.pl", display_name="Ala")
+    game = GameSaver.save_completed_game(finished_game(["Ala", "    "]))
+    assert game is not None
+    assert GamePlayer.objects.filter(game=game).count() == 2
@@ -0,0 +1,113 @@
+import datetime
+import io
+import re
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from game_api.game_saver import GameSaver
+from game_api.models import GamePlayer, UserStats
+from users.guests import allocate_usernames
+
+User = get_user_model()
+
+def guest(username, days_old, display_name=None):
+    user = User.objects.create_user(username=username, email=f"{username}@guest.local", is_guest=True,
+                                    display_name=display_name or username)
+    User.objects.filter(pk=user.pk).update(created_at=timezone.now() - datetime.timedelta(days=days_old))
+    Token.objects.create(user=user)
+    return user
+
+def gc(**options):
+    out = io.StringIO()
+    call_command("gc_guests", stdout=out, **options)
+    return out.getvalue()
+
+@pytest.mark.django_db
+def test_allocate_usernames_without_probing(django_assert_num_queries):
+    """Test czy wolne nazwy przydzielane są jednym zapytaniem, a zajęte dostają losowy sufiks"""
+    User.objects.create_user(username="guest_Ala", email="a@x.pl")
+    with django_assert_num_queries(1):
+        usernames = allocate_usernames(["guest_Ala", "guest_Ola", "guest_Ola", "x" * 200])
+    assert re.fullmatch(r"guest_Ala_[0-9a-f]{10}", usernames[0])
+    assert usernames[1] == "guest_Ola" and usernames[2].startswith("guest_Ola_")
+    assert len(usernames[3]) <= 150 and len(set(usernames)) == 4
+
+@pytest.mark.django_db
+def test_guest_login_reuses_name_with_suffix():
+    """Test czy drugi gość o tej samej nazwie dostaje unikalny username i ten sam display_name"""
+    client = APIClient()
+    first = client.post("/api/auth/users/guest_login/", {"guest_name": "Zosia"}).json()["user"]
+    second = client.post("/api/auth/users/guest_login/", {"guest_name": "Zosia"}).json()["user"]
+    assert first["username"] == "Zosia" and second["username"].startswith("Zosia_")
+    assert second["display_name"] == "Zosia"
+
+@pytest.mark.django_db
+def test_gc_deletes_stale_guests_without_games_in_chunks(finished_game):
+    """Test czy usuwani są tylko starzy goście bez gier (z tokenami), paczkami"""
+    stale = [guest(f"old{i}", 40) for i in range(3)]
+    fresh = guest("fresh", 1)
+    player = guest("guest_Gracz", 40, display_name="Gracz")
+    GameSaver.save_completed_game(finished_game(["Gracz", "Inny"]))
+    registered = User.objects.create_user(username="konto", email="k@x.pl")
+    User.objects.filter(pk=registered.pk).update(created_at=timezone.now() - datetime.timedelta(days=400))
+
+    assert "would delete 3 guests" in gc(days=30, dry_run=True)
+    assert User.objects.filter(pk__in=[u.pk for u in stale]).count() == 3
+
+    assert "deleted 3 guests" in gc(days=30, batch_size=2)
+    assert not User.objects.filter(pk__in=[u.pk for u in stale]).exists()
+    assert not Token.objects.filter(user_id__in=[u.pk for u in stale]).exists()
+    assert User.objects.filter(pk__in=[fresh.pk, player.pk, registered.pk]).count() == 3
+
+@pytest.mark.django_db
+def test_gc_merges_stale_guest_into_account(finished_game):
+    """Test czy stary gość z grami trafia do konta o tym samym display_name razem ze statystykami"""
+    old = guest("guest_Basia", 40, display_name="Basia")
+    GameSaver.save_completed_game(finished_game(["Basia", "Inny"]))
+    GameSaver.save_completed_game(finished_game(["Inny", "Basia"]))
+    account = User.objects.create_user(username="basia", email="b@x.pl", display_name="Basia")
+    GameSaver.save_completed_game(finished_game(["Basia", "Inny"]))  # już na konto
+    client = APIClient()
+    client.force_authenticate(account)
+    players_url = f"/api/games/{GamePlayer.objects.filter(user=old).first().game_id}/players/"
+    assert "guest_Basia" in {p["username"] for p in client.get(players_url).json()["players"]}
+
+    assert "Merged 1 guests" in gc(days=30, merge=True)
+    # Odpowiedź z cache nie pokazuje już usuniętego gościa
+    assert "basia" in {p["username"] for p in client.get(players_url).json()["players"]}
+    assert not User.objects.filter(pk=old.pk).exists()
+    assert GamePlayer.objects.filter(user=account).count() == 3
+    stats = UserStats.objects.get(user=account)
+    assert (stats.total_games, stats.wins) == (3, 2)
+    assert stats.win_rate == pytest.approx(200 / 3)
+    account.refresh_from_db()
+    assert (account.games_played, account.games_won) == (3, 2)
+
+@pytest.mark.django_db
+def test_gc_merge_skips_guest_sharing_a_game_with_account(finished_game):
+    """Test czy gość, który grał w tej samej grze co konto, nie jest scalany"""
+    old = guest("guest_Celina", 40, display_name="Celina")
+    account = User.objects.create_user(username="konto_c", email="c@x.pl", display_name="Kto inny")
+    GameSaver.save_completed_game(finished_game(["Celina", "Kto inny"]))
+    User.objects.filter(pk=account.pk).update(display_name="Celina")
+
+    assert "Merged 0 guests" in gc(days=30, merge=True)
+    assert User.objects.filter(pk=old.pk).exists()
+
+@pytest.mark.django_db
+@pytest.mark.skipif(not connection.features.has_select_for_update, reason="no SELECT ... FOR UPDATE")
+def test_gc_locks_guests_before_recheck_and_delete():
+    """Test czy paczka gości jest blokowana (FOR UPDATE) przed ponownym sprawdzeniem gier i usunięciem"""
+    stale = guest("old", 40)
+    with CaptureQueriesContext(connection) as ctx:
+        assert "deleted 1 guests" in gc(days=30)
+    sql = [q["sql"] for q in ctx.captured_queries]
+    locked = next(i for i, q in enumerate(sql) if "FOR UPDATE" in q and "game_players" in q)
+    assert any(q.startswith("DELETE") and "users_user" in q for q in sql[locked:])
+    assert not User.objects.filter(pk=stale.pk).exists()
@@ -0,0 +1,74 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from game_api import leaderboard
+from game_api.game_saver import GameSaver
+from game_api.models import Game, GamePlayer, UserStats
+
+User = get_user_model()
+
+@pytest.fixture
+def players():
+    return {name: User.objects.create_user(username=name.lower(), email=f"{name}@x.pl", display_name=name)
+            for name in ["Ala", "Bartek", "Celina"]}
+
+@pytest.fixture(autouse=True)
+def fresh_version(monkeypatch):
+    leaderboard.invalidate()
+    monkeypatch.setitem(leaderboard._snapshot, "totals", None)
+
+@pytest.mark.django_db
+def test_stored_win_rate_orders_leaderboard(players, django_capture_on_commit_callbacks, finished_game):
+    """Test czy ranking idzie po zapisanym win_rate, a przy remisie po liczbie gier"""
+    with django_capture_on_commit_callbacks(execute=True):
+        GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], "Ala"))
+        GameSaver.save_completed_game(finished_game(["Ala", "Bartek", "Celina"], "Bartek"))
+        GameSaver.save_completed_game(finished_game(["Celina", "Ala"], "Celina"))
+
+    assert UserStats.objects.get(user=players["Ala"]).win_rate == pytest.approx(100 / 3)
+    top = leaderboard.get_leaderboard(10)
+    assert [row["username"] for row in top] == ["Bartek", "Celina", "Ala"]
+    assert top[0]["win_rate"] == 50.0
+
+@pytest.mark.django_db
+def test_cache_hit_until_version_changes(players, django_assert_num_queries, django_capture_on_commit_callbacks, finished_game):
+    """Test czy drugi odczyt idzie z cache, a zapis gry unieważnia ranking"""
+    with django_capture_on_commit_callbacks(execute=True):
+        GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], "Ala"))
+    assert [row["username"] for row in leaderboard.get_leaderboard()] == ["Ala", "Bartek"]
+    with django_assert_num_queries(0):
+        leaderboard.get_leaderboard()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        GameSaver.save_completed_game(finished_game(["Celina", "Bartek"], "Celina"))
+        GameSaver.save_completed_game(finished_game(["Celina", "Ala"], "Celina"))
+    assert leaderboard.get_leaderboard()[0]["username"] == "Celina"
+
+@pytest.mark.django_db
+def test_global_stats_endpoint(players, django_capture_on_commit_callbacks, finished_game):
+    """Test czy global_stats zwraca liczniki i top 10 w dotychczasowym formacie"""
+    with django_capture_on_commit_callbacks(execute=True):
+        GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], "Bartek"))
+    data = APIClient().get("/api/stats/global_stats/").json()
+    assert data["total_games"] == 1
+    assert data["total_players"] == 3
+    assert data["total_game_sessions"] == 2
+    assert data["leaderboard"][0] == {"user_id": players["Bartek"].id, "username": "Bartek",
+                                      "total_games": 1, "wins": 1, "win_rate": 100.0, "avg_points": 4.0}
+
+@pytest.mark.django_db
+def test_totals_survive_saved_games_until_ttl(players, django_assert_num_queries, django_capture_on_commit_callbacks,
+                                              finished_game, monkeypatch):
+    """Test czy zapis gry nie wymusza ponownego liczenia liczników - tylko TTL, a liczniki zgadzają się z tabelami"""
+    with django_capture_on_commit_callbacks(execute=True):
+        GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], "Ala"))
+    assert leaderboard.get_totals()["total_games"] == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        GameSaver.save_completed_game(finished_game(["Ala", "Bartek", "Celina"], "Celina"))
+    with django_assert_num_queries(0):
+        assert leaderboard.get_totals()["total_games"] == 1
+
+    monkeypatch.setitem(leaderboard._snapshot, "built_at", 0.0)
+    assert leaderboard.get_totals() == {"total_games": Game.objects.count(), "total_players": User.objects.count(),
+                                        "total_game_sessions": GamePlayer.objects.count()}
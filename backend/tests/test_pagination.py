@@ -0,0 +1,72 @@
+import datetime
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from game_api.models import Game, GamePlayer
+from game_api.pagination import MAX_PAGE_SIZE
+
+User = get_user_model()
+
+@pytest.fixture
+def history():
+    """Gracz z 7 grami, w tym dwie pary o identycznym start_time (remisy kursora)"""
+    user = User.objects.create_user(username="ala", email="ala@x.pl", display_name="Ala")
+    other = User.objects.create_user(username="bartek", email="b@x.pl")
+    base = timezone.now()
+    for minutes in [0, 1, 1, 2, 3, 3, 4]:
+        game = Game.objects.create()
+        Game.objects.filter(id=game.id).update(start_time=base + datetime.timedelta(minutes=minutes))
+        game.refresh_from_db()
+        for player, vp in [(user, 4), (other, 2)]:
+            GamePlayer.objects.create(game=game, user=player, victory_points=vp, start_time=game.start_time)
+    client = APIClient()
+    client.force_authenticate(user)
+    return client, user
+
+def walk(client, url):
+    """Przejdź wszystkie strony po linkach `next`"""
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        pages.append(response.json()["results"])
+        url = response.json()["next"]
+    return pages
+
+@pytest.mark.django_db
+def test_user_games_walk_is_complete_and_ordered(history):
+    """Test czy strony historii gracza pokrywają wszystkie gry bez duplikatów, od najnowszych"""
+    client, user = history
+    pages = walk(client, f"/api/users/{user.id}/games/?page_size=3")
+    assert [len(page) for page in pages] == [3, 3, 1]
+
+    games = [game for page in pages for game in page]
+    expected = list(Game.objects.order_by("-start_time", "-id").values_list("id", flat=True))
+    assert [game["game_id"] for game in games] == expected
+    assert all(game["won"] for game in games)
+
+@pytest.mark.django_db
+def test_deep_page_uses_keyset_filter(history):
+    """Test czy dalsza strona to filtr po kursorze, a nie OFFSET"""
+    client, user = history
+    next_url = client.get(f"/api/game-players/?user_id={user.id}&page_size=2").json()["next"]
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(next_url)
+    assert [row["id"] for row in response.json()["results"]] == list(
+        GamePlayer.objects.filter(user=user).order_by("-start_time", "-id").values_list("id", flat=True)[2:4])
+    sql = " ".join(q["sql"] for q in ctx.captured_queries).upper()
+    assert "OFFSET" not in sql
+
+@pytest.mark.django_db
+def test_page_size_and_limit_are_capped(history):
+    """Test czy rozmiar strony i limit w `recent` są przycięte, a zły kursor daje 404"""
+    client, _ = history
+    assert len(client.get("/api/games/recent/?limit=100000").json()) == 7
+    assert len(client.get("/api/games/recent/?limit=abc").json()) == 7
+    response = client.get(f"/api/games/?page_size={MAX_PAGE_SIZE * 10}")
+    assert response.status_code == 200 and response.json()["next"] is None
+    assert client.get("/api/games/?cursor=nonsense").status_code == 404
@@ -0,0 +1,76 @@
+import pytest
+from game_api.game_saver import GameSaver
+from game_api.models import Game, GamePlayer
+from game_api.persistence import GamePersistenceWorker, SaveRequest
+
+@pytest.fixture
+def worker():
+    worker = GamePersistenceWorker(workers=1, max_queue=4, batch_wait=0.2, retry_backoff=0)
+    yield worker
+    worker.stop()
+
+@pytest.mark.django_db
+def test_batch_saves_each_game_in_savepoint(worker, monkeypatch, finished_game):
+    """Test czy paczka zapisuje udane gry, a nieudaną zwraca do ponowienia"""
+    original = GameSaver.save_completed_game
+    broken = finished_game()
+
+    def flaky_save(game_state, start_time=None):
+        if game_state is broken:
+            Game.objects.create()   # zapis częściowy - musi zostać wycofany savepointem
+            return None
+        return original(game_state, start_time=start_time)
+
+    monkeypatch.setattr(GameSaver, "save_completed_game", staticmethod(flaky_save))
+    batch = [SaveRequest("room-a", finished_game()), SaveRequest("room-c", broken),
+             SaveRequest("room-b", finished_game())]
+    retry = worker._save_batch(batch)
+
+    assert [item.room_id for item in retry] == ["room-c"]
+    assert Game.objects.count() == 2
+    assert GamePlayer.objects.count() == 4
+    assert worker.is_saved("room-a") and worker.is_saved("room-b")
+    assert worker.metrics()["batches"] == 1
+
+@pytest.mark.django_db
+def test_submit_is_idempotent_by_room(worker, monkeypatch, finished_game):
+    """Test czy ten sam pokój trafia do kolejki tylko raz"""
+    monkeypatch.setattr(worker, "_ensure_started", lambda: None)
+    assert worker.submit("room-a", finished_game())
+    assert worker.submit("room-a", finished_game())
+    metrics = worker.metrics()
+    assert metrics["queue_depth"] == 1
+    assert metrics["duplicates"] == 1
+
+def test_full_queue_rejects(worker, monkeypatch):
+    """Test czy pełna kolejka odrzuca grę zamiast blokować consumera"""
+    monkeypatch.setattr(worker, "_ensure_started", lambda: None)
+    for i in range(4):
+        assert worker.submit(f"room-{i}", object())
+    assert not worker.submit("room-overflow", object())
+    assert worker.metrics()["rejected"] == 1
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_retries_and_batches(worker, monkeypatch, finished_game):
+    """Test czy wątek zapisuje kilka gier razem i ponawia nieudany zapis"""
+    original = GameSaver.save_completed_game
+    calls = []
+
+    def save_failing_once(game_state, start_time=None):
+        calls.append(game_state)
+        if len(calls) == 1:
+            raise RuntimeError("connection reset")
+        return original(game_state, start_time=start_time)
+
+    monkeypatch.setattr(GameSaver, "save_completed_game", staticmethod(save_failing_once))
+    for room in ["room-a", "room-b", "room-c"]:
+        assert worker.submit(room, finished_game())
+    worker.stop()
+
+    metrics = worker.metrics()
+    assert Game.objects.count() == 3
+    assert metrics["saved"] == 3
+    assert metrics["retried"] == 1
+    assert metrics["batches"] == 2
+    assert metrics["queue_depth"] == 0
+    assert metrics["save_latency_ms"]["p95"] is not None
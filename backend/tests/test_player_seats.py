@@ -0,0 +1,65 @@
+import pytest
+from game_engine.simple.models import SimpleGameState, GamePhase
+
+PLAYER_A = "aaaaaaaa-0000-0000-0000-000000000000"
+PLAYER_B = "bbbbbbbb-0000-0000-0000-000000000000"
+
+@pytest.fixture
+def game_state():
+    state = SimpleGameState()
+    state.add_player(PLAYER_A, "red", "Alice")
+    state.add_player(PLAYER_B, "blue", "Bob")
+    return state
+
+def test_players_get_consecutive_seats(game_state):
+    """Test czy gracze dostają miejsca 0..N-1, a kolejność tur jest w UUID na zewnątrz"""
+    assert game_state.seat_of == {PLAYER_A: 0, PLAYER_B: 1}
+    assert game_state.turn_order == [0, 1]
+    assert game_state.player_order == [PLAYER_A, PLAYER_B]
+    assert game_state.players[PLAYER_B].seat == 1
+
+def test_board_stores_seats_and_serializes_uuids(game_state):
+    """Test czy plansza trzyma numery miejsc, a serialize zwraca UUID"""
+    game_state.place_settlement(21, PLAYER_B, is_setup=True)
+    game_state.place_road(3, PLAYER_B, is_setup=True)
+    assert game_state.vertices[21].owner == 1
+    assert game_state.vertices[21].is_owned_by(1)
+    assert game_state.edges[3].owner == 1
+
+    serialized = game_state.serialize()
+    assert serialized["vertices"]["21"]["player_id"] == PLAYER_B
+    assert serialized["edges"]["3"]["player_id"] == PLAYER_B
+    assert serialized["setup_progress"][PLAYER_B] == {"settlements": 1, "roads": 1}
+    assert serialized["has_rolled_dice"] == {PLAYER_A: False, PLAYER_B: False}
+
+def test_turns_and_dice_by_uuid(game_state):
+    """Test czy tury i rzut kośćmi działają przez UUID na granicy"""
+    for player_id in [PLAYER_A, PLAYER_B, PLAYER_B, PLAYER_A]:
+        vertex_id = game_state.setup_hints.top(1)[0]["vertex_id"]
+        assert game_state.can_player_build_settlement_in_setup(player_id)
+        game_state.place_settlement(vertex_id, player_id, is_setup=True)
+        game_state.place_road(vertex_id, player_id, is_setup=True)
+        game_state.end_turn()
+
+    assert game_state.phase == GamePhase.PLAYING
+    assert game_state.is_current_player(PLAYER_A)
+    assert not game_state.is_current_player("unknown")
+    game_state.handle_dice_roll(PLAYER_A, 8)
+    assert game_state.has_player_rolled_dice(PLAYER_A)
+    assert game_state.can_take_actions(PLAYER_A)
+    game_state.end_turn()
+    assert game_state.is_current_player(PLAYER_B)
+    assert not game_state.has_player_rolled_dice(PLAYER_A)
+
+def test_removed_player_keeps_seat_on_board(game_state):
+    """Test czy budynki rozłączonego gracza zostają przy jego UUID, ale nie dostają surowców"""
+    game_state.place_settlement(21, PLAYER_B, is_setup=True)
+    game_state.remove_player(PLAYER_B)
+
+    assert game_state.serialize()["vertices"]["21"]["player_id"] == PLAYER_B
+    tile = game_state.tiles[game_state.vertex_to_tiles[21][0]]
+    game_state.distribute_resources_for_dice_roll(tile.dice_number)
+
+    game_state.add_player("cccccccc-0000-0000-0000-000000000000", "green", "Carol")
+    assert game_state.seat_of["cccccccc-0000-0000-0000-000000000000"] == 2
+    assert not game_state.place_city(21, "cccccccc-0000-0000-0000-000000000000")
@@ -0,0 +1,132 @@
+"""
+Budżet zapytań SQL dla endpointów REST (game_api/views.py, users/views.py).
+
+Każdy endpoint jest wywoływany na małym i na kilkukrotnie większym zbiorze danych - liczba zapytań
+musi być taka sama (brak N+1) i nie większa niż budżet z query_budget.json. Mediana czasu odpowiedzi
+na większym zbiorze nie może przekroczyć zapisanej więcej niż TIME_FACTOR razy (i o TIME_SLACK_MS)
+- tylko na tej samej bazie (vendor), na której zapisano plik.
+
+Nowy endpoint albo świadoma zmiana:  QUERY_BUDGET_UPDATE=1 pytest tests/test_query_budget.py
+"""
+import io
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from game_api import leaderboard
+from game_api.models import Game, GamePlayer
+
+User = get_user_model()
+
+BASELINE = Path(__file__).with_name("query_budget.json")
+UPDATE = os.environ.get("QUERY_BUDGET_UPDATE") == "1"
+TIME_FACTOR = 3.0
+TIME_SLACK_MS = 25.0
+REPEAT = 5
+
+# (użytkownicy, gry) dopisywane przed kolejnymi pomiarami
+SIZES = [(8, 15), (40, 120)]
+
+ENDPOINTS = {
+    "users-list": "/api/users/",
+    "users-detail": "/api/users/{user}/",
+    "users-games": "/api/users/{user}/games/",
+    "users-games-page-2": "/api/users/{user}/games/?page_size=5&cursor={cursor}",
+    "users-statistics": "/api/users/{user}/statistics/",
+    "games-list": "/api/games/",
+    "games-list-by-user": "/api/games/?user_id={user}",
+    "games-detail": "/api/games/{game}/",
+    "games-players": "/api/games/{game}/players/",
+    "games-recent": "/api/games/recent/",
+    "games-export": "/api/games/export/",
+    "game-players-list": "/api/game-players/",
+    "game-players-by-user": "/api/game-players/?user_id={user}",
+    "game-players-detail": "/api/game-players/{game_player}/",
+    "player-resources-by-user": "/api/player-resources/?user_id={user}",
+    "stats-global": "/api/stats/global_stats/",
+    "stats-resource-analysis": "/api/stats/resource_analysis/",
+    "stats-daily": "/api/stats/daily/",
+    "stats-persistence": "/api/stats/persistence/",
+    "auth-users-list": "/api/auth/users/",
+    "auth-users-detail": "/api/auth/users/{user}/",
+    "auth-users-profile": "/api/auth/users/profile/",
+    "auth-profile": "/api/auth/profile/",
+    "auth-me": "/api/auth/me/",
+    "auth-test-token": "/api/auth/test-token/",
+}
+
+def grow(users, games):
+    call_command("seed_games", "--users", str(users), "--games", str(games), "--days", "60",
+                 "--prefix", "budget_", stdout=io.StringIO())
+
+def url_for(template):
+    # Najaktywniejszy gracz (synthetic.popularity) - jego historia ma najwięcej stron
+    user = User.objects.filter(username__startswith="budget_").order_by("id").first()
+    history = GamePlayer.objects.filter(user=user).order_by("-start_time", "-id")
+    client = APIClient()
+    client.force_authenticate(user)
+    cursor = client.get(f"/api/users/{user.id}/games/?page_size=5").json()["next"].split("cursor=")[1]
+    return client, template.format(user=user.id, game=history[0].game_id, game_player=history[0].id,
+                                   cursor=cursor)
+
+def call(client, url):
+    # Cache odpowiedzi (gry, ranking, liczniki) wyłączony - mierzymy drogę do bazy
+    for cache in caches.all():
+        cache.clear()
+    leaderboard._snapshot["totals"] = None
+    with CaptureQueriesContext(connection) as ctx:
+        started = time.perf_counter()
+        response = client.get(url)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        elapsed = (time.perf_counter() - started) * 1000
+    assert response.status_code == 200, (url, response.status_code)
+    return len(ctx.captured_queries), elapsed
+
+def load_baseline():
+    if BASELINE.exists():
+        return json.loads(BASELINE.read_text())
+    return {"vendor": connection.vendor, "endpoints": {}}
+
+def save_baseline(name, queries, ms):
+    baseline = load_baseline()
+    baseline["vendor"] = connection.vendor
+    baseline["endpoints"][name] = {"queries": queries, "ms": round(ms, 2)}
+    baseline["endpoints"] = dict(sorted(baseline["endpoints"].items()))
+    BASELINE.write_text(json.dumps(baseline, indent=2) + "\n")
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", ENDPOINTS)
+def test_endpoint_query_budget(name):
+    """Test czy liczba zapytań endpointu nie rośnie z danymi i mieści się w budżecie, a czas w progu"""
+    counts = []
+    for users, games in SIZES:
+        grow(users, games)
+        client, url = url_for(ENDPOINTS[name])
+        counts.append(call(client, url)[0])
+    assert Game.objects.count() == sum(games for _, games in SIZES)
+    assert len(set(counts)) == 1, f"{name}: queries grow with data {counts}"
+
+    ms = statistics.median(call(client, url)[1] for _ in range(REPEAT))
+    if UPDATE:
+        save_baseline(name, counts[0], ms)
+        return
+
+    baseline = load_baseline()
+    budget = baseline["endpoints"].get(name)
+    assert budget, f"{name}: no baseline - run with QUERY_BUDGET_UPDATE=1"
+    assert counts[0] <= budget["queries"], f"{name}: {counts[0]} queries, budget {budget['queries']}"
+    # Czasy są porównywalne tylko na bazie, na której je zapisano
+    if baseline["vendor"] != connection.vendor:
+        return
+    limit = max(budget["ms"] * TIME_FACTOR, budget["ms"] + TIME_SLACK_MS)
+    assert ms <= limit, f"{name}: {ms:.1f} ms, baseline {budget['ms']} ms"
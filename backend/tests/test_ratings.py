@@ -0,0 +1,54 @@
+import io
+
+import numpy as np
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from game_api import ratings
+from game_api.game_saver import GameSaver
+from game_api.models import UserStats
+
+User = get_user_model()
+
+def test_update_game_is_zero_sum():
+    """Test czy zwycięzca zyskuje, przegrany traci, a suma zmian jest zerowa"""
+    before = [1500.0, 1600.0, 1400.0]
+    after = ratings.update_game(before, [4, 2, 2])
+    assert after[0] > before[0]
+    assert after[1] < before[1]
+    assert after[2] < before[2]
+    assert sum(after) == pytest.approx(sum(before))
+
+def test_recompute_matches_sequential_updates():
+    """Test czy przeliczenie poziomami daje wynik identyczny z aktualizacją gra po grze"""
+    rng = np.random.default_rng(7)
+    user_count, game_count, seats = 12, 300, 4
+    user_index = np.array([rng.choice(user_count, seats, replace=False) for _ in range(game_count)])
+    points = rng.integers(0, 5, size=(game_count, seats))
+    mask = np.ones((game_count, seats), dtype=bool)
+    mask[::3, 3] = False
+
+    expected = np.full(user_count, ratings.INITIAL_RATING)
+    for users, vp, game_mask in zip(user_index, points, mask):
+        users, vp = users[game_mask], vp[game_mask]
+        expected[users] = ratings.update_game(expected[users].tolist(), vp.tolist())
+
+    result = ratings.recompute(user_index, points, mask, user_count)
+    np.testing.assert_allclose(result, expected)
+
+@pytest.mark.django_db
+def test_recompute_command_matches_incremental(finished_game):
+    """Test czy komenda odtwarza ratingi zapisane przyrostowo przez GameSaver"""
+    for name in ["Ala", "Bartek", "Celina"]:
+        User.objects.create_user(username=name.lower(), email=f"{name}@x.pl", display_name=name)
+    GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], points=[4, 2]))
+    GameSaver.save_completed_game(finished_game(["Bartek", "Celina", "Ala"], points=[4, 3, 1]))
+    GameSaver.save_completed_game(finished_game(["Celina", "Ala"], points=[2, 4]))
+    incremental = dict(UserStats.objects.values_list("user__username", "rating"))
+    assert incremental["ala"] != ratings.INITIAL_RATING
+
+    UserStats.objects.update(rating=ratings.INITIAL_RATING)
+    call_command("recompute_ratings", stdout=io.StringIO())
+
+    recomputed = dict(UserStats.objects.values_list("user__username", "rating"))
+    assert recomputed == pytest.approx(incremental)
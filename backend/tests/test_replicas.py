@@ -0,0 +1,85 @@
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from rest_framework.test import APIClient
+from game_api import replicas
+from game_api.game_saver import GameSaver
+from game_api.models import Game
+
+User = get_user_model()
+
+# 'replica' z test_settings to osobna baza - nie dostaje zapisów z primary, czyli udaje opóźnioną replikę
+pytestmark = [
+    pytest.mark.skipif("replica" not in settings.DATABASES, reason="no 'replica' database alias"),
+    pytest.mark.django_db(databases=["default", "replica"]),
+]
+
+@pytest.fixture
+def replica(settings):
+    settings.ANALYTICS_REPLICA = {"ALIAS": "replica", "PIN_SECONDS": 5}
+    cache.clear()
+
+def user_on_both(name):
+    """Konto założone przed grą - replika już je ma"""
+    user = User.objects.create_user(username=name.lower(), email=f"{name}@x.pl", display_name=name)
+    User.objects.using("replica").create(id=user.id, username=user.username, display_name=name)
+    return user
+
+def test_reads_follow_replica_until_pinned_after_save(replica, django_capture_on_commit_callbacks, finished_game):
+    """Test czy statystyki i historia idą z repliki, a uczestnicy zapisanej gry czytają z primary"""
+    ala, celina = user_on_both("Ala"), user_on_both("Celina")
+    with django_capture_on_commit_callbacks() as callbacks:
+        GameSaver.save_completed_game(finished_game(["Ala", "Bartek"]))
+
+    def reads(user):
+        client = APIClient()
+        client.force_authenticate(user)
+        export = client.get("/api/games/export/")
+        return (
+            client.get(f"/api/users/{user.id}/statistics/").json()["total_games"],
+            len(client.get("/api/games/").json()["results"]),
+            b"".join(export.streaming_content).count(b"\n"),
+        )
+
+    # Gra jest tylko na primary - zanim replika ją dostanie, odczyty jej nie widzą
+    assert reads(ala) == (0, 0, 0)
+
+    for callback in callbacks:  # commit zapisu
+        callback()
+    assert reads(ala) == (1, 1, 1)
+    assert reads(celina) == (0, 0, 0)
+
+def test_write_in_request_sticks_to_primary(replica):
+    """Test czy po zapisie w tym samym kontekście dalsze odczyty idą z primary"""
+    assert router.db_for_read(Game) == "default"
+    with replicas.analytics_reads():
+        assert router.db_for_read(Game) == "replica"
+        game = Game.objects.create(turns=1)
+        assert game._state.db == "default"
+        assert router.db_for_read(Game) == "default"
+    assert router.db_for_read(Game) == "default"
+    assert router.allow_migrate("replica", "game_api") is False
+
+def test_disabled_router_reads_primary():
+    """Test czy bez skonfigurowanej repliki wszystko czyta z primary"""
+    with replicas.analytics_reads():
+        assert router.db_for_read(Game) == "default"
+
+def test_new_account_missing_on_replica(replica):
+    """Test czy konta, którego replika jeszcze nie ma, szukamy na primary zamiast zwracać 404"""
+    dawid = User.objects.create_user(username="dawid", email="dawid@x.pl")
+    client = APIClient()
+    client.force_authenticate(dawid)
+    assert client.get(f"/api/users/{dawid.id}/statistics/").json()["total_games"] == 0
+    assert client.get("/api/users/999999/statistics/").status_code == 404
+
+def test_cached_game_responses_built_from_primary(replica, finished_game):
+    """Test czy odpowiedzi z cache gier (ETag na 24 h) nie są budowane z opóźnionej repliki"""
+    celina = user_on_both("Celina")
+    game = GameSaver.save_completed_game(finished_game(["Ala", "Bartek"]))
+    client = APIClient()
+    client.force_authenticate(celina)
+    assert client.get(f"/api/games/{game.id}/").json()["turns"] == game.turns
+    assert len(client.get(f"/api/games/{game.id}/players/").json()["players"]) == 2
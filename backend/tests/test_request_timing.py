@@ -0,0 +1,56 @@
+import json
+import logging
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from game_api.game_saver import GameSaver
+
+User = get_user_model()
+
+def metrics(header):
+    """{'db': (dur, desc), ...} z nagłówka Server-Timing"""
+    result = {}
+    for entry in header.split(", "):
+        name, *params = entry.split(";")
+        values = dict(param.split("=", 1) for param in params)
+        result[name] = (float(values["dur"]), values.get("desc", "").strip('"'))
+    return result
+
+@pytest.fixture
+def client():
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username="ala", email="ala@x.pl", display_name="Ala"))
+    return client
+
+@pytest.mark.django_db
+def test_server_timing_header_counts_queries(client, settings, finished_game):
+    """Test czy nagłówek Server-Timing podaje liczbę zapytań i czasy db/view/render/total"""
+    settings.REQUEST_TIMING = {"SAMPLE_RATE": 1.0}
+    game = GameSaver.save_completed_game(finished_game(["Ala", "Bartek"]))
+    response = client.get(f"/api/games/{game.id}/players/")
+
+    timing = metrics(response["Server-Timing"])
+    assert set(timing) == {"db", "view", "render", "total"}
+    assert timing["db"][1] == "2 queries"
+    assert timing["total"][0] >= timing["view"][0] + timing["render"][0]
+
+@pytest.mark.django_db
+def test_unsampled_requests_are_not_instrumented(client, settings):
+    """Test czy żądania poza próbką nie dostają nagłówka"""
+    settings.REQUEST_TIMING = {"SAMPLE_RATE": 0.0}
+    assert "Server-Timing" not in client.get("/api/games/recent/")
+
+@pytest.mark.django_db
+def test_slow_request_logged_with_repeated_sql(client, settings, caplog, finished_game):
+    """Test czy wolne żądanie trafia do logu jako JSON z najczęściej powtarzanym SQL"""
+    settings.REQUEST_TIMING = {"SAMPLE_RATE": 1.0, "SLOW_MS": 0}
+    game = GameSaver.save_completed_game(finished_game(["Ala", "Bartek"]))
+    with caplog.at_level(logging.WARNING, logger="backend.request_timing"):
+        client.get(f"/api/games/{game.id}/")
+
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["event"] == "slow_request"
+    assert record["path"] == f"/api/games/{game.id}/" and record["status"] == 200
+    assert record["queries"] == 1
+    assert record["top_sql"][0]["count"] == 1 and '"games"' in record["top_sql"][0]["sql"]
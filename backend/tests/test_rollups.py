@@ -0,0 +1,91 @@
+import datetime
+import functools
+import io
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+from game_api.game_saver import GameSaver
+from game_api.models import DailyGameStats, DailySeatStats, Game, GamePlayer
+
+User = get_user_model()
+
+@pytest.fixture
+def finished_game(finished_game):
+    """Owce według miejsca gracza, 30 tur"""
+    return functools.partial(finished_game, resources=lambda i: {"sheep": i}, turns=30)
+
+def snapshot():
+    games = sorted(DailyGameStats.objects.values_list())
+    seats = sorted(DailySeatStats.objects.values_list("day", "seat", "players", "wins"))
+    return games, seats
+
+@pytest.mark.django_db
+def test_incremental_rollups_match_rebuild(finished_game):
+    """Test czy rollupy liczone przy zapisie są takie same jak przebudowane komendą"""
+    GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], winner=1, dice={"7": 2, "12": 1}))
+    GameSaver.save_completed_game(finished_game(["Ala", "Bartek", "Celina"], winner=2, dice={"7": 1}, turns=50))
+    incremental = snapshot()
+
+    stats = DailyGameStats.objects.get()
+    assert (stats.games, stats.players, stats.total_turns) == (2, 5, 80)
+    assert (stats.dice_7, stats.dice_12, stats.sheep, stats.sheep_holders) == (3, 1, 4, 3)
+    assert list(GamePlayer.objects.order_by("id").values_list("seat", flat=True)) == [0, 1, 0, 1, 2]
+
+    call_command("backfill_daily_stats", stdout=io.StringIO())
+    assert snapshot() == incremental
+
+@pytest.mark.django_db
+def test_daily_endpoint_filters_by_date_range(finished_game):
+    """Test czy endpoint dzienny czyta rollupy w zadanym zakresie dat"""
+    GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], winner=0, dice={"6": 4}))
+    old = GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], winner=1, dice={"8": 2}))
+    last_week = timezone.now() - datetime.timedelta(days=7)
+    Game.objects.filter(id=old.id).update(start_time=last_week)
+    GamePlayer.objects.filter(game=old).update(start_time=last_week)
+    call_command("backfill_daily_stats", stdout=io.StringIO())
+
+    client = APIClient()
+    today = timezone.localdate().isoformat()
+    everything = client.get("/api/stats/daily/").json()
+    assert [day["games"] for day in everything["days"]] == [1, 1]
+    assert everything["summary"]["win_rate_by_seat"] == [
+        {"seat": 0, "players": 2, "wins": 1, "win_rate": 50.0},
+        {"seat": 1, "players": 2, "wins": 1, "win_rate": 50.0},
+    ]
+
+    recent = client.get(f"/api/stats/daily/?since={today}").json()
+    assert recent["summary"]["dice_distribution"]["6"] == 4
+    assert recent["summary"]["dice_distribution"]["8"] == 0
+    assert client.get(f"/api/stats/resource_analysis/?until={last_week.date()}").json() == [
+        {"resource_type": "sheep", "total_amount": 1, "avg_amount": 1.0, "count": 1}]
+    assert client.get("/api/stats/daily/?since=jutro").status_code == 400
+
+@pytest.mark.django_db
+def test_api_edits_keep_rollups_in_sync(finished_game):
+    """Test czy edycja i usunięcie gry lub gracza przez API zmienia rollupy tak jak przebudowa"""
+    first = GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], dice={"7": 2}))
+    second = GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], winner=1, dice={"6": 1}))
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username="admin", email="a@x.pl"))
+
+    def matches_rebuild():
+        incremental = snapshot()
+        call_command("backfill_daily_stats", stdout=io.StringIO())
+        return snapshot() == incremental
+
+    assert client.patch(f"/api/games/{first.id}/", {"turns": 70, "dice_distribution": {"8": 5}},
+                        format="json").status_code == 200
+    assert matches_rebuild()
+    assert DailyGameStats.objects.get().dice_8 == 5
+
+    loser = GamePlayer.objects.get(game=first, seat=1)
+    assert client.patch(f"/api/game-players/{loser.id}/", {"victory_points": 4, "sheep": 7},
+                        format="json").status_code == 200
+    assert matches_rebuild()
+
+    assert client.delete(f"/api/games/{second.id}/").status_code == 204
+    assert matches_rebuild()
+    assert DailyGameStats.objects.get().games == 1
@@ -0,0 +1,54 @@
+import datetime
+import io
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, Sum
+from django.utils import timezone
+from game_api import synthetic
+from game_api.models import DailyGameStats, Game, GamePlayer, UserStats
+from game_engine.simple.models import WIN_VICTORY_POINTS
+
+def seed(*args):
+    call_command("seed_games", "--users", "30", "--games", "200", "--batch-size", "64", "--days", "30", *args,
+                 stdout=io.StringIO())
+
+def test_game_batch_seats_distinct_players_with_one_winner():
+    """Test czy w każdej wylosowanej grze gracze są różni, miejsca kolejne, a zwycięzca dokładnie jeden"""
+    rng = np.random.default_rng(1)
+    until = timezone.now()
+    games, players = synthetic.game_batch(rng, 500, list(range(100, 110)), synthetic.popularity(10),
+                                          until - datetime.timedelta(days=1), until, 3, 4)
+    assert (games["dice"].sum(axis=1) == games["turns"]).all()
+    for game in range(500):
+        rows = players["game"] == game
+        assert len(set(players["user_id"][rows])) == rows.sum() in (3, 4)
+        assert players["seat"][rows].tolist() == list(range(rows.sum()))
+        assert (players["victory_points"][rows] == WIN_VICTORY_POINTS).sum() == 1
+        assert players["longest_road"][rows].sum() <= 1
+
+@pytest.mark.django_db
+def test_seed_games_fills_history_and_statistics():
+    """Test czy komenda wstawia gry z datami z zakresu i przelicza statystyki oraz rollupy"""
+    seed()
+    assert Game.objects.count() == 200
+    assert not GamePlayer.objects.values("game_id").annotate(n=Count("id")).filter(n__lt=2).exists()
+    oldest = Game.objects.order_by("start_time").first().start_time
+    assert oldest >= timezone.now() - datetime.timedelta(days=30)
+    assert GamePlayer.objects.filter(victory_points__gte=WIN_VICTORY_POINTS).count() == 200
+    assert UserStats.objects.aggregate(total=Sum("total_games"))["total"] == GamePlayer.objects.count()
+    assert DailyGameStats.objects.aggregate(total=Sum("games"))["total"] == 200
+
+    seed("--skip-backfill")
+    assert Game.objects.count() == 400
+    assert GamePlayer.objects.values("user_id").distinct().count() <= 60
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="COPY tylko na PostgreSQL")
+def test_seed_games_with_copy():
+    """Test czy ścieżka COPY daje te same dane co bulk_create"""
+    seed("--copy", "--skip-backfill")
+    assert Game.objects.count() == 200
+    assert GamePlayer.objects.filter(game__turns__gt=0).count() == GamePlayer.objects.count()
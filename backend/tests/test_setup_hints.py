@@ -0,0 +1,64 @@
+import pytest
+from game_engine.simple.models import SimpleGameState
+from game_engine.simple.setup_hints import DICE_PIPS
+
+PLAYER_A = "aaaaaaaa-0000-0000-0000-000000000000"
+PLAYER_B = "bbbbbbbb-0000-0000-0000-000000000000"
+
+@pytest.fixture
+def game_state():
+    state = SimpleGameState()
+    state.add_player(PLAYER_A, "red", "Alice")
+    state.add_player(PLAYER_B, "blue", "Bob")
+    return state
+
+def test_hints_sorted_by_score(game_state):
+    """Test czy podpowiedzi są posortowane malejąco po ocenie"""
+    hints = game_state.get_setup_hints(PLAYER_A, 5)
+    assert len(hints) == 5
+    scores = [h["score"] for h in hints]
+    assert scores == sorted(scores, reverse=True)
+
+def test_hint_pips_match_tiles(game_state):
+    """Test czy suma kropek zgadza się z kafelkami przy wierzchołku"""
+    for hint in game_state.get_setup_hints(PLAYER_A, 10):
+        expected = sum(
+            DICE_PIPS.get(game_state.tiles[t].dice_number, 0)
+            for t in game_state.vertex_to_tiles[hint["vertex_id"]]
+        )
+        assert hint["pips"] == expected
+
+def test_occupied_and_adjacent_spots_are_blocked(game_state):
+    """Test czy zajęte miejsce i jego sąsiedzi znikają z podpowiedzi"""
+    index = game_state.setup_hints
+    best = game_state.get_setup_hints(PLAYER_A, 1)[0]["vertex_id"]
+    game_state.place_settlement(best, PLAYER_A, is_setup=True)
+
+    spot = index.vertex_spot[best]
+    blocked_vertices = set(index.spot_vertices[spot])
+    for neighbor in index.spot_neighbors[spot]:
+        blocked_vertices.update(index.spot_vertices[neighbor])
+
+    hints = game_state.get_setup_hints(PLAYER_B, 10)
+    assert all(h["vertex_id"] not in blocked_vertices for h in hints)
+
+def test_aliases_of_one_corner_share_spot(game_state):
+    """Test czy aliasy tego samego rogu mają wspólne miejsce"""
+    index = game_state.setup_hints
+    for vertices in index.spot_vertices:
+        tile_sets = {frozenset(game_state.vertex_to_tiles[v]) for v in vertices}
+        assert len(tile_sets) == 1
+
+def test_second_settlement_prefers_new_resources(game_state):
+    """Test czy druga osada dostaje premię za surowce, których gracz nie ma"""
+    first = game_state.get_setup_hints(PLAYER_A, 1)[0]
+    game_state.place_settlement(first["vertex_id"], PLAYER_A, is_setup=True)
+
+    for hint in game_state.get_setup_hints(PLAYER_A, 5):
+        new_resources = set(hint["resources"]) - set(first["resources"])
+        assert hint["new_resources"] == len(new_resources)
+
+def test_limit_is_capped(game_state):
+    """Test czy limit podpowiedzi jest ograniczony"""
+    assert len(game_state.get_setup_hints(PLAYER_A, 1000)) == 10
+    assert len(game_state.get_setup_hints(PLAYER_A, 0)) == 1
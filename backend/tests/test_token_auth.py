@@ -0,0 +1,116 @@
+import io
+import runpy
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.conf import settings
+from django.core.management import call_command
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from backend.middleware import TokenAuthMiddlewareStack
+from users import authentication
+
+User = get_user_model()
+
+@pytest.fixture
+def ala():
+    user = User.objects.create_user(username="ala", email="ala@x.pl", display_name="Ala")
+    return user, Token.objects.create(user=user)
+
+def api(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client
+
+@pytest.mark.django_db
+def test_rest_token_lookup_is_cached(ala, django_assert_num_queries):
+    """Test czy kolejne żądania z tym samym tokenem nie pytają bazy o token"""
+    user, token = ala
+    client = api(token)
+    with django_assert_num_queries(1):
+        assert client.get("/api/auth/test-token/").json()["user_id"] == user.id
+    with django_assert_num_queries(0):
+        assert client.get("/api/auth/test-token/").json()["user_id"] == user.id
+    # Widoki statystyk korzystają z tego samego cache - zostają tylko zapytania widoku
+    with django_assert_num_queries(3):
+        assert client.get(f"/api/users/{user.id}/statistics/").status_code == 200
+
+@pytest.mark.django_db
+def test_logout_rotation_and_deactivation_revoke_cache(ala):
+    """Test czy wylogowanie, nowy token i dezaktywacja konta od razu unieważniają cache"""
+    user, token = ala
+    client = api(token)
+    assert client.get("/api/auth/test-token/").status_code == 200
+    assert client.post("/api/auth/users/logout/").status_code == 204
+    assert client.get("/api/auth/test-token/").status_code == 401
+
+    rotated = Token.objects.create(user=user)
+    assert api(rotated).get("/api/auth/test-token/").status_code == 200
+    user.is_active = False
+    user.save()
+    assert api(rotated).get("/api/auth/test-token/").json() == {"detail": "User inactive or deleted."}
+
+@pytest.mark.django_db
+def test_revocation_from_another_process(ala, django_assert_num_queries):
+    """Test czy znacznik unieważnienia we wspólnym cache wymusza ponowne wczytanie tokenu"""
+    user, token = ala
+    assert authentication.get_token(token.key).user == user
+    User.objects.filter(pk=user.pk).update(display_name="Ola")  # bez sygnałów - jak zmiana w innym procesie
+    assert authentication.get_token(token.key).user.display_name == "Ala"
+
+    # Inny proces zapisał użytkownika: lokalny wpis zostaje, ale jest starszy niż znacznik
+    cache.set(authentication.REVOKED_KEY.format(user.pk), authentication.tokens.get(token.key, 60)[1] + 0.001)
+    with django_assert_num_queries(1):
+        assert authentication.get_token(token.key).user.display_name == "Ola"
+
+def test_redis_url_shares_caches_between_processes(monkeypatch):
+    """Test czy z REDIS_URL oba cache (tokeny/przypięcia i odpowiedzi gier) są wspólne dla procesów"""
+    monkeypatch.setenv("REDIS_URL", "redis://cache:6379/1")
+    caches = runpy.run_path(str(settings.BASE_DIR / "backend" / "settings.py"))["CACHES"]
+    assert {alias: c["BACKEND"] for alias, c in caches.items()} == {
+        "default": "django.core.cache.backends.redis.RedisCache",
+        "games": "django.core.cache.backends.redis.RedisCache",
+    }
+    assert {c["LOCATION"] for c in caches.values()} == {"redis://cache:6379/1"}
+
+def connect(stack, query_string, cookie=None):
+    scopes = []
+
+    async def consumer(scope, receive, send):
+        scopes.append(scope)
+
+    async def call():
+        headers = [(b"cookie", cookie.encode())] if cookie else []
+        await stack(consumer)({"type": "websocket", "path": "/game/abc/", "query_string": query_string.encode(),
+                               "headers": headers}, None, None)
+    async_to_sync(call)()
+    return scopes[0]
+
+@pytest.mark.django_db(transaction=True)
+def test_websocket_token_skips_session_lookup(ala, django_assert_num_queries):
+    """Test czy socket z tokenem nie czyta sesji, a ponowne połączenie nie pyta bazy"""
+    user, token = ala
+    with django_assert_num_queries(1):
+        scope = connect(TokenAuthMiddlewareStack, f"token={token.key}", "sessionid=abc")
+    assert scope["user"] == user and "session" not in scope
+    with django_assert_num_queries(0):
+        assert connect(TokenAuthMiddlewareStack, f"token={token.key}")["user"] == user
+
+    assert not connect(TokenAuthMiddlewareStack, "token=zly")["user"].is_authenticated
+    # Bez tokenu - uwierzytelnienie sesją jak w AuthMiddlewareStack
+    scope = connect(TokenAuthMiddlewareStack, "")
+    assert "session" in scope and not scope["user"].is_authenticated
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_ws_connect_reports_queries():
+    """Test czy benchmark połączeń pokazuje mniej zapytań z cache i sprząta po sobie"""
+    out = io.StringIO()
+    call_command("benchmark_ws_connect", clients=5, reconnects=3, concurrency=4, stdout=out)
+
+    rows = {line[:36].strip(): line.split() for line in out.getvalue().splitlines()[2:]}
+    assert rows["before: token + session, no cache"][-3] == "45"
+    assert rows["shared path, cold cache"][-3] == "5"
+    assert all(row[-1] == "15" for row in rows.values())
+    assert not User.objects.filter(username__startswith="wsbench_").exists()
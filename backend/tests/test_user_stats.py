@@ -0,0 +1,116 @@
+import io
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from game_api.game_saver import GameSaver
+from game_api import leaderboard
+from game_api.models import GamePlayer, UserStats
+
+User = get_user_model()
+
+@pytest.fixture
+def finished_game(finished_game):
+    """Przegrani mają po 2 punkty, zwycięzca `cities` miast, drogi według miejsca"""
+    def make(names, winner=0, cities=0):
+        state = finished_game(names, points=[4 if i == winner else 2 for i in range(len(names))])
+        for i, player in enumerate(state.seat_players):
+            player.roads_left = 15 - i
+        state.seat_players[winner].cities_left = 4 - cities
+        return state
+    return make
+
+@pytest.fixture
+def players():
+    return [User.objects.create_user(username=name.lower(), email=f"{name}@x.pl", display_name=name)
+            for name in ["Ala", "Bartek", "Celina"]]
+
+def snapshot():
+    return {s.user_id: s.as_dict() for s in UserStats.objects.all()}
+
+@pytest.mark.django_db
+def test_stats_updated_on_save(players, finished_game):
+    """Test czy zapis gry dolicza wiersz UserStats i liczniki User"""
+    GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], winner=0, cities=1))
+    GameSaver.save_completed_game(finished_game(["Ala", "Bartek", "Celina"], winner=2))
+
+    ala, bartek, celina = players
+    stats = GameSaver.get_game_statistics_for_user(ala.id)
+    assert stats["total_games"] == 2
+    assert stats["wins"] == 1
+    assert stats["win_rate"] == 50
+    assert stats["average_victory_points"] == 3
+    assert stats["average_cities"] == 0.5
+    assert GameSaver.get_game_statistics_for_user(celina.id)["wins"] == 1
+    assert GameSaver.get_game_statistics_for_user(bartek.id)["average_roads"] == 1
+
+    ala.refresh_from_db()
+    assert (ala.games_played, ala.games_won) == (2, 1)
+
+@pytest.mark.django_db
+def test_backfill_matches_incremental(players, finished_game):
+    """Test czy przebudowa z historii daje to samo co aktualizacja przyrostowa"""
+    GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], winner=1))
+    GameSaver.save_completed_game(finished_game(["Celina", "Ala", "Bartek"], winner=0, cities=2))
+    incremental = snapshot()
+
+    UserStats.objects.all().delete()
+    User.objects.update(games_played=0, games_won=0)
+    call_command("backfill_user_stats", stdout=io.StringIO())
+
+    assert snapshot() == incremental
+    assert User.objects.get(username="bartek").games_won == 1
+
+@pytest.mark.django_db
+def test_statistics_endpoint_reads_summary_row(players, django_assert_max_num_queries, finished_game):
+    """Test czy endpoint statystyk to odczyt jednego wiersza"""
+    GameSaver.save_completed_game(finished_game(["Ala", "Bartek"]))
+    client = APIClient()
+    client.force_authenticate(players[0])
+
+    with django_assert_max_num_queries(2):
+        response = client.get(f"/api/users/{players[0].id}/statistics/")
+    assert response.status_code == 200
+    assert response.json()["total_games"] == 1
+
+@pytest.mark.django_db
+def test_api_edits_and_test_game_keep_stats_in_sync(players, finished_game, django_capture_on_commit_callbacks):
+    """Test czy edycje gier i graczy przez API oraz gra testowa zmieniają UserStats i liczniki User jak przebudowa"""
+    ala, bartek, celina = players
+    first = GameSaver.save_completed_game(finished_game(["Ala", "Bartek"], winner=0, cities=1))
+    second = GameSaver.save_completed_game(finished_game(["Ala", "Bartek", "Celina"], winner=2))
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username="admin", email="a@x.pl"))
+
+    def counters():
+        stats = {s.user_id: {k: v for k, v in s.as_dict().items() if k != "rating"}
+                 for s in UserStats.objects.filter(total_games__gt=0)}
+        return stats, sorted(User.objects.filter(games_played__gt=0).values_list("id", "games_played", "games_won"))
+
+    def matches_rebuild():
+        incremental = counters()
+        call_command("backfill_user_stats", stdout=io.StringIO())
+        return counters() == incremental
+
+    rating = UserStats.objects.get(user=bartek).rating
+    loser = GamePlayer.objects.get(game=first, user=bartek)
+    with django_capture_on_commit_callbacks(execute=True):
+        leaderboard.get_leaderboard(10)
+        version = leaderboard.current_version()
+        assert client.patch(f"/api/game-players/{loser.id}/", {"victory_points": 4, "cities_built": 2},
+                            format="json").status_code == 200
+    assert UserStats.objects.get(user=bartek).rating > rating
+    assert leaderboard.current_version() != version
+    assert matches_rebuild()
+
+    assert client.post("/api/game-players/", {"game": first.id, "user": celina.id, "victory_points": 1},
+                       format="json").status_code == 201
+    assert matches_rebuild()
+    assert client.delete(f"/api/game-players/{GamePlayer.objects.get(game=second, user=ala).id}/").status_code == 204
+    assert matches_rebuild()
+    assert client.delete(f"/api/games/{second.id}/").status_code == 204
+    assert matches_rebuild()
+    assert client.post("/api/stats/create_test_game/").status_code == 200
+    assert matches_rebuild()
+    assert User.objects.get(username="test_player_1").games_won == 1
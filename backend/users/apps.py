@@ -3,4 +3,18 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'users'
\ No newline at end of file
+    name = 'users'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import post_delete, post_save
+        from rest_framework.authtoken.models import Token
+
+        from . import authentication
+
+        # Cached token -> user entries must not outlive logout, token rotation or user changes
+        User = get_user_model()
+        post_save.connect(authentication.token_changed, sender=Token, dispatch_uid='token_auth_token_saved')
+        post_delete.connect(authentication.token_changed, sender=Token, dispatch_uid='token_auth_token_deleted')
+        post_save.connect(authentication.user_changed, sender=User, dispatch_uid='token_auth_user_saved')
+        post_delete.connect(authentication.user_changed, sender=User, dispatch_uid='token_auth_user_deleted')
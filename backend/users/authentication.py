@@ -0,0 +1,158 @@
+"""
+Token authentication shared by DRF and the WebSocket stack.
+
+Token -> user lookups are cached per process in a bounded LRU with a TTL, so a burst of
+reconnecting sockets (e.g. after a deploy) or API calls does not hit the token table every time.
+Saving or deleting a token or its user (logout, token rotation, profile changes) revokes the
+cached entry: immediately in this process, and in other processes through a revocation
+timestamp in the shared Django cache, checked on every cache hit. That cache is only shared
+between processes when it is Redis (REDIS_URL in settings); with the default LocMemCache
+revocation reaches other processes only after CACHE_TTL, so multi-worker deployments need it.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+DEFAULTS = {
+    'CACHE_TTL': 60,        # seconds; 0 disables the cache
+    'CACHE_SIZE': 10000,    # tokens kept per process
+}
+REVOKED_KEY = 'auth:revoked:{}'
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'TOKEN_AUTH', {})}
+
+
+class TokenCache:
+    """Bounded LRU of token key -> (token with user, time the lookup started)."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, ttl):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[1] > ttl:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, token, loaded_at, size):
+        with self._lock:
+            self._remove(self._keys_by_user.get(token.user_id))
+            self._entries[key] = (token, loaded_at)
+            self._keys_by_user[token.user_id] = key
+            while len(self._entries) > size:
+                self._remove(next(iter(self._entries)))
+
+    def discard_user(self, user_id):
+        with self._lock:
+            self._remove(self._keys_by_user.get(user_id))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._keys_by_user.pop(entry[0].user_id, None)
+
+
+tokens = TokenCache()
+
+
+def revoke(user_id):
+    """Drop cached tokens of `user_id` here and in every other process."""
+    tokens.discard_user(user_id)
+    ttl = config()['CACHE_TTL']
+    if ttl > 0:
+        cache.set(REVOKED_KEY.format(user_id), time.time(), timeout=ttl)
+
+
+def _fresh(entry, revoked_at):
+    # Entries loaded before the revocation may hold the old token/user state
+    return revoked_at is None or entry[1] > revoked_at
+
+
+def _copy(token):
+    # Cached instances are shared between requests - hand out copies callers may modify
+    clone = copy.copy(token)
+    clone.user = copy.copy(token.user)
+    return clone
+
+
+def _load(key):
+    return Token.objects.select_related('user').filter(key=key).first()
+
+
+def _remember(key, token, loaded_at, options):
+    if token is None:
+        return None
+    if options['CACHE_TTL'] > 0:
+        tokens.put(key, token, loaded_at, options['CACHE_SIZE'])
+    return _copy(token)
+
+
+def get_token(key):
+    """Token (with its user) for `key`, or None if there is no such token."""
+    options = config()
+    entry = tokens.get(key, options['CACHE_TTL']) if options['CACHE_TTL'] > 0 else None
+    if entry is not None and _fresh(entry, cache.get(REVOKED_KEY.format(entry[0].user_id))):
+        return _copy(entry[0])
+    loaded_at = time.time()
+    return _remember(key, _load(key), loaded_at, options)
+
+
+async def aget_token(key, run_sync=sync_to_async):
+    """
+    Async get_token(). Cache hits never leave the event loop; `run_sync` wraps the database
+    lookup (the WebSocket stack passes channels' database_sync_to_async).
+    """
+    options = config()
+    entry = tokens.get(key, options['CACHE_TTL']) if options['CACHE_TTL'] > 0 else None
+    if entry is not None and _fresh(entry, await cache.aget(REVOKED_KEY.format(entry[0].user_id))):
+        return _copy(entry[0])
+    loaded_at = time.time()
+    return _remember(key, await run_sync(_load)(key), loaded_at, options)
+
+
+def token_changed(sender, instance, **kwargs):
+    """post_save/post_delete of Token (logout, rotation)."""
+    revoke(instance.user_id)
+
+
+def user_changed(sender, instance, **kwargs):
+    """post_save/post_delete of User (deactivation, profile changes)."""
+    revoke(instance.pk)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """DRF TokenAuthentication backed by the shared token cache."""
+
+    def authenticate_credentials(self, key):
+        token = get_token(key)
+        if token is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
@@ -0,0 +1,32 @@
+"""
+Guest account lifecycle.
+
+Guests are created for anonymous logins (guest_login) and for unknown players when a finished
+game is saved. A guest gets the plain username it asked for when that is free, otherwise the
+name with a random suffix - one exact-match query for any number of guests, no probing loops,
+and no `username LIKE 'guest_x%'` scans that grow with every guest ever created.
+Stale guests are removed or merged by the gc_guests management command.
+"""
+import secrets
+
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+SUFFIX_BYTES = 5    # 10 hex characters - 2**40 suffixes per name
+MAX_BASE_LENGTH = User._meta.get_field('username').max_length - 1 - 2 * SUFFIX_BYTES
+
+
+def allocate_usernames(bases):
+    """
+    A free username for each requested base, in order: the base itself if no user has it
+    (and no earlier base in the list took it), otherwise `<base>_<random hex>`.
+    """
+    bases = [base[:MAX_BASE_LENGTH] for base in bases]
+    taken = set(User.objects.filter(username__in=set(bases)).values_list('username', flat=True))
+    usernames = []
+    for base in bases:
+        username = base if base not in taken else f"{base}_{secrets.token_hex(SUFFIX_BYTES)}"
+        taken.add(username)
+        usernames.append(username)
+    return usernames
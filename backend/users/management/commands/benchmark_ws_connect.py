@@ -0,0 +1,138 @@
+"""
+WebSocket connect storm (every client reconnecting at once, e.g. after a deploy) through the
+token auth stack, counting database queries:
+    python manage.py benchmark_ws_connect --clients 500 --reconnects 4
+
+Each client sends its token and a session cookie, like a browser that also logged in via OAuth.
+"""
+import asyncio
+import time
+from importlib import import_module
+
+from asgiref.sync import async_to_sync
+from channels.auth import AuthMiddlewareStack
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.authtoken.models import Token
+
+from backend.middleware import TokenAuthMiddleware, TokenAuthMiddlewareStack
+from users import authentication
+
+User = get_user_model()
+
+
+def legacy_stack(inner):
+    """The stack before the shared token path: token lookup, then session auth on top of it."""
+    return TokenAuthMiddleware(AuthMiddlewareStack(inner))
+
+
+class Command(BaseCommand):
+    help = "Count database queries of a WebSocket connect storm with and without the token cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=200)
+        parser.add_argument('--reconnects', type=int, default=5, help="Connects per client")
+        parser.add_argument('--concurrency', type=int, default=100)
+        parser.add_argument('--prefix', default='wsbench_', help="Username prefix of the generated clients")
+        parser.add_argument('--keep', action='store_true', help="Keep the generated users and sessions")
+
+    def handle(self, *args, **options):
+        if options['clients'] < 1 or options['reconnects'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--clients, --reconnects and --concurrency must be >= 1")
+
+        clients = self.create_clients(options['clients'], options['prefix'])
+        connects = clients * options['reconnects']
+        ttl = authentication.config()['CACHE_TTL'] or authentication.DEFAULTS['CACHE_TTL']
+        variants = [
+            ('before: token + session, no cache', legacy_stack, 0),
+            ('shared path, cache disabled', TokenAuthMiddlewareStack, 0),
+            ('shared path, cold cache', TokenAuthMiddlewareStack, ttl),
+        ]
+        try:
+            results = []
+            for name, build, variant_ttl in variants:
+                authentication.tokens.clear()
+                with override_settings(TOKEN_AUTH={**authentication.config(), 'CACHE_TTL': variant_ttl}):
+                    results.append((name, *self.storm(build, connects, options['concurrency'])))
+        finally:
+            if not options['keep']:
+                self.delete_clients(clients, options['prefix'])
+
+        self.stdout.write(f"{len(connects)} connects from {len(clients)} clients, "
+                          f"concurrency {options['concurrency']}")
+        self.stdout.write(f"{'variant':36} {'connects/s':>10} {'queries':>8} {'per connect':>11} {'authenticated':>13}")
+        for name, elapsed, queries, authenticated in results:
+            self.stdout.write(f"{name:36} {len(connects) / elapsed:10.0f} {queries:8} "
+                              f"{queries / len(connects):11.2f} {authenticated:13}")
+
+    def create_clients(self, count, prefix):
+        """(token key, session key) per generated user"""
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f"Users with prefix {prefix!r} already exist - delete them or pass another --prefix")
+        session_store = import_module(settings.SESSION_ENGINE).SessionStore
+        users = User.objects.bulk_create([
+            User(username=f"{prefix}{number}", email=f"{prefix}{number}@bench.local", password='!')
+            for number in range(count)
+        ])
+        tokens = Token.objects.bulk_create([Token(user=user, key=Token.generate_key()) for user in users])
+
+        clients = []
+        for user, token in zip(users, tokens):
+            session = session_store()
+            session[SESSION_KEY] = str(user.pk)
+            session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+            session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+            session.create()
+            clients.append((token.key, session.session_key))
+        return clients
+
+    def delete_clients(self, clients, prefix):
+        session_store = import_module(settings.SESSION_ENGINE).SessionStore
+        for _, session_key in clients:
+            session_store(session_key).delete()
+        User.objects.filter(username__startswith=prefix).delete()
+
+    def storm(self, build, connects, concurrency):
+        """(elapsed s, queries, authenticated sockets) of all `connects` through the stack"""
+        authenticated = 0
+
+        async def consumer(scope, receive, send):
+            nonlocal authenticated
+            authenticated += scope['user'].is_authenticated
+
+        async def receive():
+            return {'type': 'websocket.connect'}
+
+        async def send(message):
+            pass
+
+        stack = build(consumer)
+        pending = list(reversed(connects))
+
+        async def client():
+            while pending:
+                token_key, session_key = pending.pop()
+                await stack({
+                    'type': 'websocket', 'path': '/game/bench/', 'query_string': f'token={token_key}'.encode(),
+                    'headers': [(b'cookie', f'{settings.SESSION_COOKIE_NAME}={session_key}'.encode())],
+                }, receive, send)
+
+        async def run():
+            await asyncio.gather(*[client() for _ in range(concurrency)])
+
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        # Database calls of the stack run in this thread (thread-sensitive sync_to_async under async_to_sync)
+        with connection.execute_wrapper(count):
+            started = time.perf_counter()
+            async_to_sync(run)()
+            elapsed = time.perf_counter() - started
+        return elapsed, queries, authenticated
@@ -0,0 +1,141 @@
+"""
+Garbage collection of stale guest accounts, in chunks:
+    python manage.py gc_guests --days 30 [--merge] [--dry-run]
+
+Guests older than --days that never finished a game are deleted together with their tokens.
+With --merge, stale guests that did play are folded into the registered account with the same
+display_name (the same person, as far as the history/statistics endpoints are concerned): their
+game rows, statistics and counters move to that account and the guest is deleted. Ratings of
+merged accounts are kept; run recompute_ratings to rebuild them from the full history.
+"""
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Exists, F, FloatField, Min, OuterRef
+from django.db.models.functions import Cast
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from game_api import game_cache, leaderboard
+from game_api.models import GamePlayer, UserStats
+
+User = get_user_model()
+
+# UserStats counters summed on merge
+STATS_COUNTERS = ['total_games', 'wins', 'total_victory_points', 'total_roads', 'total_settlements',
+                  'total_cities', 'longest_road_awards', 'largest_army_awards']
+
+
+def played():
+    return Exists(GamePlayer.objects.filter(user_id=OuterRef('pk')))
+
+
+class Command(BaseCommand):
+    help = "Delete stale guests without games (and their tokens), optionally merge stale guests into accounts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help="Only guests created more than this many days ago")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Guests per chunk/transaction")
+        parser.add_argument('--merge', action='store_true',
+                            help="Merge stale guests with games into the account with the same display_name")
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be done")
+
+    def handle(self, *args, **options):
+        if options['days'] < 0 or options['batch_size'] < 1:
+            raise CommandError("--days must be >= 0 and --batch-size >= 1")
+        stale = User.objects.filter(
+            is_guest=True, created_at__lt=timezone.now() - datetime.timedelta(days=options['days']))
+
+        merged = self.merge_all(stale, options['batch_size'], options['dry_run']) if options['merge'] else 0
+        deleted = self.delete_all(stale, options['batch_size'], options['dry_run'])
+
+        prefix = "Would merge" if options['dry_run'] else "Merged"
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {merged} guests into accounts, {'would delete' if options['dry_run'] else 'deleted'} "
+            f"{deleted} guests without games"))
+
+    def chunks(self, queryset, batch_size, *fields):
+        """Keyset chunks of `fields` rows (first field must be the id) in id order"""
+        last = 0
+        while True:
+            rows = list(queryset.filter(id__gt=last).order_by('id').values_list(*fields)[:batch_size])
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield rows
+
+    def delete_all(self, stale, batch_size, dry_run):
+        deleted = 0
+        for rows in self.chunks(stale.filter(~played()), batch_size, 'id'):
+            ids = [guest_id for guest_id, in rows]
+            if dry_run:
+                deleted += len(ids)
+                continue
+            with transaction.atomic():
+                # Checked again under row locks: a guest may have finished a game since the chunk was read,
+                # and a new game_players row for a locked guest waits for this commit (its FK check locks the user)
+                ids = list(User.objects.select_for_update().filter(id__in=ids).filter(~played())
+                           .values_list('id', flat=True))
+                Token.objects.filter(user_id__in=ids).delete()
+                _, per_model = User.objects.filter(id__in=ids).delete()
+            deleted += per_model.get(User._meta.label, 0)
+            self.stdout.write(f"  deleted {deleted} guests")
+        return deleted
+
+    def merge_all(self, stale, batch_size, dry_run):
+        merged = 0
+        candidates = stale.filter(played()).exclude(display_name__isnull=True).exclude(display_name='')
+        for rows in self.chunks(candidates, batch_size, 'id', 'display_name'):
+            # Only unambiguous targets: exactly one registered account with that display_name
+            targets = dict(
+                User.objects.filter(is_guest=False, display_name__in={name for _, name in rows})
+                .values('display_name').annotate(accounts=Count('id'), target=Min('id')).filter(accounts=1)
+                .values_list('display_name', 'target')
+            )
+            for guest_id, name in rows:
+                if name not in targets:
+                    continue
+                if dry_run:
+                    merged += 1
+                    continue
+                game_ids = self.merge(guest_id, targets[name])
+                if game_ids is not None:
+                    merged += 1
+                    # Cached players responses of the moved games still name the guest
+                    for game_id in game_ids:
+                        game_cache.invalidate(game_id)
+        if merged and not dry_run:
+            leaderboard.invalidate()
+        return merged
+
+    @transaction.atomic
+    def merge(self, guest_id, target_id):
+        """Move the guest's games, statistics and counters to `target_id` and delete the guest.
+
+        Returns the ids of the moved games, or None when the guest can't be merged.
+        """
+        # Locked first: the guest's games and counters must not change while they are moved
+        guest = User.objects.select_for_update().get(id=guest_id)
+        games = GamePlayer.objects.filter(user_id=guest_id)
+        if games.filter(Exists(GamePlayer.objects.filter(user_id=target_id, game_id=OuterRef('game_id')))).exists():
+            # Both sat in the same game - (game, user) must stay unique
+            return None
+        game_ids = list(games.values_list('game_id', flat=True))
+        games.update(user_id=target_id)
+
+        guest_stats = UserStats.objects.filter(user_id=guest_id).first()
+        if guest_stats is not None and guest_stats.total_games:
+            UserStats.objects.bulk_create([UserStats(user_id=target_id)], ignore_conflicts=True)
+            UserStats.objects.filter(user_id=target_id).update(
+                **{name: F(name) + getattr(guest_stats, name) for name in STATS_COUNTERS},
+                # F() sees the values before this UPDATE
+                win_rate=Cast(F('wins') + guest_stats.wins, FloatField()) * 100
+                / (F('total_games') + guest_stats.total_games),
+            )
+        User.objects.filter(id=target_id).update(games_played=F('games_played') + guest.games_played,
+                                                 games_won=F('games_won') + guest.games_won)
+        Token.objects.filter(user_id=guest_id).delete()
+        guest.delete()
+        return game_ids
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0002_alter_user_groups_alter_user_user_permissions'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('display_name__isnull', False)), fields=['display_name'], name='user_display_name_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0003_display_name_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_guest', True)), fields=['created_at'], name='user_guest_created_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 
@@ -61,4 +62,11 @@ class User(AbstractUser):
     
     class Meta:
         verbose_name = _('user')
-        verbose_name_plural = _('users')
\ No newline at end of file
+        verbose_name_plural = _('users')
+        indexes = [
+            # Lookups by display name (game saver, guest -> account fallbacks); NULL names are never queried
+            models.Index(fields=['display_name'], condition=Q(display_name__isnull=False),
+                         name='user_display_name_idx'),
+            # Stale guest lookups of gc_guests; covers guests only, so it stays small
+            models.Index(fields=['created_at'], condition=Q(is_guest=True), name='user_guest_created_idx'),
+        ]
\ No newline at end of file
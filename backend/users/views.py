@@ -9,6 +9,7 @@ import uuid
 import random
 
 from .models import User
+from . import guests
 from .serializers import UserSerializer, UserCreateSerializer
 
 User = get_user_model()
@@ -54,12 +55,8 @@ class UserViewSet(viewsets.ModelViewSet):
         guest_name = request.data.get('guest_name', f"Guest_{uuid.uuid4().hex[:8]}")
         preferred_color = request.data.get('preferred_color', random.choice(['red', 'blue', 'green', 'yellow', 'orange', 'purple']))
         
-        # Ensure unique username
-        base_username = guest_name
-        counter = 1
-        while User.objects.filter(username=base_username).exists():
-            base_username = f"{guest_name}_{counter}"
-            counter += 1
+        # Unique username in one query (users/guests.py)
+        base_username = guests.allocate_usernames([guest_name])[0]
         
         # Create random password for the guest user
         random_password = uuid.uuid4().hex
@@ -129,6 +126,12 @@ class UserViewSet(viewsets.ModelViewSet):
             'user': UserSerializer(user).data
         })
     
+    @action(detail=False, methods=['post'])
+    def logout(self, request):
+        # Deleting the token also evicts it from the token auth cache (users/authentication.py)
+        Token.objects.filter(user=request.user).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
     @action(detail=False, methods=['get'])
     def profile(self, request):
         # Return current user profile
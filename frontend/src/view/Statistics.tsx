@@ -267,7 +267,7 @@ const CatanStatsDashboard = () => {
       // ✅ Pobierz dane z obsługą błędów autoryzacji
       const [statsResponse, gamesResponse, globalResponse] = await Promise.allSettled([
         fetch(`${API_BASE}/users/${user.id}/statistics/`, { headers }),
-        fetch(`${API_BASE}/users/${user.id}/games/`, { headers }),
+        fetch(`${API_BASE}/users/${user.id}/games/?page_size=100`, { headers }),  // stronicowane kursorem: { next, results }, dalej po next
         fetch(`${API_BASE}/stats/global_stats/`)  // Global stats bez autoryzacji
       ]);
 
@@ -295,9 +295,20 @@ const CatanStatsDashboard = () => {
         }
         
         if (gamesResponse.value.ok) {
-          const gamesData = await gamesResponse.value.json();
-          console.log('🎮 Games received:', gamesData.length, 'games');
-          setGames(gamesData);
+          // Wykresy i liczniki liczone są z całej historii - idziemy po kolejnych stronach kursora
+          let gamesData = await gamesResponse.value.json();
+          const allGames = [...gamesData.results];
+          while (gamesData.next) {
+            const nextResponse = await fetch(gamesData.next, { headers });
+            if (!nextResponse.ok) {
+              console.warn('Failed to fetch next page of user games:', nextResponse.status);
+              break;
+            }
+            gamesData = await nextResponse.json();
+            allGames.push(...gamesData.results);
+          }
+          console.log('🎮 Games received:', allGames.length, 'games');
+          setGames(allGames);
         } else {
           console.warn('Failed to fetch user games:', gamesResponse.value.status);
         }
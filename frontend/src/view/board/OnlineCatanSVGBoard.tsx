@@ -1,5 +1,5 @@
 // frontend/src/view/board/OnlineCatanSVGBoard.tsx - POPRAWIONA WERSJA Z MIASTAMI
-import React, { useState, useCallback, useEffect } from "react";
+import React, { useState, useCallback, useEffect, useMemo } from "react";
 import styled from "styled-components";
 
 interface OnlineCatanSVGBoardProps {
@@ -188,7 +188,7 @@ const getEdgeIdForHexAndIndex = (
   return hexIndex * 6 + edgeIndex;
 };
 
-// Definicja planszy
+// Plansza domyślna - rysowana, dopóki nie przyjdzie stan gry z kafelkami
 const hexData = [
   { q: 0, r: 0, s: 0, resource: "desert", number: 0 },
   { q: 0, r: -2, s: 2, resource: "wood", number: 6 },
@@ -228,6 +228,23 @@ const OnlineCatanSVGBoard: React.FC<OnlineCatanSVGBoardProps> = ({
   >(new Map());
   const [debugInfo, setDebugInfo] = useState<string>("");
 
+  // Kafelki ze stanu gry (board=random, inne układy); kolejność tile_id = hexIndex dla id wierzchołków/krawędzi
+  const boardHexes = useMemo(() => {
+    const tiles = gameState?.board?.tiles;
+    if (!Array.isArray(tiles) || tiles.length === 0) {
+      return hexData;
+    }
+    return [...tiles]
+      .sort((a: any, b: any) => a.tile_id - b.tile_id)
+      .map((tile: any) => ({
+        q: tile.coords[0],
+        r: tile.coords[1],
+        s: tile.coords[2],
+        resource: tile.resource ? String(tile.resource).toLowerCase() : "desert",
+        number: tile.dice_number || 0,
+      }));
+  }, [gameState?.board?.tiles]);
+
   // Funkcja do konwersji współrzędnych hex na pozycję ekranu
   const hexToPixel = useCallback((q: number, r: number, size: number = 45) => {
     const x = size * ((3 / 2) * q);
@@ -372,7 +389,7 @@ const OnlineCatanSVGBoard: React.FC<OnlineCatanSVGBoardProps> = ({
   return (
     <BoardContainer>
       <BoardSVG width={700} height={500} viewBox="0 0 700 500">
-        {hexData.map((hex, hexIndex) => {
+        {boardHexes.map((hex, hexIndex) => {
           const { x, y } = hexToPixel(hex.q, hex.r);
           const vertices = getHexagonVertices(x, y);
           const edges = getHexagonEdges(x, y);